@@ -8,8 +8,7 @@
     :license: BSD, see :ref:`license` for more details.
 """
 
-from .git import RepositoryManager
-from .project import ProjectManager
+from .pyutils import set_lazy_attributes
 
 __version__ = '0.1.0'
 
@@ -17,3 +16,9 @@ __all__ = [
     'RepositoryManager',
     'ProjectManager',
 ]
+
+# Managers depend on GitPython and docutils so they are only imported on first access
+set_lazy_attributes(__name__, {
+    'RepositoryManager': '.git',
+    'ProjectManager': '.project',
+})
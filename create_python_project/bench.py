@@ -0,0 +1,540 @@
+"""
+    create_python_project.bench
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a benchmark suite of project operations
+
+    Benchmarks run either on synthetic repositories generated with a given number of files (modeled on a
+    boilerplate project with .py, .rst, .yml, .ini and binary files) or on a clone of a real repository.
+    Results are recorded to JSON so regressions can be compared between commits
+
+        results = run_suite(sizes=[10, 1000])
+        save_results(results, 'bench.json')
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import contextlib
+import os
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from collections import OrderedDict
+
+from . import __version__
+from . import scripts
+from .project import ProjectManager
+from .pyutils import lazy_import
+
+json = lazy_import('json')
+git = lazy_import('git')
+
+# Number of files of the synthetic repositories benchmarks run on
+DEFAULT_SIZES = (10, 1000, 10000)
+
+# Share of each file type in synthetic repositories
+DEFAULT_DISTRIBUTION = OrderedDict([
+    ('py', 0.5),
+    ('rst', 0.2),
+    ('yml', 0.1),
+    ('ini', 0.1),
+    ('binary', 0.1),
+])
+
+# Number of files of each type every synthetic repository contains (setup.py, package __init__.py, README.rst...)
+BASE_FILES = OrderedDict([
+    ('py', 2),
+    ('rst', 1),
+    ('yml', 1),
+    ('ini', 1),
+    ('binary', 0),
+])
+
+# Maximum number of files per folder of synthetic repositories
+FILES_PER_FOLDER = 100
+
+SYNTHETIC_PROJECT_NAME = 'Synthetic-Project'
+SYNTHETIC_PACKAGE_NAME = 'synthetic_project'
+SYNTHETIC_URL = 'https://github.com/synthetic/synthetic-project'
+SYNTHETIC_AUTHOR_NAME = 'Synthetic Author'
+SYNTHETIC_AUTHOR_EMAIL = 'synthetic.author@example.com'
+
+# Git identity used for commits performed by benchmarks when none is configured
+GIT_IDENTITY = {
+    'GIT_AUTHOR_NAME': 'crpyproj-bench',
+    'GIT_AUTHOR_EMAIL': 'crpyproj-bench@example.com',
+    'GIT_COMMITTER_NAME': 'crpyproj-bench',
+    'GIT_COMMITTER_EMAIL': 'crpyproj-bench@example.com',
+}
+
+SETUP_TEMPLATE = '''"""
+    {project_name}
+    {underline}
+
+    {project_name} is a synthetic Python project.
+"""
+
+from setuptools import setup
+
+setup(
+    name='{project_name}',
+    version='0.0.0',
+    url='{url}',
+    author='{author_name}',
+    author_email='{author_email}',
+    description='{project_name} is a synthetic Python project',
+    packages=['{package_name}'],
+    install_requires=[
+    ],
+    zip_safe=False,
+    platforms='any',
+    test_suite='tests'
+)
+'''
+
+MODULE_TEMPLATE = '''"""
+    {module_path}
+    {underline}
+
+    Module of {project_name}
+
+    :copyright: Copyright 2017 by {author_name}.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+from {package_name} import __version__
+'''
+
+INIT_TEMPLATE = '''"""
+    {package_name}
+    {underline}
+
+    {project_name} is a synthetic Python project
+
+    :copyright: Copyright 2017 by {author_name}.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+__version__ = '0.0.0'
+
+__all__ = []
+'''
+
+FUNCTION_TEMPLATE = '''
+
+def function_{index}(value):
+    """Function of {package_name} (c.f. {url})"""
+    return value + {index}
+'''
+
+RST_TEMPLATE = '''{title}
+{underline}
+
+{project_name} documentation page.
+'''
+
+RST_PARAGRAPH_TEMPLATE = '''
+Section {index:05d}
+-------------
+
+See {url} or install with ``pip install {project_name}`` and ``import {package_name}``.
+'''
+
+YML_TEMPLATE = '''name: {project_name}
+items:
+'''
+
+YML_ITEM_TEMPLATE = '''  - index: {index}
+    package: {package_name}
+    url: {url}
+'''
+
+INI_TEMPLATE = '''[metadata]
+name = {project_name}
+'''
+
+INI_SECTION_TEMPLATE = '''
+[section_{index}]
+package = {package_name}
+url = {url}
+'''
+
+
+def _render(header, item, lines, **kwargs):
+    # Repeat item until the script reaches the requested number of lines
+    content = header.format(**kwargs)
+    index = 0
+    while content.count('\n') < lines:
+        content += item.format(index=index, **kwargs)
+        index += 1
+    return content
+
+
+def _get_path(folder, name, index, extension):
+    return os.path.join(folder, '{0}_{1}'.format(name, index // FILES_PER_FOLDER),
+                        '{0}_{1}.{2}'.format(name, index, extension))
+
+
+def _write(root, path, content):
+    abspath = os.path.join(root, path)
+    os.makedirs(os.path.dirname(abspath), exist_ok=True)
+    with open(abspath, 'wb' if isinstance(content, bytes) else 'w') as file:
+        file.write(content)
+
+
+def get_file_counts(files, distribution=DEFAULT_DISTRIBUTION):
+    """Split a number of files into a number of files per type
+
+    :param files: Total number of files
+    :type files: int
+    :param distribution: Share of each file type
+    :type distribution: dict
+    :rtype: OrderedDict
+    """
+
+    assert files >= sum(BASE_FILES.values()), \
+        'Synthetic repositories hold at least {min} files but you asked for {files}'.format(
+            min=sum(BASE_FILES.values()), files=files)
+
+    counts = OrderedDict([(file_type, max(int(files * share), BASE_FILES[file_type]))
+                          for file_type, share in distribution.items()])
+
+    # Remaining files are python modules
+    counts['py'] += files - sum(counts.values())
+
+    return counts
+
+
+def generate_repo(path, py=2, rst=1, yml=1, ini=1, binary=0, lines=40, binary_size=4096, seed=0):
+    """Generate a synthetic project repository with a single commit
+
+    Scripts hold the project name, package name, URL and author so project operations have values to replace.
+    Counts include base files (setup.py, package __init__.py, README.rst, .travis.yml and setup.cfg)
+
+    :param path: Path of the repository to create
+    :type path: str
+    :param py: Number of .py files
+    :type py: int
+    :param rst: Number of .rst files
+    :type rst: int
+    :param yml: Number of .yml files
+    :type yml: int
+    :param ini: Number of .ini files
+    :type ini: int
+    :param binary: Number of binary files
+    :type binary: int
+    :param lines: Approximate number of lines of text files
+    :type lines: int
+    :param binary_size: Size of binary files in bytes
+    :type binary_size: int
+    :param seed: Seed of binary files content
+    :type seed: int
+    :rtype: ProjectManager
+    """
+
+    assert py >= BASE_FILES['py'] and rst >= BASE_FILES['rst'] and yml >= BASE_FILES['yml'] and \
+        ini >= BASE_FILES['ini'], 'Synthetic repositories hold at least {0} files per type'.format(dict(BASE_FILES))
+
+    values = {
+        'project_name': SYNTHETIC_PROJECT_NAME,
+        'package_name': SYNTHETIC_PACKAGE_NAME,
+        'url': SYNTHETIC_URL,
+        'author_name': SYNTHETIC_AUTHOR_NAME,
+        'author_email': SYNTHETIC_AUTHOR_EMAIL,
+    }
+    package = SYNTHETIC_PACKAGE_NAME
+
+    # Base files
+    _write(path, 'setup.py', SETUP_TEMPLATE.format(underline='~' * len(SYNTHETIC_PROJECT_NAME), **values))
+    _write(path, os.path.join(package, '__init__.py'), INIT_TEMPLATE.format(underline='~' * len(package), **values))
+    _write(path, 'README.rst', _render(RST_TEMPLATE, RST_PARAGRAPH_TEMPLATE, lines, title=SYNTHETIC_PROJECT_NAME,
+                                       underline='=' * len(SYNTHETIC_PROJECT_NAME), **values))
+    _write(path, '.travis.yml', _render(YML_TEMPLATE, YML_ITEM_TEMPLATE, lines, **values))
+    _write(path, 'setup.cfg', _render(INI_TEMPLATE, INI_SECTION_TEMPLATE, lines, **values))
+
+    # Generated files
+    for index in range(py - BASE_FILES['py']):
+        module_path = _get_path(package, 'module', index, 'py')
+        module_name = module_path[:-len('.py')].replace(os.sep, '.')
+        _write(path, module_path, _render(MODULE_TEMPLATE, FUNCTION_TEMPLATE, lines, module_path=module_name,
+                                          underline='~' * len(module_name), **values))
+
+    for index in range(rst - BASE_FILES['rst']):
+        title = 'Page {0}'.format(index)
+        _write(path, _get_path('docs', 'page', index, 'rst'),
+               _render(RST_TEMPLATE, RST_PARAGRAPH_TEMPLATE, lines, title=title, underline='=' * len(title), **values))
+
+    for index in range(yml - BASE_FILES['yml']):
+        _write(path, _get_path('config', 'config', index, 'yml'), _render(YML_TEMPLATE, YML_ITEM_TEMPLATE, lines,
+                                                                          **values))
+
+    for index in range(ini - BASE_FILES['ini']):
+        _write(path, _get_path('config', 'config', index, 'ini'), _render(INI_TEMPLATE, INI_SECTION_TEMPLATE, lines,
+                                                                          **values))
+
+    generator = random.Random(seed)
+    for index in range(binary):
+        _write(path, _get_path('static', 'image', index, 'bin'),
+               bytes(generator.getrandbits(8) for _ in range(binary_size)))
+
+    # Commit files
+    manager = ProjectManager.init(path)
+    with manager.config_writer() as config:
+        config.set_value('user', 'name', SYNTHETIC_AUTHOR_NAME)
+        config.set_value('user', 'email', SYNTHETIC_AUTHOR_EMAIL)
+    manager.git.add('--all')
+    manager.git.commit('-m', 'chore(all): generate synthetic project')
+    manager.create_remote('origin', 'git@github.com:synthetic/synthetic-project.git')
+
+    return manager
+
+
+def clone_repo(path, to_path):
+    """Clone a repository to benchmark it without modifying it
+
+    :param path: Path of the repository to clone
+    :type path: str
+    :param to_path: Path of the clone
+    :type to_path: str
+    :rtype: ProjectManager
+    """
+
+    return ProjectManager.clone_from(url=os.path.abspath(path), to_path=to_path)
+
+
+def bench_apply_func(manager, work_dir):
+    manager.apply_func(lambda blob: None)
+
+
+def bench_get_info(manager, work_dir):
+    manager.get_info(is_filtered=lambda blob: scripts.has_info(scripts.get_script_class(blob.path)))
+
+
+def bench_setup_info(manager, work_dir):
+    return manager.setup_info
+
+
+def bench_set_project_name(manager, work_dir):
+    manager.set_project_name('Benchmarked-Project')
+
+
+def bench_set_project_py_script_headers(manager, work_dir):
+    manager.set_project_py_script_headers(license='MIT, see LICENSE.rst for more details.',
+                                          copyright='Copyright 2017 by Benchmarked Author.')
+
+
+def bench_new(manager, work_dir):
+    # Imported here as cli lazily imports this module
+    from click.testing import CliRunner
+    from .cli import cli
+
+    with _cwd(work_dir):
+        result = CliRunner().invoke(cli, ['--config-file', os.path.join(work_dir, '.crpyprojrc'),
+                                          'new',
+                                          '--boilerplate', 'file://{0}'.format(manager.working_dir),
+                                          '--git-url', 'https://github.com/benchmarked/benchmarked-project.git',
+                                          '--author-name', 'Benchmarked Author',
+                                          '--author-email', 'benchmarked.author@example.com',
+                                          'benchmarked-project'])
+
+    if result.exception is not None:
+        raise result.exception
+
+
+# Benchmarks with their name (functions take the project manager and a temporary working directory)
+BENCHMARKS = OrderedDict([
+    ('apply_func', bench_apply_func),
+    ('get_info', bench_get_info),
+    ('setup_info', bench_setup_info),
+    ('set_project_name', bench_set_project_name),
+    ('set_project_py_script_headers', bench_set_project_py_script_headers),
+    ('new', bench_new),
+])
+
+
+@contextlib.contextmanager
+def _cwd(path):
+    initial_dir = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(initial_dir)
+
+
+@contextlib.contextmanager
+def _git_identity():
+    # Benchmarks commit to clones which may not have any configured identity
+    initial_environ = {name: os.environ.get(name) for name in GIT_IDENTITY}
+    for name, value in GIT_IDENTITY.items():
+        os.environ.setdefault(name, value)
+    try:
+        yield
+    finally:
+        for name, value in initial_environ.items():
+            if value is None:
+                del os.environ[name]
+
+
+def _reset(manager, rev):
+    # Restore repository state modified by a benchmark
+    manager.git.reset('--hard', rev)
+    manager.git.clean('-fdxq')
+
+
+def run_benchmark(name, manager, repeat=3):
+    """Run a benchmark several times on a repository
+
+    The repository is reset to its initial commit after each run
+
+    :param name: Name of the benchmark (c.f. BENCHMARKS)
+    :type name: str
+    :param manager: Project to run the benchmark on
+    :type manager: ProjectManager
+    :param repeat: Number of runs
+    :type repeat: int
+    :return: Timings of the runs in seconds
+    :rtype: OrderedDict
+    """
+
+    assert name in BENCHMARKS, 'Benchmarks are {names} but you passed {name}'.format(names=list(BENCHMARKS),
+                                                                                     name=name)
+    assert repeat > 0, 'repeat must be positive but you passed {0}'.format(repeat)
+
+    func, initial_commit, times = BENCHMARKS[name], manager.head.commit.hexsha, []
+    with _git_identity():
+        for _ in range(repeat):
+            work_dir = tempfile.mkdtemp(prefix='crpyproj-bench-')
+            try:
+                start = time.perf_counter()
+                func(manager, work_dir)
+                times.append(time.perf_counter() - start)
+            finally:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                _reset(manager, initial_commit)
+
+    return OrderedDict([
+        ('min', min(times)),
+        ('median', statistics.median(times)),
+        ('mean', statistics.mean(times)),
+        ('max', max(times)),
+        ('times', times),
+    ])
+
+
+def _get_revision():
+    # Commit of the create-python-project sources the benchmarks ran with (if run from a repository)
+    try:
+        return git.Repo(os.path.dirname(os.path.abspath(__file__)), search_parent_directories=True).head.commit.hexsha
+    except Exception:
+        return None
+
+
+def _run_benchmarks(manager, benchmarks, repeat, results, **record):
+    files = len(manager.get_tree_index())
+    for name in benchmarks:
+        result = OrderedDict([('benchmark', name), ('files', files)])
+        result.update(record)
+        result.update(run_benchmark(name, manager, repeat=repeat))
+        results.append(result)
+
+
+def run_suite(sizes=DEFAULT_SIZES, repo_path=None, benchmarks=None, repeat=3, lines=40, binary_size=4096):
+    """Run benchmarks on synthetic repositories or on a clone of a real repository
+
+    :param sizes: Numbers of files of synthetic repositories
+    :type sizes: list
+    :param repo_path: Optional path of a real repository to benchmark instead of synthetic repositories
+    :type repo_path: str
+    :param benchmarks: Names of the benchmarks to run (defaults to all of them)
+    :type benchmarks: list
+    :param repeat: Number of runs of each benchmark
+    :type repeat: int
+    :param lines: Approximate number of lines of synthetic text files
+    :type lines: int
+    :param binary_size: Size of synthetic binary files in bytes
+    :type binary_size: int
+    :return: Results to be serialized to JSON
+    :rtype: OrderedDict
+    """
+
+    benchmarks = list(BENCHMARKS) if benchmarks is None else list(benchmarks)
+    results = []
+
+    root = tempfile.mkdtemp(prefix='crpyproj-bench-')
+    try:
+        if repo_path is not None:
+            manager = clone_repo(repo_path, os.path.join(root, 'repo'))
+            _run_benchmarks(manager, benchmarks, repeat, results, repo=os.path.abspath(repo_path))
+        else:
+            for size in sizes:
+                manager = generate_repo(os.path.join(root, 'synthetic-{0}'.format(size)),
+                                        lines=lines, binary_size=binary_size, **get_file_counts(size))
+                _run_benchmarks(manager, benchmarks, repeat, results)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return OrderedDict([
+        ('version', __version__),
+        ('revision', _get_revision()),
+        ('python', platform.python_version()),
+        ('platform', platform.platform()),
+        ('timestamp', time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())),
+        ('repeat', repeat),
+        ('results', results),
+    ])
+
+
+def save_results(results, path):
+    with open(path, 'w') as file:
+        json.dump(results, file, indent=2)
+
+
+def load_results(path):
+    with open(path) as file:
+        return json.load(file, object_pairs_hook=OrderedDict)
+
+
+def compare_results(old_results, new_results, threshold=0.1):
+    """Compare minimum timings of two benchmark results
+
+    :param old_results: Reference results
+    :type old_results: dict
+    :param new_results: Results to compare to the reference
+    :type new_results: dict
+    :param threshold: Relative slowdown above which a benchmark is considered a regression
+    :type threshold: float
+    :return: List of (benchmark, files, old time, new time, ratio, is_regression) for benchmarks in both results
+    :rtype: list
+    """
+
+    old_timings = {(result['benchmark'], result['files']): result['min'] for result in old_results['results']}
+
+    comparison = []
+    for result in new_results['results']:
+        key = (result['benchmark'], result['files'])
+        if key in old_timings:
+            ratio = result['min'] / old_timings[key] if old_timings[key] else float('inf')
+            comparison.append(key + (old_timings[key], result['min'], ratio, ratio > 1 + threshold))
+    return comparison
+
+
+def format_results(results):
+    lines = ['{0:<32}{1:>8}{2:>12}{3:>12}{4:>12}'.format('Benchmark', 'Files', 'Min (s)', 'Median (s)', 'Max (s)')]
+    for result in results['results']:
+        lines.append('{0:<32}{1:>8}{2:>12.4f}{3:>12.4f}{4:>12.4f}'.format(result['benchmark'], result['files'],
+                                                                          result['min'], result['median'],
+                                                                          result['max']))
+    return '\n'.join(lines)
+
+
+def format_comparison(comparison):
+    lines = ['{0:<32}{1:>8}{2:>12}{3:>12}{4:>8}'.format('Benchmark', 'Files', 'Old (s)', 'New (s)', 'Ratio')]
+    for name, files, old_time, new_time, ratio, is_regression in comparison:
+        lines.append('{0:<32}{1:>8}{2:>12.4f}{3:>12.4f}{4:>8.2f}{5}'.format(name, files, old_time, new_time, ratio,
+                                                                            '  regression' if is_regression else ''))
+    return '\n'.join(lines)
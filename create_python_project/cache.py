@@ -0,0 +1,152 @@
+"""
+    create_python_project.cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implements a local cache of boilerplate repositories
+
+    Boilerplates are kept as bare mirrors that are refreshed at most once per TTL. New projects are cloned
+    from the local mirrors (git hardlinks their objects) so creating a project does not need the network.
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import hashlib
+import os
+import re
+import shutil
+import time
+
+from git import Repo, GitCommandError
+
+from .config import get_cache_dir
+from .project import ProjectManager
+
+# Default time (in seconds) during which a mirror is considered fresh
+DEFAULT_TTL = 3600
+
+# Name of the file which modification time indicates last time a mirror has been fetched
+FETCH_STAMP_FILE_NAME = 'crpyproj-fetched'
+
+
+def get_default_cache_dir():
+    """Return default directory of the boilerplate cache"""
+
+    return os.path.join(get_cache_dir(), 'boilerplates')
+
+
+class BoilerplateCache:
+    """Cache of boilerplate bare mirrors
+
+    :param path: Optional directory to store mirrors in
+    :type path: str
+    :param ttl: Optional time in seconds after which a mirror is fetched again
+    :type ttl: int
+    """
+
+    def __init__(self, path=None, ttl=None):
+        self.path = os.path.abspath(os.path.expanduser(path or get_default_cache_dir()))
+        self.ttl = int(ttl) if ttl is not None else DEFAULT_TTL
+
+    def get_mirror_path(self, url):
+        """Return the path of the mirror of a boilerplate
+
+        :param url: Git URL of the boilerplate
+        :type url: str
+        """
+
+        name = re.sub('[^A-Za-z0-9_.-]+', '-', url.rstrip('/').split('/')[-1].split(':')[-1])
+        if name.endswith('.git'):
+            name = name[:-len('.git')]
+        url_hash = hashlib.sha1(url.encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.path, '{name}-{hash}.git'.format(name=name, hash=url_hash))
+
+    def is_fresh(self, mirror_path):
+        """Evaluates if a mirror has been fetched for less than TTL"""
+
+        try:
+            fetched_at = os.path.getmtime(os.path.join(mirror_path, FETCH_STAMP_FILE_NAME))
+        except OSError:
+            return False
+        return time.time() - fetched_at < self.ttl
+
+    def stamp(self, mirror_path):
+        with open(os.path.join(mirror_path, FETCH_STAMP_FILE_NAME), 'w'):
+            pass
+
+    def create_mirror(self, url, mirror_path, progress=None):
+        """Clone a bare mirror of a boilerplate
+
+        Mirror is cloned in a temporary directory and then moved into place so concurrent creations are safe
+        """
+
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = '{path}.tmp-{pid}'.format(path=mirror_path, pid=os.getpid())
+        try:
+            Repo.clone_from(url=url, to_path=tmp_path, progress=progress, mirror=True)
+            self.stamp(tmp_path)
+            os.rename(tmp_path, mirror_path)
+        except OSError:
+            if not os.path.isdir(mirror_path):  # pragma: no cover
+                raise
+        finally:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def fetch(self, mirror_path):
+        """Fetch a mirror
+
+        :return: False if mirror could not be fetched (e.g. when offline) in which case the mirror is left as is
+        """
+
+        try:
+            Repo(mirror_path).git.fetch('--prune', 'origin')
+        except GitCommandError:
+            return False
+
+        self.stamp(mirror_path)
+        return True
+
+    def update(self, url, progress=None):
+        """Ensure an up to date mirror exists for a boilerplate
+
+        Mirror is created if it does not exist and fetched if it is older than TTL
+
+        :param url: Git URL of the boilerplate
+        :type url: str
+        :return: Path of the mirror
+        """
+
+        mirror_path = self.get_mirror_path(url)
+        if not os.path.isdir(mirror_path):
+            self.create_mirror(url, mirror_path, progress=progress)
+        elif not self.is_fresh(mirror_path):
+            self.fetch(mirror_path)
+
+        return mirror_path
+
+    def clone(self, url, to_path, progress=None, **kwargs):
+        """Clone a project from the cached mirror of a boilerplate
+
+        The remote origin of the cloned project points to the boilerplate URL
+
+        :param url: Git URL of the boilerplate
+        :type url: str
+        :param to_path: Path to clone the project to
+        :type to_path: str
+        :param kwargs: Optional extra arguments provided to git clone (e.g. depth=1 or filter='blob:none')
+        :rtype: ProjectManager
+        """
+
+        mirror_path = self.update(url, progress=progress)
+
+        clone_url = mirror_path
+        if 'depth' in kwargs or 'filter' in kwargs:
+            # git ignores shallow and partial clone options for local paths (it requires file:// URLs)
+            clone_url = 'file://{path}'.format(path=mirror_path)
+            if 'filter' in kwargs:
+                Repo(mirror_path).git.config('uploadpack.allowFilter', 'true')
+
+        manager = ProjectManager.clone_from(url=clone_url, to_path=to_path, progress=progress, **kwargs)
+        manager.remotes['origin'].set_url(url)
+
+        return manager
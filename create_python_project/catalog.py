@@ -0,0 +1,289 @@
+"""
+    create_python_project.catalog
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a queryable catalog of metadata of many projects
+
+    The catalog is a SQLite database storing for each project the setup info (c.f. SetupKwargsInfo) and the info of
+    the package __init__.py (c.f. InitInfo) at the HEAD of the project. Refreshing the catalog only reads projects
+    whose HEAD moved since they have been cataloged (reading itself goes through the metadata index of the project so
+    only changed blobs are parsed). Queried fields are stored in indexed columns so queries do not open any project
+
+        catalog = Catalog()
+        catalog.refresh(['services/*'])
+        catalog.query(author_email='*@example.com')
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import glob
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .config import get_cache_dir
+from .events import span
+from .fleet import expand_paths, FleetResult, DEFAULT_FLEET_WORKERS
+from .project import ProjectManager
+from .serialization import SNAPSHOT_VERSION, dumps, loads
+
+# Version of the catalog schema (to be increased on every incompatible change)
+CATALOG_VERSION = 1
+
+# Name of the catalog file
+CATALOG_FILE_NAME = 'catalog.sqlite'
+
+CatalogEntry = namedtuple('CatalogEntry', ['path', 'head', 'name', 'version', 'url', 'author', 'author_email',
+                                           'package', 'package_version', 'updated'])
+CatalogEntry.__doc__ = """Metadata of a cataloged project
+
+:param path: Absolute path of the project
+:param head: SHA of the commit the metadata have been read from
+:param package: Name of the first package of the project
+:param package_version: __version__ of the package __init__.py
+:param updated: Timestamp of the last time the metadata have been read
+"""
+
+# Fields projects can be filtered on
+QUERY_FIELDS = ('path', 'name', 'version', 'url', 'author', 'author_email', 'package', 'package_version')
+
+# Setup keyword arguments stored in the catalog
+SETUP_FIELDS = ('name', 'version', 'url', 'author', 'author_email')
+
+
+def get_default_catalog_path():
+    """Return default path of the catalog"""
+
+    return os.path.join(get_cache_dir(), CATALOG_FILE_NAME)
+
+
+def get_value(info, field):
+    value = getattr(info, field, None) if info is not None else None
+    return value.value if value is not None else None
+
+
+def read_project_metadata(manager, rev='HEAD'):
+    """Read the setup info and the package __init__.py info of a project
+
+    Info are read through the metadata index of the project (c.f. ProjectIndex)
+
+    :param manager: Project to read
+    :type manager: ProjectManager
+    :param rev: Optional revision to read
+    :type rev: str
+    :return: Tuple (SetupKwargsInfo or None, InitInfo or None)
+    """
+
+    setup_info = manager.metadata_index.setup_info(rev)
+    if setup_info is None or not setup_info.packages:
+        return setup_info, None
+
+    try:
+        blob = manager.get_blob('{package}/__init__.py'.format(package=setup_info.packages[0].value), rev=rev)
+    except KeyError:
+        return setup_info, None
+
+    return setup_info, manager.metadata_index.get_info(blob).code
+
+
+class Catalog:
+    """Persistent catalog of project metadata
+
+    It can be refreshed by multiple threads
+
+    :param path: Optional path of the catalog file (c.f. get_default_catalog_path)
+    :type path: str
+    """
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)',
+        'CREATE TABLE IF NOT EXISTS projects (path TEXT PRIMARY KEY, head TEXT, name TEXT, version TEXT, url TEXT, '
+        'author TEXT, author_email TEXT, package TEXT, package_version TEXT, updated REAL, setup_info BLOB, '
+        'init_info BLOB)',
+        'CREATE INDEX IF NOT EXISTS projects_name ON projects (name)',
+        'CREATE INDEX IF NOT EXISTS projects_author ON projects (author)',
+        'CREATE INDEX IF NOT EXISTS projects_author_email ON projects (author_email)',
+    ]
+
+    def __init__(self, path=None):
+        self.path = path or get_default_catalog_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self.init_schema()
+
+    def init_schema(self):
+        """Create catalog tables and reset the catalog if it has been built with another version"""
+
+        version = '{0}.{1}'.format(CATALOG_VERSION, SNAPSHOT_VERSION)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+            row = self.connection.execute('SELECT value FROM meta WHERE key = ?', ('version',)).fetchone()
+            if row is None or row[0] != version:
+                self.connection.execute('DELETE FROM projects')
+                self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', ('version', version))
+
+    def close(self):
+        self.connection.close()
+
+    def _execute(self, *args):
+        with self._lock:
+            return self.connection.execute(*args).fetchall()
+
+    def get_paths(self):
+        """Return paths of the cataloged projects"""
+
+        return [row[0] for row in self._execute('SELECT path FROM projects ORDER BY path')]
+
+    def get(self, path):
+        """Return the entry of a project or None if it is not cataloged
+
+        :rtype: CatalogEntry
+        """
+
+        rows = self._execute('SELECT {fields} FROM projects WHERE path = ?'.format(
+            fields=', '.join(CatalogEntry._fields)), (os.path.abspath(path),))
+        return CatalogEntry(*rows[0]) if rows else None
+
+    def get_info(self, path):
+        """Return the info of a cataloged project
+
+        :return: Tuple (SetupKwargsInfo or None, InitInfo or None)
+        """
+
+        rows = self._execute('SELECT setup_info, init_info FROM projects WHERE path = ?', (os.path.abspath(path),))
+        assert rows, 'Project {path} is not cataloged'.format(path=path)
+        return tuple([loads(snapshot) if snapshot is not None else None for snapshot in rows[0]])
+
+    def set(self, path, head, setup_info, init_info):
+        """Store the metadata of a project"""
+
+        values = (os.path.abspath(path), head) + tuple([get_value(setup_info, field) for field in SETUP_FIELDS]) + \
+            (setup_info.packages[0].value if setup_info is not None and setup_info.packages else None,
+             get_value(init_info, 'version'), time.time(),
+             dumps(setup_info, format='binary') if setup_info is not None else None,
+             dumps(init_info, format='binary') if init_info is not None else None)
+
+        with self._lock, self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO projects (path, head, {fields}, package, package_version, '
+                                    'updated, setup_info, init_info) VALUES ({values})'.format(
+                                        fields=', '.join(SETUP_FIELDS), values=', '.join(['?'] * len(values))),
+                                    values)
+
+    def remove(self, paths):
+        """Remove projects from the catalog
+
+        :param paths: Paths of the projects
+        :type paths: list
+        """
+
+        with self._lock, self.connection:
+            self.connection.executemany('DELETE FROM projects WHERE path = ?',
+                                        [(os.path.abspath(path),) for path in paths])
+
+    def refresh_project(self, path, force=False):
+        """Catalog a project if its HEAD moved since it has been cataloged
+
+        :param path: Path of the project
+        :type path: str
+        :param force: Read the project even if its HEAD did not move
+        :type force: bool
+        :return: Result with value 'updated' or 'unchanged'
+        :rtype: FleetResult
+        """
+
+        path = os.path.abspath(path)
+
+        start = time.perf_counter()
+        try:
+            with span('catalog', path=path):
+                manager = ProjectManager(path)
+                try:
+                    head = manager.head.commit.hexsha
+                    entry = self.get(path)
+                    if not force and entry is not None and entry.head == head:
+                        value = 'unchanged'
+                    else:
+                        self.set(path, head, *read_project_metadata(manager, rev=head))
+                        value = 'updated'
+                finally:
+                    manager.close()
+        except Exception as error:
+            message = '{type}: {error}'.format(type=type(error).__name__, error=error)
+            return FleetResult(path, False, None, message, time.perf_counter() - start)
+
+        return FleetResult(path, True, value, None, time.perf_counter() - start)
+
+    def refresh(self, paths=None, workers=DEFAULT_FLEET_WORKERS, force=False, on_result=None):
+        """Catalog multiple projects
+
+        :param paths: Optional paths or glob patterns of the projects (c.f. expand_paths), defaults to the cataloged
+            projects
+        :type paths: list
+        :param workers: Maximum number of projects read concurrently
+        :type workers: int
+        :param force: Read projects even if their HEAD did not move
+        :type force: bool
+        :param on_result: Optional function called with every FleetResult as soon as it is available
+        :return: List of FleetResult in the order of the paths
+        :rtype: list
+        """
+
+        assert workers > 0, 'workers must be positive but you passed {0}'.format(workers)
+
+        paths = expand_paths(paths) if paths is not None else self.get_paths()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.refresh_project, path, force=force) for path in paths]
+            if on_result is not None:
+                for future in as_completed(futures):
+                    on_result(future.result())
+            return [future.result() for future in futures]
+
+    def query(self, order_by='path', **filters):
+        """Return cataloged projects matching filters
+
+        Filters are exact values or glob patterns (e.g. author_email='*@example.com')
+
+        :param order_by: Field to order projects by
+        :type order_by: str
+        :param filters: Filters per field (c.f. QUERY_FIELDS)
+        :return: List of CatalogEntry
+        :rtype: list
+        """
+
+        unknown_fields = sorted(set(filters) - set(QUERY_FIELDS))
+        assert not unknown_fields, \
+            'Catalog can be queried on {fields} but you passed {unknown}'.format(fields=QUERY_FIELDS,
+                                                                                 unknown=unknown_fields)
+        assert order_by in CatalogEntry._fields, 'Can not order projects by {0}'.format(order_by)
+
+        clauses, args = [], []
+        for field, pattern in sorted(filters.items()):
+            if pattern is not None:
+                operator = 'GLOB' if glob.has_magic(pattern) else '='
+                clauses.append('{field} {operator} ?'.format(field=field, operator=operator))
+                args.append(pattern)
+
+        rows = self._execute('SELECT {fields} FROM projects {where} ORDER BY {order_by}, path'.format(
+            fields=', '.join(CatalogEntry._fields),
+            where='WHERE ' + ' AND '.join(clauses) if clauses else '',
+            order_by=order_by), args)
+        return [CatalogEntry(*row) for row in rows]
+
+
+def format_entries(entries):
+    lines = ['{0:<40}{1:<24}{2:<12}{3:<14}{4}'.format('Path', 'Name', 'Version', '__version__', 'Author')]
+    for entry in entries:
+        author = entry.author or ''
+        if entry.author_email is not None:
+            author = '{0} <{1}>'.format(author, entry.author_email).strip()
+        lines.append('{0:<40}{1:<24}{2:<12}{3:<14}{4}'.format(
+            entry.path, entry.name or '', entry.version or '', entry.package_version or '', author))
+    return '\n'.join(lines)
@@ -0,0 +1,289 @@
+"""
+    create_python_project.changelog
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement generation of a changelog from conventional commits
+
+    Commits are streamed from ``git rev-list`` and their headers (e.g. ``refactor(all): rename project``) are parsed
+    once: parsed commits are cached by SHA in a SQLite database stored in the git directory of the project, so
+    regenerating the changelog after new commits only reads and parses the new commits.
+
+    Commits are grouped in a section per version tag (commits that are not released yet are grouped in an
+    ``Unreleased`` section) and by type of change within a section
+
+        Version 0.1.0
+        -------------
+
+        Features
+
+        - Cli: Add new command
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+import re
+import sqlite3
+from collections import namedtuple, OrderedDict
+
+from git import Commit
+from git.util import hex_to_bin
+
+from .tags import get_version_key
+
+ConventionalCommit = namedtuple('ConventionalCommit', ['hexsha', 'type', 'scope', 'subject', 'breaking'])
+ConventionalCommit.__doc__ = """Parsed header of a conventional commit
+
+:param type: Type of change (e.g. feat, fix, refactor)
+:param scope: Optional scope of the change (e.g. all)
+:param subject: Description of the change
+:param breaking: Whether or not the commit introduces a breaking change
+"""
+
+# Header of conventional commits: type(scope)!: subject
+COMMIT_HEADER_PATTERN = re.compile(r'^(?P<type>[a-zA-Z]+)(?:\((?P<scope>[^()]*)\))?(?P<breaking>!)?: (?P<subject>.+)$')
+
+BREAKING_CHANGE_PATTERN = re.compile(r'^BREAKING[ -]CHANGE:', re.MULTILINE)
+
+# Types of change reported in the changelog with their titles (in the order they are rendered)
+SECTION_TYPES = OrderedDict([
+    ('feat', 'Features'),
+    ('fix', 'Fixes'),
+    ('perf', 'Performance'),
+    ('refactor', 'Refactor'),
+    ('docs', 'Docs'),
+    ('test', 'Tests'),
+    ('chore', 'Chore'),
+])
+
+UNRELEASED_TITLE = 'Unreleased'
+VERSION_TITLE = 'Version {version}'
+
+# Underline symbol of the sections of the changelog
+SECTION_SYMBOL = '-'
+
+CHANGELOG_HEADER = 'Changelog\n' \
+                   '=========\n' \
+                   '\n' \
+                   'Here you can see the full list of changes between each releases of {name}.\n'
+
+# Name of the cache file in the git directory
+CACHE_FILE_NAME = 'crpyproj-changelog'
+
+
+def parse_commit_message(hexsha, message):
+    """Parse the header of a conventional commit message
+
+    :param hexsha: SHA of the commit
+    :type hexsha: str
+    :param message: Message of the commit
+    :type message: str
+    :return: Parsed commit or None if message is not a conventional commit message
+    :rtype: ConventionalCommit
+    """
+
+    match = COMMIT_HEADER_PATTERN.match(message.split('\n', 1)[0].strip())
+    if match is None:
+        return None
+
+    return ConventionalCommit(hexsha=hexsha,
+                              type=match.group('type').lower(),
+                              scope=match.group('scope') or None,
+                              subject=match.group('subject').strip(),
+                              breaking=bool(match.group('breaking') or BREAKING_CHANGE_PATTERN.search(message)))
+
+
+class CommitCache:
+    """Persistent cache of parsed commits
+
+    Commits that are not conventional commits are cached too so they are not read again
+
+    :param repo: Repository the commits belong to
+    :type repo: git.Repo
+    :param path: Optional path of the cache file (defaults to .git/crpyproj-changelog)
+    :type path: str
+    """
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS commits (sha TEXT PRIMARY KEY, type TEXT, scope TEXT, subject TEXT, '
+        'breaking INTEGER)',
+    ]
+
+    def __init__(self, repo, path=None):
+        self.repo = repo
+        self.path = path or os.path.join(repo.git_dir, CACHE_FILE_NAME)
+        self.connection = sqlite3.connect(self.path)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.connection.close()
+
+    def get(self, hexsha):
+        """Return a cached commit
+
+        :return: Tuple (is_cached, ConventionalCommit or None)
+        """
+
+        row = self.connection.execute('SELECT type, scope, subject, breaking FROM commits WHERE sha = ?',
+                                      (hexsha,)).fetchone()
+        if row is None:
+            return False, None
+        if row[0] is None:
+            return True, None
+        return True, ConventionalCommit(hexsha, row[0], row[1], row[2], bool(row[3]))
+
+    def add(self, commits):
+        """Cache parsed commits
+
+        :param commits: List of (hexsha, ConventionalCommit or None)
+        :type commits: list
+        """
+
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO commits (sha, type, scope, subject, breaking) VALUES (?, ?, ?, ?, ?)',
+                [(hexsha,) + ((commit.type, commit.scope, commit.subject, int(commit.breaking))
+                              if commit is not None else (None, None, None, None))
+                 for hexsha, commit in commits])
+
+
+def iter_parsed_commits(repo, rev='HEAD', from_rev=None, cache=None):
+    """Stream commits from a revision with their parsed header (most recent first)
+
+    :param repo: Repository to read commits from
+    :type repo: RepositoryManager
+    :param rev: Revision to read commits from
+    :type rev: str
+    :param from_rev: Optional revision to stop at (excluded)
+    :type from_rev: str
+    :param cache: Optional cache of parsed commits (new commits are added to it)
+    :type cache: CommitCache
+    :return: Iterator over tuples (hexsha, ConventionalCommit or None if commit is not a conventional commit)
+    """
+
+    parsed = []
+    try:
+        for hexsha in repo.iter_commit_hexshas(rev=rev, from_rev=from_rev):
+            is_cached, commit = cache.get(hexsha) if cache is not None else (False, None)
+            if not is_cached:
+                commit = parse_commit_message(hexsha, Commit(repo, hex_to_bin(hexsha)).message)
+                parsed.append((hexsha, commit))
+
+            yield hexsha, commit
+    finally:
+        if cache is not None and parsed:
+            cache.add(parsed)
+
+
+def get_version_tags(repo):
+    """Return mapping of tagged commit SHAs to the highest version they are tagged with"""
+
+    version_tags = {}
+    for tag in repo.list_tags(order='version'):
+        if get_version_key(tag.name) is not None:
+            version_tags.setdefault(tag.commit_hexsha, tag.name)
+    return version_tags
+
+
+def format_version(tag_name):
+    return tag_name[1:] if tag_name[:1] in ('v', 'V') else tag_name
+
+
+def iter_sections(commits, version_tags):
+    """Group commits into changelog sections
+
+    :param commits: Parsed commits, most recent first (c.f. iter_parsed_commits)
+    :param version_tags: Mapping of commit SHAs to version tags (c.f. get_version_tags)
+    :type version_tags: dict
+    :return: Iterator over tuples (title, OrderedDict of entries per type of change)
+    """
+
+    title, entries = UNRELEASED_TITLE, OrderedDict()
+    for hexsha, commit in commits:
+        if hexsha in version_tags:
+            if entries:
+                yield title, entries
+            title, entries = VERSION_TITLE.format(version=format_version(version_tags[hexsha])), OrderedDict()
+
+        if commit is not None and commit.type in SECTION_TYPES:
+            entries.setdefault(commit.type, []).append(commit)
+
+    if entries:
+        yield title, entries
+
+
+def format_entry(commit):
+    subject = commit.subject[:1].upper() + commit.subject[1:]
+    if commit.scope is not None:
+        subject = '{scope}: {subject}'.format(scope=commit.scope[:1].upper() + commit.scope[1:], subject=subject)
+    if commit.breaking:
+        subject += ' (breaking change)'
+    return '- {subject}'.format(subject=subject)
+
+
+def render_section(title, entries):
+    """Render a changelog section
+
+    :rtype: list of lines
+    """
+
+    lines = [title, SECTION_SYMBOL * len(title), '']
+    for commit_type, title in SECTION_TYPES.items():
+        if commit_type in entries:
+            lines.extend([title, ''] + [format_entry(commit) for commit in entries[commit_type]] + [''])
+    return lines
+
+
+def is_section_title(lines, lineno):
+    line = lines[lineno].rstrip()
+    if not line or lineno + 1 >= len(lines):
+        return False
+    underline = lines[lineno + 1].rstrip()
+    return len(underline) >= len(line) and underline == underline[:1] * len(underline) and \
+        underline[:1] == SECTION_SYMBOL
+
+
+def split_sections(lines, start=0):
+    """Split changelog lines into a header and sections
+
+    :param lines: Lines of the changelog
+    :type lines: list
+    :param start: Line to start looking for sections from (e.g. after the document title)
+    :type start: int
+    :return: Tuple (header lines, OrderedDict of section lines per section title)
+    """
+
+    header, sections, section = [], OrderedDict(), None
+    for lineno, line in enumerate(lines):
+        if lineno >= start and is_section_title(lines, lineno):
+            section = sections.setdefault(line.rstrip(), [])
+        (header if section is None else section).append(line)
+    return header, sections
+
+
+def merge_sections(header, old_sections, new_sections):
+    """Merge generated sections into the lines of a changelog
+
+    Generated sections replace existing sections with the same title, other existing sections (e.g. releases older
+    than the commits the changelog has been generated from) are kept after them
+
+    :rtype: list of lines
+    """
+
+    header = list(header)
+    while header and not header[-1].strip():
+        header.pop()
+
+    lines = header + ['']
+    for title, section in new_sections.items():
+        lines.extend(section)
+    for title, section in old_sections.items():
+        if title not in new_sections:
+            lines.extend(section)
+
+    while lines and not lines[-1].strip():
+        lines.pop()
+    return lines + ['']
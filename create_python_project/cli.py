@@ -9,45 +9,137 @@
 """
 
 import os
+import time
+from contextlib import contextmanager
 
 import click
-import git
 
 from .config import read_config
-from .project import ProjectManager
+from .events import ChromeTraceExporter, span
+from .profiling import Profiler, FORMATS as PROFILE_FORMATS, can_trace_memory
+from .pyutils import lazy_import, set_lazy_attributes
 from .utils import is_git_url
 
+# GitPython, docutils... are only imported once a command actually manipulates a project
+bench = lazy_import('.bench', __package__)
+cache = lazy_import('.cache', __package__)
+catalog = lazy_import('.catalog', __package__)
+fleet = lazy_import('.fleet', __package__)
+transform_cache = lazy_import('.transform_cache', __package__)
+json = lazy_import('json')
+project = lazy_import('.project', __package__)
+progress = lazy_import('.progress', __package__)
+
+set_lazy_attributes(__name__, {
+    'ProjectManager': '.project',
+    'Progress': '.progress',
+})
+
 # Location of the configuration file
 CONFIG_FILE_NAME = '.crpyprojrc'
 CONFIG_FILE_LOCATION = os.path.join(os.path.expanduser('~'), CONFIG_FILE_NAME)
 
 
-class Progress(git.RemoteProgress):
-    """Allow to output git log when cloning project"""
+@contextmanager
+def open_transform_cache(path):
+    """Open a cache of transformation outputs and close it on exit (yields None if path is None)"""
 
-    def line_dropped(self, line):
-        click.echo(line)
+    if path is None:
+        yield None
+        return
 
-    def update(self, op_code, *args, **kwargs):
-        if op_code & self.END:
-            click.echo(self._cur_line)
+    outputs_cache = transform_cache.TransformCache(path)
+    try:
+        yield outputs_cache
+    finally:
+        outputs_cache.close()
 
 
 @click.group()
 @click.option('--config-file', 'file_path',
               help='Custom path to the configuration file',
               default=CONFIG_FILE_LOCATION)
+@click.option('--profile', 'profile_enabled',
+              is_flag=True,
+              help='Print time spent per phase and per script class once the command is done')
+@click.option('--profile-format', 'profile_format',
+              type=click.Choice(PROFILE_FORMATS),
+              default='table',
+              help='Format of the profiling report')
+@click.option('--profile-top', 'profile_top',
+              type=int,
+              default=10,
+              help='Number of slowest files in the profiling report')
+@click.option('--profile-memory', 'profile_memory',
+              is_flag=True,
+              help='Measure peak memory of the process while each phase is running (Python 3.9+, slows the command '
+                   'down)')
+@click.option('--trace-file', 'trace_file',
+              type=click.Path(dir_okay=False, writable=True),
+              help='Write a Chrome trace-event JSON file of the command (c.f. chrome://tracing)')
 @click.pass_context
-def cli(ctx, file_path):
-    ctx.obj = read_config(config_levels=['system', 'global'], file_paths=[file_path])
+def cli(ctx, file_path, profile_enabled, profile_format, profile_top, profile_memory, trace_file):
+    # Configuration is resolved by commands as it depends on the boilerplate (c.f. config.resolve_config)
+    ctx.obj = {
+        'config_levels': ['system', 'global'],
+        'file_paths': [file_path],
+    }
+
+    if profile_enabled:
+        if profile_memory and not can_trace_memory():
+            click.secho('Peak memory of phases can only be measured on Python 3.9+', fg='red')
+            ctx.exit(1)
+        profiler = Profiler(top=profile_top, trace_memory=profile_memory).start()
+        ctx.call_on_close(lambda: click.echo(profiler.stop().report(profile_format), err=True))
+
+    if trace_file is not None:
+        exporter = ChromeTraceExporter(os.path.abspath(trace_file)).start()
+        ctx.call_on_close(exporter.stop)
+
+
+def read_boilerplate_config(ctx, boilerplate, config_sources, **kwargs):
+    """Read the configuration of a boilerplate given by git URL or by name (exits if no valid git URL is found)"""
+
+    if is_git_url(boilerplate):
+        config = read_config(boilerplate_git_url=boilerplate,
+                             **config_sources,
+                             **kwargs)
+    else:
+        config = read_config(boilerplate_name=boilerplate,
+                             **config_sources,
+                             **kwargs)
+
+    # ensure a valid git url to clone the project from has been provided
+    if config.boilerplate_git_url is None or not is_git_url(config.boilerplate_git_url):
+        click.secho('Could not find a valid git URL for boilerplate \'{name}\' in {location} config file(s). '
+                    'Please ensure you have correctly set up a configuration file with a [boilerplate:{name}] '
+                    'section containing a valid \'url\' option.'.format(name=boilerplate,
+                                                                        location=config.attempted_config_files),
+                    fg='red')
+        ctx.exit(1)
+
+    return config
+
+
+def compose_boilerplates(manager, config, overlay_urls):
+    """Layer overlay boilerplates over a cloned boilerplate (overlays are fetched from the cache if configured)"""
+
+    sources = None
+    if config.cache_dir is not None:
+        boilerplate_cache = cache.BoilerplateCache(config.cache_dir, ttl=config.cache_ttl)
+        sources = {url: boilerplate_cache.update(url, progress=progress.Progress()) for url in overlay_urls}
+
+    return manager.compose_boilerplates(overlay_urls, sources=sources)
 
 
 @cli.command(name='new')
-@click.option('--boilerplate', '-b', 'boilerplate_git_url',
+@click.option('--boilerplate', '-b', 'boilerplates',
               type=str,
-              default='DEFAULT',
+              multiple=True,
+              default=['DEFAULT'],
               help='Git URL of the repository to clone a project from or '
-                   'name of the boilerplate as indicated in ~/.crpyprojrc file')
+                   'name of the boilerplate as indicated in ~/.crpyprojrc file. It can be repeated to layer overlay '
+                   'boilerplates over the first one (later boilerplates take precedence)')
 @click.option('--git-url', '-u', 'project_git_url',
               type=str,
               help='Git URL of your project')
@@ -61,55 +153,439 @@ def cli(ctx, file_path):
 @click.option('--author-email', '-e', 'author_email',
               type=str,
               help='Author\'s email of the project')
+@click.option('--cache-dir', 'cache_dir',
+              type=str,
+              help='Directory of the local boilerplate cache (boilerplates are cloned directly if not set)')
+@click.option('--cache-ttl', 'cache_ttl',
+              type=int,
+              help='Time in seconds after which cached boilerplates are fetched again')
+@click.option('--depth', 'depth',
+              type=int,
+              help='Clone only the given number of commits of the boilerplate history')
+@click.option('--filter', 'clone_filter',
+              type=str,
+              help='Partial clone filter of the boilerplate (e.g. blob:none)')
+@click.option('--fresh-history', 'fresh_history',
+              is_flag=True,
+              help='Start the project history with a single root commit holding the boilerplate tree')
+@click.option('--atomic-writes/--in-place-writes', 'write_atomic',
+              default=None,
+              help='Write scripts to temporary files renamed into place (default) or directly in place')
+@click.option('--fsync/--no-fsync', 'write_fsync',
+              default=None,
+              help='Sync written scripts to disk (default) or leave it to the operating system')
+@click.option('--transform-cache', 'transform_cache_path',
+              type=click.Path(dir_okay=False, writable=True),
+              help='File of a cache of transformation outputs shared by projects (boilerplate scripts are only '
+                   'transformed once for identical values)')
 @click.argument('project_name',
                 type=str,
                 required=True)
 @click.pass_obj
 @click.pass_context
-def new(ctx, config, boilerplate_git_url, project_git_url, project_name, **kwargs):
+def new(ctx, config_sources, boilerplates, project_git_url, project_name,
+        depth, clone_filter, fresh_history, transform_cache_path, **kwargs):
     """Creates a new project"""
 
-    if is_git_url(boilerplate_git_url):
-        config = read_config(config=config,
-                             boilerplate_git_url=boilerplate_git_url,
-                             **kwargs)
-    else:
-        config = read_config(config=config,
-                             boilerplate_name=boilerplate_git_url,
-                             **kwargs)
-
-        # ensure a valid git url to clone the project from has been provided
-        if config.boilerplate_git_url is None or not is_git_url(config.boilerplate_git_url):
-            click.secho('Could not find a valid git URL for boilerplate \'{name}\' in {location} config file(s). '
-                        'Please ensure you have correctly set up a configuration file with a [boilerplate:{name}] '
-                        'section containing a valid \'url\' option.'.format(name=boilerplate_git_url,
-                                                                            location=config.attempted_config_files),
-                        fg='red')
-            ctx.exit(1)
+    with span('config'):
+        config = read_boilerplate_config(ctx, boilerplates[0], config_sources, **kwargs)
+        overlay_urls = [read_boilerplate_config(ctx, overlay, config_sources).boilerplate_git_url
+                        for overlay in boilerplates[1:]]
 
     click.echo('Creating new project {name} from {git_url}...'.format(name=project_name,
                                                                       git_url=config.boilerplate_git_url))
 
-    # Clone boilerplate
-    manager = ProjectManager.clone_from(url=config.boilerplate_git_url, to_path=project_name, progress=Progress())
+    # Clone boilerplate (only the last commit is needed when history is not kept)
+    clone_kwargs = {}
+    if depth is not None or fresh_history:
+        clone_kwargs['depth'] = depth or 1
+    if clone_filter is not None:
+        clone_kwargs['filter'] = clone_filter
+
+    with span('clone'):
+        if config.cache_dir is not None:
+            boilerplate_cache = cache.BoilerplateCache(config.cache_dir, ttl=config.cache_ttl)
+            manager = boilerplate_cache.clone(url=config.boilerplate_git_url, to_path=project_name,
+                                              progress=progress.Progress(), **clone_kwargs)
+        else:
+            manager = project.ProjectManager.clone_from(url=config.boilerplate_git_url, to_path=project_name,
+                                                        progress=progress.Progress(), **clone_kwargs)
 
-    # Set project origins
     click.echo("Contextualizing project...")
-    if project_git_url is not None:  # pragma: no branch
-        manager.set_project_origin(config.upstream, project_git_url)
-        click.echo('- Set project remote origin to {url}'.format(url=project_git_url))
 
-    # Rename project
-    new_name = manager.set_project_name(project_name)
-    click.echo('- Project name has been set to {name}'.format(name=new_name))
+    manager.write_options = dict(manager.write_options, **config.write_options)
+
+    # Reset project history
+    if fresh_history:
+        manager.squash_history(manager.make_message('chore(all): initialize project from {url}\n'
+                                                    '\n'
+                                                    '{postfix}', url=config.boilerplate_git_url))
+        click.echo('- Project history has been reset to a single root commit')
 
-    # Rename author
-    if config.author_name is not None:  # pragma: no branch
-        manager.set_project_author(author_name=config.author_name)
-        click.echo('- Project author\'s name has been set to {name}'.format(name=config.author_name))
+    # Layer overlay boilerplates over the cloned boilerplate
+    if overlay_urls:
+        with span('compose'):
+            overridden = compose_boilerplates(manager, config, overlay_urls)
+        click.echo('- Project has been composed with {urls} ({count} file(s) overridden)'.format(
+            urls=', '.join(overlay_urls), count=len(overridden)))
 
-    if config.author_email is not None:  # pragma: no branch
-        manager.set_project_author(author_email=config.author_email)
-        click.echo('- Project author\'s email has been set to {email}'.format(email=config.author_email))
+    # Set project origin, name and author in a single pass
+    with span('contextualize'), open_transform_cache(transform_cache_path) as outputs_cache:
+        manager.transform_cache = outputs_cache
+        values = manager.contextualize(name=project_name,
+                                       url=project_git_url,
+                                       author_name=config.author_name,
+                                       author_email=config.author_email,
+                                       upstream=config.upstream)
+
+    if 'url' in values:
+        click.echo('- Set project remote origin to {url}'.format(url=values['url']))
+
+    click.echo('- Project name has been set to {name}'.format(name=values['name']))
+
+    if 'author_name' in values:
+        click.echo('- Project author\'s name has been set to {name}'.format(name=values['author_name']))
+
+    if 'author_email' in values:
+        click.echo('- Project author\'s email has been set to {email}'.format(email=values['author_email']))
 
     click.secho('Project successfully created!! Happy coding! :-)', fg='green')
+
+
+@cli.command(name='bench')
+@click.option('--repo', 'repo_path',
+              type=click.Path(exists=True, file_okay=False),
+              help='Benchmark a clone of this repository instead of synthetic repositories')
+@click.option('--files', '-n', 'sizes',
+              type=int,
+              multiple=True,
+              help='Number of files of a synthetic repository to benchmark (can be repeated, default 10, 1000 '
+                   'and 10000)')
+@click.option('--benchmark', '-k', 'benchmarks',
+              type=str,
+              multiple=True,
+              help='Name of a benchmark to run (can be repeated, default all of them)')
+@click.option('--repeat', 'repeat',
+              type=int,
+              default=3,
+              help='Number of runs of each benchmark')
+@click.option('--lines', 'lines',
+              type=int,
+              default=40,
+              help='Approximate number of lines of synthetic text files')
+@click.option('--binary-size', 'binary_size',
+              type=int,
+              default=4096,
+              help='Size in bytes of synthetic binary files')
+@click.option('--output', '-o', 'output',
+              type=click.Path(dir_okay=False, writable=True),
+              help='Write results to this JSON file')
+@click.option('--compare', 'compare',
+              type=click.Path(exists=True, dir_okay=False),
+              help='JSON file of reference results to compare with (e.g. results of a previous commit)')
+@click.option('--threshold', 'threshold',
+              type=float,
+              default=0.1,
+              help='Relative slowdown above which a benchmark is reported as a regression')
+@click.pass_context
+def bench_command(ctx, repo_path, sizes, benchmarks, repeat, lines, binary_size, output, compare, threshold):
+    """Benchmarks project operations"""
+
+    unknown_benchmarks = [name for name in benchmarks if name not in bench.BENCHMARKS]
+    if unknown_benchmarks:
+        click.secho('Unknown benchmark(s) {unknown}. Available benchmarks are {names}'.format(
+            unknown=', '.join(unknown_benchmarks), names=', '.join(bench.BENCHMARKS)), fg='red')
+        ctx.exit(1)
+
+    results = bench.run_suite(sizes=sizes or bench.DEFAULT_SIZES,
+                              repo_path=repo_path,
+                              benchmarks=benchmarks or None,
+                              repeat=repeat,
+                              lines=lines,
+                              binary_size=binary_size)
+
+    click.echo(bench.format_results(results))
+
+    if output is not None:
+        bench.save_results(results, output)
+        click.echo('Results have been written to {path}'.format(path=output))
+
+    if compare is not None:
+        comparison = bench.compare_results(bench.load_results(compare), results, threshold=threshold)
+        click.echo('')
+        click.echo(bench.format_comparison(comparison))
+        if any([is_regression for *_, is_regression in comparison]):
+            click.secho('Some benchmarks regressed by more than {percent:.0%}'.format(percent=threshold), fg='red')
+            ctx.exit(1)
+
+
+@cli.command(name='changelog')
+@click.option('--path', 'repo_path',
+              type=click.Path(exists=True, file_okay=False),
+              default='.',
+              help='Path of the project')
+@click.option('--file', '-f', 'changelog_path',
+              type=str,
+              default='CHANGES.rst',
+              help='Path of the changelog relative to the project root')
+@click.option('--rev', 'rev',
+              type=str,
+              default='HEAD',
+              help='Revision to generate the changelog from')
+@click.option('--from-rev', 'from_rev',
+              type=str,
+              help='Revision which commits are left out of the changelog (usually the last tag of a hand-written '
+                   'changelog)')
+@click.option('--dry-run', 'dry_run',
+              is_flag=True,
+              help='Print the changelog instead of writing it')
+def changelog(repo_path, changelog_path, rev, from_rev, dry_run):
+    """Generates the changelog from conventional commits"""
+
+    manager = project.ProjectManager(repo_path, search_parent_directories=True)
+
+    if dry_run:
+        click.echo(manager.render_changelog(path=changelog_path, rev=rev, from_rev=from_rev).content.output())
+    elif manager.update_changelog(path=changelog_path, rev=rev, from_rev=from_rev):
+        click.echo('{path} has been updated'.format(path=changelog_path))
+    else:
+        click.echo('{path} is up to date'.format(path=changelog_path))
+
+
+@cli.command(name='sync-upstream')
+@click.option('--path', 'repo_path',
+              type=click.Path(exists=True, file_okay=False),
+              default='.',
+              help='Path of the project')
+@click.option('--upstream', 'upstream',
+              type=str,
+              default='boilerplate',
+              help='Name of the remote of the boilerplate the project has been created from')
+@click.option('--branch', 'branch',
+              type=str,
+              help='Branch of the upstream to synchronize with (defaults to the default branch of the upstream)')
+@click.option('--fetch/--no-fetch', 'fetch',
+              default=True,
+              help='Fetch the upstream first (default) or synchronize with the upstream branch as already fetched')
+@click.option('--no-commit', 'no_commit',
+              is_flag=True,
+              help='Leave synchronized files staged instead of committing them')
+@click.option('--continue', 'continue_',
+              is_flag=True,
+              help='Commit a synchronization once its conflicts have been resolved and staged')
+@click.pass_context
+def sync_upstream(ctx, repo_path, upstream, branch, fetch, no_commit, continue_):
+    """Merges the upstream boilerplate changes since the last synchronization into the project"""
+
+    manager = project.ProjectManager(repo_path, search_parent_directories=True)
+    if continue_:
+        state = manager.continue_sync_upstream()
+        click.echo('Project is synchronized with upstream commit {sha}'.format(sha=state.tip[:7]))
+        return
+
+    changes = manager.sync_upstream(upstream=upstream, branch=branch, fetch=fetch, commit=not no_commit)
+
+    for change in changes:
+        if change.status != 'unchanged':
+            click.echo('{status:>10}  {path}'.format(status=change.status, path=change.path))
+
+    conflicts = [change.path for change in changes if change.status == 'conflict']
+    if conflicts:
+        click.secho('{count} conflict(s): resolve them, stage them and run sync-upstream --continue'.format(
+            count=len(conflicts)), fg='red')
+        ctx.exit(1)
+
+    click.echo('Project is synchronized with {upstream} ({count} file(s) changed upstream)'.format(
+        upstream=upstream, count=len(changes)))
+
+
+@cli.command(name='fleet')
+@click.argument('operation',
+                type=str)
+@click.argument('paths',
+                nargs=-1)
+@click.option('--paths-file', 'paths_file',
+              type=click.File('r'),
+              help='File listing paths or glob patterns of the projects (one per line)')
+@click.option('--workers', '-j', 'workers',
+              type=int,
+              help='Maximum number of projects processed concurrently (default 4)')
+@click.option('--author-name', '-a', 'author_name',
+              type=str,
+              help='Author of the projects (set-author)')
+@click.option('--author-email', '-e', 'author_email',
+              type=str,
+              help='Author\'s email of the projects (set-author)')
+@click.option('--url', '-u', 'url',
+              type=str,
+              help='Git URL of the projects (set-url)')
+@click.option('--license', 'license',
+              type=str,
+              help='License sentence of .py script headers (set-py-script-headers)')
+@click.option('--copyright', 'copyright',
+              type=str,
+              help='Copyright sentence of .py script headers (set-py-script-headers)')
+@click.option('--changelog-file', 'path',
+              type=str,
+              help='Path of the changelog relative to the project roots (changelog)')
+@click.option('--format', 'output_format',
+              type=click.Choice(['table', 'json']),
+              default='table',
+              help='Format of the report')
+@click.option('--transform-cache', 'transform_cache_path',
+              type=click.Path(dir_okay=False, writable=True),
+              help='File of a cache of transformation outputs shared by projects (identical scripts are only '
+                   'transformed once)')
+@click.pass_context
+def fleet_command(ctx, operation, paths, paths_file, workers, output_format, transform_cache_path, **kwargs):
+    """Runs an operation on many projects (set-author, set-url, set-py-script-headers, changelog or info)"""
+
+    if operation not in fleet.FLEET_OPERATIONS:
+        click.secho('Unknown operation {operation}. Available operations are {operations}'.format(
+            operation=operation, operations=', '.join(fleet.FLEET_OPERATIONS)), fg='red')
+        ctx.exit(1)
+
+    kwargs = {name: value for name, value in kwargs.items() if value is not None}
+    unexpected_kwargs = sorted(set(kwargs) - set(fleet.FLEET_OPERATIONS[operation][1]))
+    if unexpected_kwargs:
+        click.secho('Operation {operation} does not accept option(s) {options}'.format(
+            operation=operation, options=', '.join(['--' + name.replace('_', '-') for name in unexpected_kwargs])),
+            fg='red')
+        ctx.exit(1)
+
+    paths = list(paths)
+    if paths_file is not None:
+        paths.extend([line.strip() for line in paths_file if line.strip()])
+
+    start = time.perf_counter()
+    with open_transform_cache(transform_cache_path) as outputs_cache:
+        results = fleet.run_fleet(paths, operation,
+                                  workers=workers or fleet.DEFAULT_FLEET_WORKERS,
+                                  on_result=(lambda result: click.echo(fleet.format_result(result)))
+                                  if output_format == 'table' else None,
+                                  transform_cache=outputs_cache,
+                                  **kwargs)
+    failed = [result for result in results if not result.ok]
+
+    if output_format == 'json':
+        click.echo(json.dumps([result._asdict() for result in results], indent=2, default=str))
+    else:
+        click.echo('{succeeded} succeeded, {failed} failed in {duration:.3f}s'.format(
+            succeeded=len(results) - len(failed), failed=len(failed), duration=time.perf_counter() - start))
+        if outputs_cache is not None:
+            click.echo('Transform cache: {hits} hits, {misses} misses'.format(
+                hits=outputs_cache.hits, misses=outputs_cache.misses))
+
+    if failed:
+        ctx.exit(1)
+
+
+@cli.group(name='catalog')
+def catalog_command():
+    """Queries metadata of many projects stored in a local catalog"""
+
+
+@catalog_command.command(name='update')
+@click.argument('paths',
+                nargs=-1)
+@click.option('--paths-file', 'paths_file',
+              type=click.File('r'),
+              help='File listing paths or glob patterns of the projects (one per line)')
+@click.option('--workers', '-j', 'workers',
+              type=int,
+              help='Maximum number of projects read concurrently (default 4)')
+@click.option('--force', 'force',
+              is_flag=True,
+              help='Read projects even if their HEAD did not move')
+@click.option('--catalog', 'catalog_path',
+              type=click.Path(dir_okay=False, writable=True),
+              help='File of the catalog (defaults to ~/.cache/crpyproj/catalog.sqlite)')
+@click.pass_context
+def catalog_update(ctx, paths, paths_file, workers, force, catalog_path):
+    """Adds projects to the catalog or refreshes projects whose HEAD moved (all cataloged projects by default)"""
+
+    paths = list(paths)
+    if paths_file is not None:
+        paths.extend([line.strip() for line in paths_file if line.strip()])
+
+    projects_catalog = catalog.Catalog(catalog_path)
+    try:
+        results = projects_catalog.refresh(paths or None,
+                                           workers=workers or fleet.DEFAULT_FLEET_WORKERS,
+                                           force=force,
+                                           on_result=lambda result: click.echo(fleet.format_result(result)))
+    finally:
+        projects_catalog.close()
+
+    failed = [result for result in results if not result.ok]
+    click.echo('{updated} updated, {unchanged} unchanged, {failed} failed'.format(
+        updated=len([result for result in results if result.value == 'updated']),
+        unchanged=len([result for result in results if result.value == 'unchanged']),
+        failed=len(failed)))
+
+    if failed:
+        ctx.exit(1)
+
+
+@catalog_command.command(name='query')
+@click.option('--path', 'path',
+              type=str,
+              help='Path of the projects')
+@click.option('--name', 'name',
+              type=str,
+              help='Name of the projects')
+@click.option('--version', 'version',
+              type=str,
+              help='Version of the projects (setup.py)')
+@click.option('--package-version', 'package_version',
+              type=str,
+              help='Version of the packages (__version__ of __init__.py)')
+@click.option('--url', '-u', 'url',
+              type=str,
+              help='URL of the projects')
+@click.option('--author-name', '-a', 'author',
+              type=str,
+              help='Author of the projects')
+@click.option('--author-email', '-e', 'author_email',
+              type=str,
+              help='Author\'s email of the projects')
+@click.option('--order-by', 'order_by',
+              type=click.Choice(['path', 'name', 'version', 'package_version', 'author', 'author_email', 'updated']),
+              default='path',
+              help='Field to order projects by')
+@click.option('--format', 'output_format',
+              type=click.Choice(['table', 'json']),
+              default='table',
+              help='Format of the report')
+@click.option('--catalog', 'catalog_path',
+              type=click.Path(dir_okay=False, writable=True),
+              help='File of the catalog (defaults to ~/.cache/crpyproj/catalog.sqlite)')
+def catalog_query(order_by, output_format, catalog_path, **filters):
+    """Lists cataloged projects matching filters (values can be glob patterns e.g. --author-email '*@example.com')"""
+
+    projects_catalog = catalog.Catalog(catalog_path)
+    try:
+        entries = projects_catalog.query(order_by=order_by, **filters)
+    finally:
+        projects_catalog.close()
+
+    if output_format == 'json':
+        click.echo(json.dumps([entry._asdict() for entry in entries], indent=2))
+    else:
+        click.echo(catalog.format_entries(entries))
+
+
+@catalog_command.command(name='remove')
+@click.argument('paths',
+                nargs=-1)
+@click.option('--catalog', 'catalog_path',
+              type=click.Path(dir_okay=False, writable=True),
+              help='File of the catalog (defaults to ~/.cache/crpyproj/catalog.sqlite)')
+def catalog_remove(paths, catalog_path):
+    """Removes projects from the catalog"""
+
+    projects_catalog = catalog.Catalog(catalog_path)
+    try:
+        projects_catalog.remove(paths)
+    finally:
+        projects_catalog.close()
@@ -0,0 +1,144 @@
+"""
+    create_python_project.compose
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement composition of boilerplates at the git object level
+
+    A project can be created from a base boilerplate and overlays (e.g. docker, docs or CI boilerplates). Trees of
+    the boilerplates are listed from the git object database and merged in memory without checking any of them out,
+    the merged tree being written through a temporary index. Overlays are fetched with depth 1 into temporary object
+    stores and only the objects of their trees are copied to the project, so the project does not become shallow.
+    Precedence rules are deterministic: boilerplates are layered in the order they are given and a later boilerplate
+    always wins
+
+    - a file replaces the file with the same path in earlier boilerplates
+    - a file replaces the folder with the same path in earlier boilerplates (and the other way around)
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+import tempfile
+from collections import namedtuple
+
+from git import Git
+
+TreeEntry = namedtuple('TreeEntry', ['mode', 'type', 'hexsha'])
+TreeEntry.__doc__ = """Entry of a flattened git tree
+
+:param mode: Git mode of the entry (e.g. 100644)
+:param type: Type of the object (blob or commit for submodules)
+:param hexsha: SHA of the object
+"""
+
+
+def fetch_tree(repo, url):
+    """Fetch the tree of the last commit of a repository into the object database of another repository
+
+    The commit is fetched with depth 1 into a temporary bare repository and the objects of its tree are packed
+    directly into the object database of the repository (the commit and its shallow history are not copied)
+
+    :param repo: Repository to copy the objects of the tree to
+    :type repo: git.Repo
+    :param url: Location of the repository to fetch
+    :type url: str
+    :return: Tuple (SHA of the fetched commit, SHA of its tree)
+    """
+
+    pack_dir = os.path.join(repo.working_dir, repo.git.rev_parse('--git-path', 'objects/pack'))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = Git(tmp_dir)
+        store.init('--bare', '--quiet')
+        store.fetch('--quiet', '--depth=1', url, 'HEAD')
+        commit, tree = store.rev_parse('FETCH_HEAD', 'FETCH_HEAD^{tree}').split()
+
+        objects_path = os.path.join(tmp_dir, 'objects.txt')
+        with open(objects_path, 'w') as file:
+            file.write(store.rev_list('--objects', tree) + '\n')
+        with open(objects_path, 'rb') as file:
+            store.pack_objects('--quiet', os.path.join(pack_dir, 'pack'), istream=file)
+
+    return commit, tree
+
+
+def list_tree(repo, rev):
+    """List the entries of a tree recursively from a single git ls-tree call
+
+    :param repo: Repository holding the tree
+    :type repo: git.Repo
+    :param rev: Revision of the tree
+    :type rev: str
+    :return: Mapping of paths to TreeEntry
+    :rtype: dict
+    """
+
+    entries = {}
+    for line in repo.git.ls_tree('-r', '-z', '--full-tree', rev).split('\0'):
+        if line:
+            meta, path = line.split('\t', 1)
+            entries[path] = TreeEntry(*meta.split(' '))
+    return entries
+
+
+def iter_parent_paths(path):
+    parts = path.split('/')
+    for i in range(1, len(parts)):
+        yield '/'.join(parts[:i])
+
+
+def merge_entries(layers):
+    """Merge flattened trees, later trees taking precedence (c.f. module documentation)
+
+    :param layers: Flattened trees (c.f. list_tree) in increasing order of precedence
+    :type layers: list
+    :return: Tuple (merged mapping of paths to TreeEntry, sorted list of the paths of earlier layers that have been
+        overridden)
+    """
+
+    merged, folders, overridden = {}, set(), set()
+    for entries in layers:
+        for path, entry in sorted(entries.items()):
+            # A file replaces the files of earlier layers that are at the path of one of its parent folders
+            for parent_path in iter_parent_paths(path):
+                if parent_path in merged:
+                    del merged[parent_path]
+                    overridden.add(parent_path)
+
+            # A file replaces the folder of earlier layers at its path
+            if path in folders:
+                for other_path in [other_path for other_path in merged if other_path.startswith(path + '/')]:
+                    del merged[other_path]
+                    overridden.add(other_path)
+
+            if path in merged and merged[path] != entry:
+                overridden.add(path)
+            merged[path] = entry
+            folders.update(iter_parent_paths(path))
+
+    return merged, sorted(overridden)
+
+
+def write_tree(repo, entries):
+    """Write a flattened tree to the git object database through a temporary index
+
+    :param repo: Repository to write the tree to (objects of the entries must be available)
+    :type repo: git.Repo
+    :param entries: Mapping of paths to TreeEntry
+    :type entries: dict
+    :return: SHA of the written tree
+    :rtype: str
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = {'GIT_INDEX_FILE': os.path.join(tmp_dir, 'index')}
+        index_info_path = os.path.join(tmp_dir, 'index-info')
+        with open(index_info_path, 'wb') as file:
+            for path, entry in sorted(entries.items()):
+                line = '{mode} {sha}\t{path}\0'.format(mode=entry.mode, sha=entry.hexsha, path=path)
+                file.write(line.encode('utf-8', 'surrogateescape'))
+
+        with open(index_info_path, 'rb') as file:
+            repo.git.update_index('-z', '--index-info', istream=file, env=env)
+
+        return repo.git.write_tree(env=env)
@@ -9,8 +9,23 @@
 """
 
 import configparser
+import os
+from collections import namedtuple
+from functools import lru_cache
 
-from git import Repo, GitConfigParser
+from .pyutils import lazy_import
+
+git = lazy_import('git')
+
+ConfigSnapshot = namedtuple('ConfigSnapshot', ['boilerplate_name', 'values', 'config_files',
+                                               'attempted_config_files', 'attempted_git_config_level'])
+ConfigSnapshot.__doc__ = """Immutable configuration resolved from git configuration and .rc files
+
+:param values: Tuple of (attr, value) pairs of the configuration attributes that have been set
+"""
+
+# Resolved configuration snapshots indexed by boilerplate name and configuration files states
+_config_cache = {}
 
 
 class Config:
@@ -39,6 +54,14 @@ class Config:
 
         # [boilerplate:{boilerplate_name}]
         ('boilerplate_git_url', (BOILERPLATE_SECTION_NAME_FORMAT, 'url')),
+
+        # [cache]
+        ('cache_dir', ('cache', 'directory')),
+        ('cache_ttl', ('cache', 'ttl')),
+
+        # [write]
+        ('write_atomic', ('write', 'atomic')),
+        ('write_fsync', ('write', 'fsync')),
     ]
 
     def __init__(self, boilerplate_name=None):
@@ -67,12 +90,47 @@ class Config:
         # boilerplate information
         self.boilerplate_git_url = None
 
+        # boilerplate cache information
+        self.cache_dir = None
+        self.cache_ttl = None
+
+        # scripts writing information
+        self.write_atomic = None
+        self.write_fsync = None
+
+    @property
+    def write_options(self):
+        """Return options of the write batch (c.f. io.WriteBatch) that have been set"""
+
+        return {option: parse_bool(value) for option, value in [('atomic', self.write_atomic),
+                                                                ('fsync', self.write_fsync)]
+                if value is not None}
+
     @property
     def config_options(self):
-        return [self._format_option(opt) for opt in self.CONFIG_OPTIONS]
+        return _format_options(tuple(self.CONFIG_OPTIONS), self.boilerplate_name)
 
-    def _format_option(self, opt):
-        return tuple([opt[0], (opt[1][0].format(boilerplate_name=self.boilerplate_name), opt[1][1])] + list(opt[2:]))
+    def snapshot(self):
+        """Return an immutable snapshot of the configuration"""
+
+        values = tuple([(opt[0], getattr(self, opt[0])) for opt in self.config_options
+                        if getattr(self, opt[0]) is not None])
+        return ConfigSnapshot(self.boilerplate_name, values, tuple(self.config_files),
+                              tuple(self.attempted_config_files), tuple(self.attempted_git_config_level))
+
+    def from_snapshot(self, snapshot):
+        """Read config values from a configuration snapshot
+
+        :param snapshot: Snapshot to read configuration from
+        :type snapshot: ConfigSnapshot
+        """
+
+        self.attempted_config_files.extend(snapshot.attempted_config_files)
+        self.attempted_git_config_level.extend(snapshot.attempted_git_config_level)
+        self.config_files.extend(snapshot.config_files)
+
+        for attr, value in snapshot.values:
+            setattr(self, attr, value)
 
     def from_kwargs(self, **kwargs):
         """Read config values from `kwargs`"""
@@ -115,15 +173,14 @@ class Config:
             repository = configuration file for a repository (`repo` must be provided)
         :type config_level: str
         :param repo: Repo from which to retrieve config when `config_level` is set to 'repository'
-        :type repo: Repo
+        :type repo: git.Repo
         """
 
-        assert config_level != 'repository' or isinstance(repo, Repo), \
-            "When config_level is set to \'repository\', a valid Repo must be provided as well"
+        config_path = get_git_config_path(config_level, repo)
 
         self.attempted_git_config_level.append(config_level)
 
-        config = GitConfigParser(Repo._get_config_path(repo, config_level), read_only=True)
+        config = git.GitConfigParser(config_path, read_only=True)
 
         for opt in self.config_options:
             if len(opt) > 2:
@@ -143,9 +200,94 @@ class Config:
             setattr(self, attr, config.get(*where))
 
 
+def get_cache_dir():
+    """Return the directory of the user caches of create-python-project (e.g. ~/.cache/crpyproj)"""
+
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'crpyproj')
+
+
+def parse_bool(value):
+    """Convert a configuration value read from .rc files (e.g. 'yes', 'false'...) to a boolean"""
+
+    if isinstance(value, bool):
+        return value
+
+    if value.lower() not in configparser.ConfigParser.BOOLEAN_STATES:
+        raise ValueError('Not a boolean: {value}'.format(value=value))
+
+    return configparser.ConfigParser.BOOLEAN_STATES[value.lower()]
+
+
+def get_git_config_path(config_level, repo=None):
+    """Return path of the git configuration file of a given level (c.f. Config.from_git)"""
+
+    assert config_level != 'repository' or isinstance(repo, git.Repo), \
+        "When config_level is set to \'repository\', a valid Repo must be provided as well"
+
+    return git.Repo._get_config_path(repo, config_level)
+
+
+@lru_cache(maxsize=None)
+def _format_options(options, boilerplate_name):
+    return tuple([tuple([opt[0], (opt[1][0].format(boilerplate_name=boilerplate_name), opt[1][1])] + list(opt[2:]))
+                  for opt in options])
+
+
+def _get_file_state(path):
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def resolve_config(config_levels=(), file_paths=(), boilerplate_name=None, repo=None):
+    """Resolve configuration from git configuration and .rc files
+
+    Resolved configuration is cached until the boilerplate name or any of the configuration files changes
+
+    :param config_levels: Optional git config levels (c.f. Config.from_git)
+    :type config_levels: list
+    :param file_paths: Optional config file to inspect to retrieve configuration from
+    :type file_paths: list
+    :param boilerplate_name: Optional name of the boilerplate
+    :type boilerplate_name: str
+    :param repo: Optional git repository to provide when `config_levels` contains 'repository'
+    :rtype: ConfigSnapshot
+    """
+
+    key = (boilerplate_name or 'DEFAULT',
+           tuple([(level,) + _get_file_state(get_git_config_path(level, repo)) for level in config_levels]),
+           tuple([_get_file_state(file_path) for file_path in file_paths]))
+
+    if key not in _config_cache:
+        config = Config(boilerplate_name)
+
+        # set config from git information
+        for config_level in config_levels:
+            config.from_git(config_level, repo)
+
+        # set config from files information
+        for file_path in file_paths:
+            config.from_file(file_path)
+
+        _config_cache[key] = config.snapshot()
+
+    return _config_cache[key]
+
+
+def clear_config_cache():
+    """Clear resolved configuration cache"""
+
+    _config_cache.clear()
+
+
 def read_config(config_levels=(), file_paths=(), boilerplate_name=None, config=None, repo=None, **kwargs):
     """Read configuration from various sources
 
+    Configuration read from git and files is resolved once and shared across calls (c.f. resolve_config)
+
     :param config_levels: Optional git config levels (c.f. Config.from_git)
     :type config_levels: list
     :param file_paths: Optional config file to inspect to retrieve configuration from
@@ -160,13 +302,9 @@ def read_config(config_levels=(), file_paths=(), boilerplate_name=None, config=N
     """
     config = config or Config(boilerplate_name)
 
-    # set config from git information
-    for config_level in config_levels:
-        config.from_git(config_level, repo)
-
-    # set config from files information
-    for file_path in file_paths:
-        config.from_file(file_path)
+    # set config from git and files information
+    if config_levels or file_paths:
+        config.from_snapshot(resolve_config(config_levels, file_paths, config.boilerplate_name, repo))
 
     # set config from kwargs
     config.from_kwargs(**kwargs)
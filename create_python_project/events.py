@@ -0,0 +1,196 @@
+"""
+    create_python_project.events
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement instrumentation events
+
+    Instrumented operations (applying functions to blobs, parsing, transforming and writing scripts, cloning,
+    committing...) are wrapped in spans emitting a start and an end event to registered listeners. When no
+    listener is registered spans are not created at all.
+
+    Listeners are functions taking a SpanEvent as argument
+
+        from create_python_project.events import add_listener
+        add_listener(lambda event: print(event.name, event.kind, event.duration))
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import itertools
+import os
+import threading
+import time
+from collections import namedtuple
+
+from .pyutils import lazy_import
+
+json = lazy_import('json')
+
+SpanEvent = namedtuple('SpanEvent', ['kind', 'name', 'span_id', 'parent_id', 'timestamp', 'thread_id',
+                                     'attributes', 'duration', 'cpu_duration', 'error'])
+SpanEvent.__doc__ = """Event emitted when a span starts or ends
+
+:param kind: 'start' or 'end'
+:param attributes: Attributes of the span (e.g. path, script_class, bytes)
+:param timestamp: Time of the event (time.perf_counter)
+:param duration: Wall time of the span in seconds (None on start)
+:param cpu_duration: CPU time of the thread running the span in seconds, work of other threads (e.g. prefetching and
+    writing threads) is not included (None on start or if the platform can not measure the CPU time of a thread)
+:param error: Whether the span ended with an exception (None on start)
+"""
+
+if hasattr(time, 'thread_time'):  # Python 3.7+
+    thread_time = time.thread_time
+elif hasattr(time, 'CLOCK_THREAD_CPUTIME_ID'):  # Unix
+    def thread_time():
+        """Return CPU time of the current thread in seconds"""
+
+        return time.clock_gettime(time.CLOCK_THREAD_CPUTIME_ID)
+else:  # pragma: no cover
+    thread_time = None
+
+_listeners = []
+_span_ids = itertools.count(1)
+_local = threading.local()
+
+
+def add_listener(listener):
+    """Register a function called with every SpanEvent"""
+
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    """Unregister a listener"""
+
+    _listeners.remove(listener)
+
+
+def has_listeners():
+    return bool(_listeners)
+
+
+def emit(event):
+    for listener in list(_listeners):
+        listener(event)
+
+
+class Span:
+    """Context manager emitting start and end events of an operation
+
+    :param name: Name of the operation (e.g. 'parse')
+    :type name: str
+    :param attributes: Attributes of the span
+    :type attributes: dict
+    """
+
+    def __init__(self, name, attributes):
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = None
+
+    def __bool__(self):
+        return True
+
+    def set(self, **attributes):
+        """Set attributes of the span (e.g. bytes once they are known)"""
+
+        self.attributes.update(attributes)
+
+    def __enter__(self):
+        stack = _local.__dict__.setdefault('stack', [])
+        self.parent_id = stack[-1] if stack else None
+        stack.append(self.span_id)
+
+        self.thread_id = threading.get_ident()
+        self.start, self.start_cpu = time.perf_counter(), thread_time() if thread_time is not None else None
+        emit(SpanEvent('start', self.name, self.span_id, self.parent_id, self.start, self.thread_id,
+                       self.attributes, None, None, None))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        end = time.perf_counter()
+        cpu_duration = thread_time() - self.start_cpu if self.start_cpu is not None else None
+        _local.stack.pop()
+        emit(SpanEvent('end', self.name, self.span_id, self.parent_id, end, self.thread_id,
+                       self.attributes, end - self.start, cpu_duration, exc_type is not None))
+
+
+class NullSpan:
+    """Span doing nothing (used when no listener is registered)"""
+
+    def __bool__(self):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+null_span = NullSpan()
+
+
+def span(name, **attributes):
+    """Return a span of an operation (c.f. Span) or null_span if no listener is registered
+
+    :param name: Name of the operation
+    :type name: str
+    """
+
+    if not _listeners:
+        return null_span
+    return Span(name, attributes)
+
+
+class ChromeTraceExporter:
+    """Listener exporting spans to a Chrome trace-event JSON file (to be opened in chrome://tracing or Perfetto)
+
+        exporter = ChromeTraceExporter('trace.json').start()
+        ...
+        exporter.stop()  # writes trace.json
+
+    :param path: Path of the trace file
+    :type path: str
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.trace_events = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def __call__(self, event):
+        if event.kind != 'end':
+            return
+
+        trace_event = {
+            'name': event.name,
+            'cat': event.attributes.get('script_class', 'crpyproj'),
+            'ph': 'X',
+            'ts': (event.timestamp - event.duration) * 1e6,
+            'dur': event.duration * 1e6,
+            'pid': self._pid,
+            'tid': event.thread_id,
+            'args': dict(event.attributes, error=event.error),
+        }
+        with self._lock:
+            self.trace_events.append(trace_event)
+
+    def start(self):
+        add_listener(self)
+        return self
+
+    def stop(self):
+        """Unregister the exporter and write the trace file"""
+
+        remove_listener(self)
+        with open(self.path, 'w') as file:
+            json.dump({'traceEvents': self.trace_events, 'displayTimeUnit': 'ms'}, file)
+        return self
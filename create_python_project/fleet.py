@@ -0,0 +1,171 @@
+"""
+    create_python_project.fleet
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement operations run across a fleet of projects
+
+    An operation (e.g. setting the author or the .py script headers) is run on many local repositories with a
+    bounded pool of workers. A result is reported for every repository, a repository failing does not stop the
+    other ones
+
+        results = run_fleet(['services/*'], 'set-author', author_email='team@example.com')
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import glob
+import os
+import time
+from collections import namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .events import span
+from .project import ProjectManager
+
+# Default number of repositories processed concurrently
+DEFAULT_FLEET_WORKERS = 4
+
+FleetResult = namedtuple('FleetResult', ['path', 'ok', 'value', 'error', 'duration'])
+FleetResult.__doc__ = """Result of an operation on a repository of the fleet
+
+:param path: Path of the repository
+:param ok: Whether or not the operation succeeded
+:param value: Value returned by the operation
+:param error: Error message if the operation failed
+:param duration: Wall time of the operation in seconds
+"""
+
+
+def set_author(manager, author_name=None, author_email=None):
+    return manager.set_project_author(author_name=author_name, author_email=author_email)
+
+
+def set_url(manager, url):
+    return manager.set_project_url(url)
+
+
+def set_py_script_headers(manager, license=None, copyright=None):
+    manager.set_project_py_script_headers(license=license, copyright=copyright)
+
+
+def update_changelog(manager, path='CHANGES.rst'):
+    return manager.update_changelog(path=path)
+
+
+def get_setup_info(manager):
+    setup_info = manager.setup_info
+    return OrderedDict([(field, getattr(setup_info, field).value)
+                        for field in ['name', 'version', 'url', 'author', 'author_email']])
+
+
+# Operations that can be run on a fleet with the keyword arguments they accept
+FLEET_OPERATIONS = OrderedDict([
+    ('set-author', (set_author, ('author_name', 'author_email'))),
+    ('set-url', (set_url, ('url',))),
+    ('set-py-script-headers', (set_py_script_headers, ('license', 'copyright'))),
+    ('changelog', (update_changelog, ('path',))),
+    ('info', (get_setup_info, ())),
+])
+
+
+def expand_paths(patterns):
+    """Expand glob patterns of repository paths
+
+    Patterns that do not match any path are kept as is so they are reported as failed
+
+    :param patterns: Paths or glob patterns (e.g. services/*)
+    :type patterns: list
+    :return: List of distinct paths in the order of the patterns
+    :rtype: list
+    """
+
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern, recursive=True)) if glob.has_magic(pattern) else [pattern]
+        for path in matches or [pattern]:
+            path = os.path.normpath(path)
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+def run_operation(path, operation, transform_cache=None, **kwargs):
+    """Run an operation on a repository
+
+    :param path: Path of the repository
+    :type path: str
+    :param operation: Name of the operation (c.f. FLEET_OPERATIONS)
+    :type operation: str
+    :param transform_cache: Optional cache of transformation outputs (c.f. TransformCache)
+    :type transform_cache: TransformCache
+    :rtype: FleetResult
+    """
+
+    func = FLEET_OPERATIONS[operation][0]
+
+    start = time.perf_counter()
+    try:
+        with span('fleet', path=path, operation=operation):
+            manager = ProjectManager(path)
+            manager.transform_cache = transform_cache
+            try:
+                value = func(manager, **kwargs)
+            finally:
+                manager.close()
+    except Exception as error:
+        message = '{type}: {error}'.format(type=type(error).__name__, error=error)
+        return FleetResult(path, False, None, message, time.perf_counter() - start)
+
+    return FleetResult(path, True, value, None, time.perf_counter() - start)
+
+
+def run_fleet(paths, operation, workers=DEFAULT_FLEET_WORKERS, on_result=None, transform_cache=None, **kwargs):
+    """Run an operation on multiple repositories
+
+    Scripts identical across repositories are transformed once when a transform cache is provided
+
+    :param paths: Paths or glob patterns of the repositories (c.f. expand_paths)
+    :type paths: list
+    :param operation: Name of the operation (c.f. FLEET_OPERATIONS)
+    :type operation: str
+    :param workers: Maximum number of repositories processed concurrently
+    :type workers: int
+    :param on_result: Optional function called with every FleetResult as soon as it is available
+    :param transform_cache: Optional cache of transformation outputs shared by the repositories
+    :type transform_cache: TransformCache
+    :param kwargs: Keyword arguments of the operation
+    :return: List of FleetResult in the order of the paths
+    :rtype: list
+    """
+
+    assert operation in FLEET_OPERATIONS, \
+        'Fleet operations are {operations} but you passed {operation}'.format(operations=list(FLEET_OPERATIONS),
+                                                                              operation=operation)
+    assert workers > 0, 'workers must be positive but you passed {0}'.format(workers)
+
+    unexpected_kwargs = set(kwargs) - set(FLEET_OPERATIONS[operation][1])
+    assert not unexpected_kwargs, \
+        'Operation {operation} does not accept {kwargs}'.format(operation=operation, kwargs=sorted(unexpected_kwargs))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_operation, path, operation, transform_cache=transform_cache, **kwargs)
+                   for path in expand_paths(paths)]
+        if on_result is not None:
+            for future in as_completed(futures):
+                on_result(future.result())
+        return [future.result() for future in futures]
+
+
+def format_value(value):
+    if isinstance(value, dict):
+        return ', '.join(['{0}={1}'.format(key, item) for key, item in value.items()])
+    return str(value)
+
+
+def format_result(result):
+    if result.ok:
+        status = 'ok' if result.value is None else 'ok ({value})'.format(value=format_value(result.value))
+    else:
+        status = 'failed ({error})'.format(error=result.error)
+    return '{0:>8.3f}s  {1}  {2}'.format(result.duration, result.path, status)
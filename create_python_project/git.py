@@ -8,11 +8,12 @@
     :license: BSD, see :ref:`license` for more details.
 """
 
-from functools import partial
-
 from git import Repo
 
-from .utils import is_matching
+from .events import span, has_listeners
+from .tags import list_tags
+from .tree import TreeIndex
+from .utils import make_filter
 
 
 class RepositoryManager(Repo):
@@ -35,22 +36,42 @@ class RepositoryManager(Repo):
             (can be a function taking blob as argument)
         :return:
         """
-        tree = tree or self.tree()
+        for blob in self.iter_blobs(is_filtered=is_filtered, tree=tree):
+            if has_listeners():
+                with span('apply_func', path=blob.path, function=getattr(func, '__name__', repr(func))):
+                    self._apply(func, blob, args, kwargs)
+            else:
+                self._apply(func, blob, args, kwargs)
+
+    @staticmethod
+    def _apply(func, blob, args, kwargs):
+        func(blob,
+             *[arg(blob) if callable(arg) else arg for arg in args],
+             **{kw: arg(blob) if callable(arg) else arg for kw, arg in kwargs.items()})
 
-        if isinstance(is_filtered, str):
-            is_filtered = [is_filtered]
+    def iter_blobs(self, is_filtered=None, tree=None):
+        """Iterate over the blobs of a git tree (each blob corresponding to a script tracked by git)
 
-        if isinstance(is_filtered, list):
-            is_filtered = partial(is_matching, is_filtered)
+        Tree is walked iteratively (depth first, blobs of a tree being yielded before the ones of its sub-trees)
+        so only the trees being explored are held in memory.
+
+        :param is_filtered: Optional function taking a blob as argument and returning a boolean.
+            It can also be a string that will be interpreted as a path folder pattern in .gitignore format
+        :param tree: Optional git tree (or TreeIndex) to iterate over
+        """
+        if isinstance(tree, TreeIndex):
+            yield from tree.iter_blobs(is_filtered=is_filtered)
+            return
 
-        for blob in tree.blobs:
-            if not callable(is_filtered) or is_filtered(blob):
-                func(blob,
-                     *[arg(blob) if callable(arg) else arg for arg in args],
-                     **{kw: arg(blob) if callable(arg) else arg for kw, arg in kwargs.items()})
+        is_filtered = make_filter(is_filtered)
 
-        for sub_tree in tree.trees:
-            self.apply_func(func, is_filtered=is_filtered, tree=sub_tree, *args, **kwargs)
+        trees = [tree or self.tree()]
+        while trees:
+            tree = trees.pop()
+            for blob in tree.blobs:
+                if not callable(is_filtered) or is_filtered(blob):
+                    yield blob
+            trees.extend(reversed(tree.trees))
 
     def commit(self, *args, **kwargs):
         """Commit modification
@@ -59,27 +80,59 @@ class RepositoryManager(Repo):
         That first ensure the project has some modifications to commit before committing
         """
 
-        if self.is_dirty():
-            self.git.commit(*args, **kwargs)
+        with span('commit'):
+            if self.is_dirty():
+                self.git.commit(*args, **kwargs)
 
     def get_tags(self):
         """Return ordered list of tags of the project ordered from most recent to oldest"""
 
         return sorted(self.tags, key=lambda tag: tag.commit.committed_datetime, reverse=True)
 
+    def list_tags(self, order='date', offset=0, limit=None):
+        """Return list of tags of the project ordered from most recent to oldest (or from highest version)
+
+        Unlike get_tags, tags are listed from a single git call as lightweight records and no tag or commit object is
+        read (c.f. tags.list_tags for arguments)
+
+        :rtype: list of TagRecord
+        """
+
+        return list_tags(self, order=order, offset=offset, limit=limit)
+
+    def get_blob(self, path, rev=None):
+        """Return the blob of a script resolving its path directly through the tree
+
+        :param path: Path of the script relative to the repository root
+        :type path: str
+        :param rev: Optional revision (defaults to HEAD)
+        :type rev: str
+        :raise KeyError: if path does not exist in the tree
+        """
+
+        return (self.tree(rev) if rev is not None else self.tree()) / path
+
+    def get_tree_index(self, rev='HEAD'):
+        """Return a flat index of the blobs of a revision (c.f. TreeIndex)
+
+        It can be provided as tree to apply_func, iter_blobs... to walk the revision from the index
+
+        :param rev: Optional revision or tree SHA
+        :type rev: str
+        :rtype: TreeIndex
+        """
+
+        return TreeIndex(self, rev)
+
     def get_blobs(self, is_filtered=None):
         """Explore the git repository tree in order to list all scripts that are tracked by git
 
-        :param tree: Repository tree
-        :type tree: Tree
+        :param is_filtered: Optional filter (c.f. iter_blobs)
 
-        :return: List of scripts paths
+        :return: List of blobs
         """
 
-        blobs = []
-        self.apply_func(lambda blob: blobs.append(blob), is_filtered=is_filtered)
-
-        return blobs
+        return list(self.iter_blobs(is_filtered=is_filtered))
 
     def get_commits(self, from_rev=None):
         """Retrieve commits from a given revision
@@ -97,6 +150,31 @@ class RepositoryManager(Repo):
         rev = '...{from_rev}'.format(from_rev=from_rev) if from_rev else None
         return list(self.iter_commits(rev))
 
+    def iter_commit_hexshas(self, rev='HEAD', from_rev=None):
+        """Stream SHAs of the commits reachable from a revision (most recent first)
+
+        SHAs are read from `git rev-list` output as it is produced, no commit object is read. If iteration stops early
+        (or the generator is closed), the git process is killed and reaped
+
+        :param rev: Revision to list commits from
+        :type rev: str
+        :param from_rev: Optional revision which commits are excluded (usually a tag name)
+        :type from_rev: str
+        """
+
+        rev_range = '{from_rev}..{rev}'.format(from_rev=from_rev, rev=rev) if from_rev else rev
+        process = self.git.rev_list(rev_range, as_process=True)
+        try:
+            for line in process.stdout:
+                yield line.decode('ascii').strip()
+            process.wait()
+        finally:
+            if process.proc.poll() is None:
+                process.proc.kill()
+                process.proc.wait()
+            process.proc.stdout.close()
+            process.proc.stderr.close()
+
     def push(self, push_tags=True):
         """Push project
 
@@ -123,6 +201,20 @@ class RepositoryManager(Repo):
                           '{postfix}'
         self.commit(old_path, new_path, '-m', self.make_message(message_pattern, old_path=old_path, new_path=new_path))
 
+    def squash_history(self, message):
+        """Replace the history of the active branch with a single root commit holding the current tree
+
+        :param message: Message of the root commit
+        :type message: str
+        """
+
+        with span('commit'):
+            branch = self.active_branch.name
+            self.git.checkout('--orphan', 'crpyproj-squashed-history')
+            self.git.commit('-m', message)
+            self.git.branch('-D', branch)
+            self.git.branch('-m', branch)
+
     def make_message(self, message_pattern, **kwargs):
         """Compute a message from a message pattern"""
         return message_pattern.format(**kwargs, postfix=self.COMMIT_MSG_POSTFIX)
@@ -0,0 +1,168 @@
+"""
+    create_python_project.index
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implements a persistent index of project metadata
+
+    The index is a SQLite database stored in the git directory of a project. It maps blob SHAs to the info
+    extracted from blobs and tree SHAs to the setup info of the project, so querying an unchanged project
+    takes a single lookup and no parsing.
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+import sqlite3
+
+from git import GitCommandError
+
+from .scripts import get_script_class, has_info
+from .serialization import SNAPSHOT_VERSION, dumps, loads
+from .utils import get_stored_info
+
+# Name of the index file in the git directory
+INDEX_FILE_NAME = 'crpyproj-index'
+
+
+def is_indexable(blob):
+    """Evaluates if a blob holds info that can be indexed"""
+
+    return has_info(get_script_class(blob.path))
+
+
+class ProjectIndex:
+    """Persistent index of project metadata
+
+    :param repo: Repository to index
+    :type repo: RepositoryManager
+    :param path: Optional path of the index file (defaults to .git/crpyproj-index)
+    :type path: str
+    """
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)',
+        'CREATE TABLE IF NOT EXISTS infos (sha TEXT, script_class TEXT, snapshot BLOB, '
+        'PRIMARY KEY (sha, script_class))',
+        'CREATE TABLE IF NOT EXISTS trees (sha TEXT PRIMARY KEY, setup_info BLOB)',
+    ]
+
+    def __init__(self, repo, path=None):
+        self.repo = repo
+        self.path = path or os.path.join(repo.git_dir, INDEX_FILE_NAME)
+        self.connection = sqlite3.connect(self.path)
+        self.init_schema()
+
+    def init_schema(self):
+        """Create index tables and reset the index if it has been built with another snapshot version"""
+
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+            if self.get_meta('version') != str(SNAPSHOT_VERSION):
+                self.connection.execute('DELETE FROM infos')
+                self.connection.execute('DELETE FROM trees')
+                self.connection.execute('DELETE FROM meta')
+                self.set_meta('version', str(SNAPSHOT_VERSION))
+
+    def close(self):
+        self.connection.close()
+
+    def get_meta(self, key):
+        row = self.connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row is not None else None
+
+    def set_meta(self, key, value):
+        self.connection.execute('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', (key, value))
+
+    @property
+    def tree_sha(self):
+        """SHA of the last indexed tree"""
+
+        return self.get_meta('tree')
+
+    def get_tree(self, rev):
+        return self.repo.rev_parse('{rev}^{{tree}}'.format(rev=rev))
+
+    def get_info(self, blob):
+        """Return the info of a blob, parsing and indexing it only if it has not been indexed yet
+
+        :param blob: Blob to get the info of
+        :type blob:
+        """
+
+        key = (blob.hexsha, get_script_class(blob.path).__name__)
+        row = self.connection.execute('SELECT snapshot FROM infos WHERE sha = ? AND script_class = ?', key).fetchone()
+        if row is not None:
+            return loads(row[0])
+
+        info = get_stored_info(blob)
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO infos (sha, script_class, snapshot) VALUES (?, ?, ?)',
+                                    key + (dumps(info, format='binary'),))
+        return info
+
+    def get_changed_blobs(self, tree):
+        """Return the indexable blobs of a tree that changed since the last indexed tree
+
+        :param tree: Tree to compare the last indexed tree with
+        :type tree: Tree
+        """
+
+        if self.tree_sha is not None:
+            try:
+                diffs = self.repo.tree(self.tree_sha).diff(tree)
+            except GitCommandError:  # last indexed tree is not available anymore
+                pass
+            else:
+                return [diff.b_blob for diff in diffs if diff.b_blob is not None and is_indexable(diff.b_blob)]
+
+        return list(self.repo.iter_blobs(is_filtered=is_indexable, tree=tree))
+
+    def update(self, rev='HEAD'):
+        """Incrementally update the index with a revision
+
+        Only blobs that changed since the last indexed tree are parsed
+
+        :param rev: Optional revision to index
+        :type rev: str
+        :return: List of blobs that have been inspected
+        """
+
+        tree = self.get_tree(rev)
+        if tree.hexsha == self.tree_sha:
+            return []
+
+        blobs = self.get_changed_blobs(tree)
+        for blob in blobs:
+            self.get_info(blob)
+
+        try:
+            setup_blob = tree / 'setup.py'
+        except KeyError:
+            setup_info = None
+        else:
+            setup_info = dumps(self.get_info(setup_blob).code.setup, format='binary')
+
+        with self.connection:
+            self.connection.execute('INSERT OR REPLACE INTO trees (sha, setup_info) VALUES (?, ?)',
+                                    (tree.hexsha, setup_info))
+            self.set_meta('tree', tree.hexsha)
+
+        return blobs
+
+    def setup_info(self, rev='HEAD'):
+        """Return the setup info of the project at a given revision
+
+        :param rev: Optional revision
+        :type rev: str
+        """
+
+        tree_sha = self.get_tree(rev).hexsha
+        row = self.connection.execute('SELECT setup_info FROM trees WHERE sha = ?', (tree_sha,)).fetchone()
+        if row is None:
+            self.update(rev)
+            row = self.connection.execute('SELECT setup_info FROM trees WHERE sha = ?', (tree_sha,)).fetchone()
+
+        return loads(row[0]) if row[0] is not None else None
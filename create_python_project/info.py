@@ -12,7 +12,15 @@
 
 import re
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
+
+InfoChange = namedtuple('InfoChange', ['info', 'new_info', 'fields'])
+InfoChange.__doc__ = """Field-level change between an info and its new value
+
+:param info: Info to be transformed (it holds the line numbers of the change)
+:param new_info: Info holding the new values
+:param fields: Names of the fields which values differ
+"""
 
 
 class FieldDescriptor:
@@ -110,37 +118,74 @@ class BaseInfo(FieldDescriptor, metaclass=InfoMeta):
         pass
 
     def update_info(self, new_info):
-        """Update the current info with the new info"""
+        """Update the current info with the new info
+
+        Nested infos are updated in place and unknown (None) values do not override current values
+        """
         for field in self._fields:
             current, new = getattr(self, field), getattr(new_info, field, None)
             if isinstance(current, BaseInfo) and isinstance(new, BaseInfo):
                 current.update_info(new)
-            setattr(self, field, new)
+            elif _is_info_tuple(current) and _is_info_tuple(new) and len(current) == len(new):
+                for current_item, new_item in zip(current, new):
+                    current_item.update_info(new_item)
+            elif new is not None:
+                setattr(self, field, new)
+
+    def diff(self, new_info):
+        """Compute the field-level differences between the current info and a new info
+
+        A field is considered unchanged when the new value is None (meaning the value is unknown) or
+        equal to the current one. Nested infos and tuples of infos are compared recursively. A tuple of infos which
+        length changes is also reported as a change of the whole field (items present in both tuples are still
+        compared item by item so their lines are transformed).
+
+        :param new_info: Info to compare the current info with
+        :type new_info: BaseInfo
+        :return: List of changes ordered from parents to children
+        :rtype: list of InfoChange
+        """
+
+        fields, changes = [], []
+        for field in self._fields:
+            current, new = getattr(self, field), getattr(new_info, field, None)
+            if isinstance(current, BaseInfo) and isinstance(new, BaseInfo):
+                changes.extend(current.diff(new))
+            elif _is_info_tuple(current) and _is_info_tuple(new):
+                for current_item, new_item in zip(current, new):
+                    changes.extend(current_item.diff(new_item))
+                if len(current) != len(new):
+                    fields.append(field)
+            elif new is not None and new != current:
+                fields.append(field)
+
+        if fields:
+            changes.insert(0, InfoChange(self, new_info, tuple(fields)))
+
+        return changes
 
     def update(self, new_info, lines=None, **kwargs):
         """Perform transformation on lines corresponding to the new provided info and
-         update current info with new info"""
+         update current info with new info
+
+        Only the infos which fields actually changed transform the lines.
+
+        :return: List of the changes that have been applied (c.f. BaseInfo.diff)
+        :rtype: list of InfoChange
+        """
 
         new_info = self.validate_info(new_info, **kwargs)
 
+        changes = self.diff(new_info)
+
         if lines is not None:  # pragma: no branch
-            self.transform_lines(new_info, lines)
+            for change in changes:
+                change.info.transform_lines(change.new_info, lines)
 
-        for field in self._fields:
-            current, new = getattr(self, field), getattr(new_info, field, None)
-            if isinstance(current, BaseInfo) and isinstance(new, BaseInfo):
-                current.update(new, lines, **kwargs)
-            else:
-                try:
-                    iterator = iter(current)
-                except TypeError:
-                    continue
-                else:
-                    for i, info in enumerate(iterator):
-                        if isinstance(info, BaseInfo):
-                            info.update(new[i], lines)
         self.update_info(new_info)
 
+        return changes
+
     def __eq__(self, info):
         if not isinstance(self, type(info)):
             return False
@@ -152,6 +197,10 @@ class BaseInfo(FieldDescriptor, metaclass=InfoMeta):
         return True
 
 
+def _is_info_tuple(value):
+    return isinstance(value, tuple) and len(value) > 0 and all(isinstance(item, BaseInfo) for item in value)
+
+
 class BaseTypeInfo(BaseInfo):
     """Base type info validating against a type"""
 
@@ -9,9 +9,11 @@
 """
 
 import os
+import stat
+import threading
 from collections import OrderedDict
 
-from docutils.io import FileInput, StringInput, NullInput, FileOutput, StringOutput
+from docutils.io import Input, FileInput, StringInput, NullInput, FileOutput, StringOutput
 
 
 class IODescriptor:
@@ -42,11 +44,194 @@ class InputDescriptor(IODescriptor):
                 source = FileInput(source_path=os.path.abspath(value))
             else:
                 source = StringInput(value)
+        elif isinstance(value, Input):
+            source = value
         else:
             source = NullInput()
         super().__set__(instance, source)
 
 
+class PrefetchedFileInput(StringInput):
+    """Input of a file which content has already been read (e.g. by a prefetching thread)
+
+    :param source: Content of the file
+    :type source: str
+    :param source_path: Path of the file
+    :type source_path: str
+    """
+
+    def __init__(self, source, source_path):
+        super().__init__(source=source, source_path=source_path)
+
+
+class WriteBatch:
+    """Batch of file writes
+
+    Files written while a batch is active are collected by the batch (c.f. BatchedFileOutput). With atomic writes,
+    files are made visible when the batch is committed, so an interruption before committing leaves the files
+    untouched. Otherwise files are written in place immediately and committing only syncs them to disk.
+
+    :param atomic: If True, outputs are written to temporary files in the directories of the real paths of the files
+        (symlinks are resolved so they are preserved) and renamed into place on commit. Otherwise files are written in
+        place.
+    :type atomic: bool
+    :param fsync: If True, written files are synced to disk on commit followed by one sync per directory
+    :type fsync: bool
+    """
+
+    def __init__(self, atomic=True, fsync=True):
+        self.atomic = atomic
+        self.fsync = fsync
+
+        self.active = False
+
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def write(self, path, data, encoding=None, errors='strict'):
+        """Write data to a file
+
+        :param path: Path of the file
+        :type path: str
+        :param data: Text to write
+        :type data: str
+        """
+
+        path = os.path.realpath(path)
+        if self.atomic:
+            fd, tmp_path = open_temp_file(path)
+            try:
+                with open(fd, 'w', encoding=encoding, errors=errors) as file:
+                    file.write(data)
+                try:
+                    os.chmod(tmp_path, stat.S_IMODE(os.stat(path).st_mode))
+                except OSError:  # file is created (temporary file already has the default mode of new files)
+                    pass
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        else:
+            tmp_path = None
+            with open(path, 'w', encoding=encoding, errors=errors) as file:
+                file.write(data)
+
+        with self._lock:
+            self._pending.append((tmp_path, path))
+
+    def commit(self):
+        """Sync written files and rename them into place"""
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        directories = OrderedDict()
+        for tmp_path, path in pending:
+            if self.fsync:
+                fsync_path(tmp_path or path)
+            if tmp_path is not None:
+                os.replace(tmp_path, path)
+            directories[os.path.dirname(path)] = True
+
+        if self.fsync and self.atomic:
+            for directory in directories:
+                fsync_path(directory, is_dir=True)
+
+    def rollback(self):
+        """Discard files that have not been renamed into place yet"""
+
+        with self._lock:
+            pending, self._pending = self._pending, []
+
+        for tmp_path, _ in pending:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:  # pragma: no cover
+                    pass
+
+    def __enter__(self):
+        _local.__dict__.setdefault('write_batches', []).append(self)
+        self.active = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _local.write_batches.remove(self)
+        self.active = False
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+
+# Stacks of active write batches per thread (so projects can be published concurrently in distinct batches)
+_local = threading.local()
+
+
+def get_write_batch():
+    """Return the write batch active in the current thread if any"""
+
+    write_batches = _local.__dict__.get('write_batches')
+    return write_batches[-1] if write_batches else None
+
+
+def open_temp_file(path):
+    """Create a temporary file in the directory of a file
+
+    Unlike tempfile.mkstemp, the temporary file is given the default mode of new files (0o666 minus umask)
+
+    :param path: Path of the file
+    :type path: str
+    :return: Tuple (file descriptor, path of the temporary file)
+    """
+
+    directory, name = os.path.split(path)
+    while True:
+        tmp_path = os.path.join(directory, '.{name}.{suffix}.tmp'.format(name=name, suffix=os.urandom(4).hex()))
+        try:
+            return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), tmp_path
+        except FileExistsError:  # pragma: no cover
+            continue
+
+
+def fsync_path(path, is_dir=False):
+    """Sync a file or a directory to disk"""
+
+    if is_dir and not hasattr(os, 'O_DIRECTORY'):  # pragma: no cover
+        # Directories can not be opened on every platform (e.g. Windows)
+        return
+
+    fd = os.open(path, os.O_RDONLY | (os.O_DIRECTORY if is_dir else 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class BatchedFileOutput(FileOutput):
+    """File output writing through the active write batch (c.f. WriteBatch)
+
+    The batch active in the writing thread is used or else the batch that was active when the output has been
+    created if it is still active (e.g. when scripts are written by worker threads). It writes in place as FileOutput
+    when no batch is active.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch = get_write_batch()
+
+    def write(self, data):
+        batch = get_write_batch()
+        if batch is None and self.batch is not None and self.batch.active:
+            batch = self.batch
+
+        if batch is None:
+            return super().write(data)
+
+        batch.write(self.destination_path, data, encoding=self.encoding, errors=self.error_handler)
+        return data
+
+
 class OutputDescriptor(IODescriptor):
     """Base Destination descriptor
 
@@ -55,12 +240,19 @@ class OutputDescriptor(IODescriptor):
 
     def __set__(self, instance, value, *args, **kwargs):
         if isinstance(value, str):
-            destination = FileOutput(destination_path=os.path.abspath(value))
+            destination = BatchedFileOutput(destination_path=os.path.abspath(value))
         else:
             destination = StringOutput(encoding='unicode')
         super().__set__(instance, destination)
 
 
+def is_same_file(source, destination):
+    """Evaluates if an input and an output are the same file"""
+
+    return isinstance(source, (FileInput, PrefetchedFileInput)) and isinstance(destination, FileOutput) and \
+        source.source_path is not None and source.source_path == destination.destination_path
+
+
 class IOMeta(type):
     @classmethod
     def __prepare__(mcs, name, bases):
@@ -0,0 +1,93 @@
+"""
+    create_python_project.pipeline
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a bounded three stages pipeline (prefetch, process, write)
+
+    Prefetching and writing run in thread pools so I/O waits overlap with processing, which runs in the calling
+    thread. The number of items between stages is bounded so memory use stays capped whatever the number of items.
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Default options of the pipeline
+DEFAULT_PREFETCH_WORKERS = 4
+DEFAULT_WRITE_WORKERS = 2
+DEFAULT_MAX_PENDING = 16
+
+
+def run_pipeline(items, prefetch, process, write,
+                 prefetch_workers=DEFAULT_PREFETCH_WORKERS,
+                 write_workers=DEFAULT_WRITE_WORKERS,
+                 max_pending=DEFAULT_MAX_PENDING):
+    """Run items through prefetch, process and write stages
+
+    Items are processed in order. At most `max_pending` items are prefetched ahead of processing and at most
+    `max_pending` processed items wait for being written (processing blocks until writers catch up).
+
+    :param items: Iterable of items
+    :param prefetch: Function taking an item and returning prefetched data (run in the prefetch pool)
+    :param process: Function taking an item and its prefetched data and returning a result to write
+        (run in the calling thread). If it returns None, nothing is written.
+    :param write: Function taking a result of process (run in the write pool)
+    :param prefetch_workers: Number of prefetching threads. If 0, the pipeline runs sequentially in the calling thread
+    :type prefetch_workers: int
+    :param write_workers: Number of writing threads
+    :type write_workers: int
+    :param max_pending: Maximum number of items waiting between two stages
+    :type max_pending: int
+    :return: List of the values returned by write (in the order of the items)
+    """
+
+    assert max_pending > 0, 'max_pending must be positive but you passed {0}'.format(max_pending)
+
+    if prefetch_workers == 0:
+        return _run_sequentially(items, prefetch, process, write)
+
+    with ThreadPoolExecutor(max_workers=prefetch_workers) as prefetchers, \
+            ThreadPoolExecutor(max_workers=max(write_workers, 1)) as writers:
+        return _run_concurrently(iter(items), prefetch, process, write, prefetchers, writers, max_pending)
+
+
+def _run_sequentially(items, prefetch, process, write):
+    outputs = []
+    for item in items:
+        result = process(item, prefetch(item))
+        if result is not None:
+            outputs.append(write(result))
+    return outputs
+
+
+def _submit_prefetches(items, prefetch, prefetchers, prefetches, max_pending):
+    while len(prefetches) < max_pending:
+        try:
+            item = next(items)
+        except StopIteration:
+            return
+        prefetches.append((item, prefetchers.submit(prefetch, item)))
+
+
+def _run_concurrently(items, prefetch, process, write, prefetchers, writers, max_pending):
+    prefetches, writes, outputs = deque(), deque(), []
+
+    _submit_prefetches(items, prefetch, prefetchers, prefetches, max_pending)
+    while prefetches:
+        item, prefetched = prefetches.popleft()
+        _submit_prefetches(items, prefetch, prefetchers, prefetches, max_pending)
+
+        result = process(item, prefetched.result())
+        if result is not None:
+            writes.append(writers.submit(write, result))
+
+        # Backpressure: wait for writers before processing more items
+        while len(writes) >= max_pending:
+            outputs.append(writes.popleft().result())
+
+    while writes:
+        outputs.append(writes.popleft().result())
+
+    return outputs
@@ -0,0 +1,234 @@
+"""
+    create_python_project.profiling
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a profiler recording where time is spent by commands
+
+    It records wall and CPU time per phase (config, clone, parse, transform, write, commit...) and per script class,
+    files and bytes processed, number of git subprocesses and slowest files. The profiler is a listener of
+    instrumentation events (c.f. events).
+
+    CPU time of a span is the CPU time of the thread running it (c.f. SpanEvent). Memory is traced for the whole
+    process so the peak memory of a phase is the peak of the process while the phase was running, other threads
+    included. It is measured by resetting the peak of tracemalloc on every event which requires Python 3.9+.
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import threading
+from collections import OrderedDict
+
+from .events import add_listener, remove_listener
+from .pyutils import lazy_import
+
+json = lazy_import('json')
+tracemalloc = lazy_import('tracemalloc')
+git_cmd = lazy_import('git.cmd')
+
+FORMATS = ('table', 'json')
+
+
+def can_trace_memory():
+    """Return whether or not peak memory of phases can be measured (requires tracemalloc.reset_peak)"""
+
+    return hasattr(tracemalloc, 'reset_peak')
+
+
+def format_cpu(stats):
+    return '{0:.4f}'.format(stats.cpu) if stats.cpu is not None else ''
+
+
+class PhaseStats:
+    """Statistics of a phase or of a script class"""
+
+    def __init__(self):
+        self.calls = 0
+        self.wall = 0.0
+        self.cpu = None
+        self.files = set()
+        self.bytes = 0
+        self.peak_memory = None
+
+    def add(self, wall, cpu, path=None, size=0, peak_memory=None):
+        self.calls += 1
+        self.wall += wall
+        if cpu is not None:
+            self.cpu = (self.cpu or 0.0) + cpu
+        if path is not None:
+            self.files.add(path)
+        self.bytes += size
+        if peak_memory is not None:
+            self.peak_memory = max(self.peak_memory or 0, peak_memory)
+
+    def to_dict(self, with_files=False):
+        stats = OrderedDict([('calls', self.calls), ('wall', self.wall), ('cpu', self.cpu)])
+        if with_files:
+            stats['files'] = len(self.files)
+            stats['bytes'] = self.bytes
+        if self.peak_memory is not None:
+            stats['peak_memory'] = self.peak_memory
+        return stats
+
+
+class Profiler:
+    """Profiler of create-python-project commands
+
+    :param top: Number of slowest files to report
+    :type top: int
+    :param trace_memory: If True, peak memory of the process while each phase is running is measured with tracemalloc
+        (requires Python 3.9+, c.f. can_trace_memory)
+    :type trace_memory: bool
+    """
+
+    def __init__(self, top=10, trace_memory=False):
+        assert not trace_memory or can_trace_memory(), 'Peak memory of phases can only be measured on Python 3.9+'
+
+        self.top = top
+        self.trace_memory = trace_memory
+
+        self.phases = OrderedDict()
+        self.script_classes = OrderedDict()
+        self.files = {}
+        self.git_subprocesses = 0
+
+        self._lock = threading.Lock()
+        self._peaks = {}
+        self._git_execute = None
+
+    def start(self):
+        """Activate the profiler"""
+
+        add_listener(self)
+
+        if self.trace_memory:
+            tracemalloc.start()
+
+        # Count git subprocesses
+        self._git_execute = git_cmd.Git.execute
+        git_execute, profiler = self._git_execute, self
+
+        def execute(*args, **kwargs):
+            with profiler._lock:
+                profiler.git_subprocesses += 1
+            return git_execute(*args, **kwargs)
+
+        git_cmd.Git.execute = execute
+
+        return self
+
+    def stop(self):
+        """Deactivate the profiler"""
+
+        remove_listener(self)
+
+        if self._git_execute is not None:
+            git_cmd.Git.execute = self._git_execute
+            self._git_execute = None
+
+        if self.trace_memory:
+            tracemalloc.stop()
+
+        return self
+
+    def __call__(self, event):
+        if event.kind == 'start':
+            self._start_span(event)
+        else:
+            self._end_span(event)
+
+    def _sample_memory(self):
+        """Attribute the peak of the process since the previous event to the spans that are running
+
+        Every event of every thread resets the peak so each span gets the peak of the intervals it has been running
+        """
+
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+        for span_id, span_peak in self._peaks.items():
+            if peak > span_peak:
+                self._peaks[span_id] = peak
+
+    def _start_span(self, event):
+        with self._lock:
+            # Phases are reported in the order they first started
+            self.phases.setdefault(event.name, PhaseStats())
+
+            if self.trace_memory:
+                self._sample_memory()
+                self._peaks[event.span_id] = tracemalloc.get_traced_memory()[0]
+
+    def _end_span(self, event):
+        peak_memory = None
+        if self.trace_memory:
+            with self._lock:
+                self._sample_memory()
+                peak_memory = self._peaks.pop(event.span_id, None)
+
+        script_class, path = event.attributes.get('script_class'), event.attributes.get('path')
+        size = event.attributes.get('bytes', 0) if event.name == 'parse' else 0
+
+        with self._lock:
+            phase_stats = self.phases.setdefault(event.name, PhaseStats())
+            phase_stats.add(event.duration, event.cpu_duration, peak_memory=peak_memory)
+            if script_class is not None:
+                script_class_stats = self.script_classes.setdefault(script_class, PhaseStats())
+                script_class_stats.add(event.duration, event.cpu_duration, path=path, size=size,
+                                       peak_memory=peak_memory)
+                if path is not None:
+                    self.files[path] = self.files.get(path, 0.0) + event.duration
+
+    def get_slowest_files(self):
+        return sorted(self.files.items(), key=lambda item: item[1], reverse=True)[:self.top]
+
+    def to_dict(self):
+        return OrderedDict([
+            ('phases', OrderedDict([(name, stats.to_dict()) for name, stats in self.phases.items()])),
+            ('script_classes', OrderedDict([(name, stats.to_dict(with_files=True))
+                                            for name, stats in self.script_classes.items()])),
+            ('git_subprocesses', self.git_subprocesses),
+            ('slowest_files', [OrderedDict([('path', path), ('wall', wall)])
+                               for path, wall in self.get_slowest_files()]),
+        ])
+
+    def report(self, format='table'):
+        """Return profiling report
+
+        :param format: One of 'table' or 'json'
+        :type format: str
+        :rtype: str
+        """
+
+        assert format in FORMATS, \
+            'Profile formats are {formats} but you passed {format}'.format(formats=FORMATS, format=format)
+
+        if format == 'json':
+            return json.dumps(self.to_dict(), indent=2)
+
+        memory_header = '  Peak memory (KiB)' if self.trace_memory else ''
+
+        phase_row = '{0:<16}{1:>8}{2:>12.4f}{3:>12}{4}'
+        lines = ['{0:<16}{1:>8}{2:>12}{3:>12}{4}'.format('Phase', 'Calls', 'Wall (s)', 'CPU (s)', memory_header)]
+        for name, stats in self.phases.items():
+            lines.append(phase_row.format(name, stats.calls, stats.wall, format_cpu(stats),
+                                          self._format_memory(stats)))
+
+        script_class_row = '{0:<16}{1:>8}{2:>12}{3:>12.4f}{4:>12}{5}'
+        lines.extend(['', '{0:<16}{1:>8}{2:>12}{3:>12}{4:>12}{5}'.format('Script class', 'Files', 'Bytes',
+                                                                         'Wall (s)', 'CPU (s)', memory_header)])
+        for name, stats in self.script_classes.items():
+            lines.append(script_class_row.format(name, len(stats.files), stats.bytes, stats.wall, format_cpu(stats),
+                                                 self._format_memory(stats)))
+
+        lines.extend(['', 'Git subprocesses: {count}'.format(count=self.git_subprocesses)])
+
+        lines.extend(['', 'Slowest files (s)'])
+        for path, wall in self.get_slowest_files():
+            lines.append('{0:>10.4f}  {1}'.format(wall, path))
+
+        return '\n'.join(lines)
+
+    def _format_memory(self, stats):
+        if not self.trace_memory:
+            return ''
+        return '{0:>19}'.format('' if stats.peak_memory is None else stats.peak_memory // 1024)
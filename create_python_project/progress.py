@@ -0,0 +1,23 @@
+"""
+    create_python_project.progress
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement progress reporting of git remote operations for the command line interface
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import click
+import git
+
+
+class Progress(git.RemoteProgress):
+    """Allow to output git log when cloning project"""
+
+    def line_dropped(self, line):
+        click.echo(line)
+
+    def update(self, op_code, *args, **kwargs):
+        if op_code & self.END:
+            click.echo(self._cur_line)
@@ -8,43 +8,227 @@
     :license: BSD, see :ref:`license` for more details.
 """
 
+import os
+from collections import OrderedDict
+
+from .changelog import CommitCache, iter_parsed_commits, iter_sections, get_version_tags, render_section, \
+    split_sections, merge_sections, CHANGELOG_HEADER
+from .compose import fetch_tree, list_tree, merge_entries, write_tree
+from .events import span
 from .git import RepositoryManager
-from .utils import get_script, get_info, publish, \
-    format_package_name, format_project_name, format_py_script_title, \
-    format_url
+from .index import ProjectIndex
+from .io import WriteBatch
+from .pipeline import run_pipeline, DEFAULT_PREFETCH_WORKERS, DEFAULT_WRITE_WORKERS, DEFAULT_MAX_PENDING
+from .scripts import RSTScript
+from .sync import SyncState, apply_upstream_changes, find_origin_commit, find_recorded_commit, find_synced_commit, \
+    format_trailer, has_conflict_markers, read_sync_state, write_sync_state, clear_sync_state
+from .tree import TreeIndex
+from .utils import get_script, get_info, get_stored_info, publish, prefetch, prepare_publication, make_filter, \
+    is_noop_transform, format_package_name, format_project_name, format_py_script_title, \
+    format_url, FILE_URL_PATTERN
+
+# URL formats that are replaced when changing an URL
+URL_FORMATS_TO_CHANGE = ['https+git', 'git', 'https', 'ssh']
 
 
 class ProjectManager(RepositoryManager):
     """Main class for manipulating a project"""
 
+    # Options of the write batch scripts are published in (c.f. WriteBatch)
+    write_options = {'atomic': True, 'fsync': True}
+
+    # Optional cache of transformation outputs shared by projects (c.f. TransformCache)
+    transform_cache = None
+
+    # Options of the publication pipeline (c.f. run_pipeline)
+    pipeline_options = {
+        'prefetch_workers': DEFAULT_PREFETCH_WORKERS,
+        'write_workers': DEFAULT_WRITE_WORKERS,
+        'max_pending': DEFAULT_MAX_PENDING,
+    }
+
+    def iter_scripts(self, is_filtered=None, tree=None):
+        """Iterate over scripts objects (c.f. iter_blobs for arguments)
+
+        Scripts are created one at a time as the tree is walked. When tree is a TreeIndex, script classes are
+        dispatched from the index.
+        """
+
+        if isinstance(tree, TreeIndex):
+            yield from tree.iter_scripts(is_filtered=is_filtered)
+            return
+
+        for blob in self.iter_blobs(is_filtered=is_filtered, tree=tree):
+            yield get_script(blob)
+
+    def iter_info(self, *args, **kwargs):
+        """Iterate over info objects (c.f. iter_blobs for arguments)
+
+        Each script is read only when its info is requested
+        """
+
+        for blob in self.iter_blobs(*args, **kwargs):
+            yield get_info(blob)
+
     def get_scripts(self, *args, **kwargs):
         """Return scripts objects"""
 
-        scripts = []
-        self.apply_func(lambda blob: scripts.append(get_script(blob)), *args, **kwargs)
-
-        return scripts
+        return list(self.iter_scripts(*args, **kwargs))
 
     def get_info(self, *args, **kwargs):
         """Return info objects"""
 
-        info = []
-        self.apply_func(lambda blob: info.append(get_info(blob)), *args, **kwargs)
+        return list(self.iter_info(*args, **kwargs))
+
+    def get_info_at(self, path, rev=None):
+        """Return info of a single script
 
-        return info
+        :param path: Path of the script relative to the repository root
+        :type path: str
+        :param rev: Optional revision to read the script from. If not provided the script is read from the working tree
+        :type rev: str
+        """
+
+        blob = self.get_blob(path, rev=rev)
+        return get_info(blob) if rev is None else get_stored_info(blob)
 
     def publish(self, *args, **kwargs):
-        """Publish modifications for multiple scripts"""
+        """Publish modifications for multiple scripts
+
+        The git tree is not walked when the modifications can not change any script (c.f. is_noop_transform)
+
+        :return: Paths of the scripts that have actually been modified
+        :rtype: list
+        """
+
+        if not args and 'destination' not in kwargs:
+            is_filtered, tree = kwargs.pop('is_filtered', None), kwargs.pop('tree', None)
+            return self.publish_all([(is_filtered, kwargs)], tree=tree)
+
+        changed_paths = []
+        transform_kwargs = {kw: arg for kw, arg in kwargs.items() if kw not in ['is_filtered', 'tree', 'destination']}
+        if args or not is_noop_transform(transform_kwargs):
+            with self.write_batch():
+                self.apply_func(publish, changed_paths=changed_paths, *args, **kwargs)
+
+        return changed_paths
+
+    def publish_all(self, requests, tree=None):
+        """Publish multiple modifications in a single pass over the git tree
+
+        Every blob is read and written at most once, transformations of the requests matching a blob being applied
+        in the order of the requests. Requests that can not change any script (c.f. is_noop_transform) and duplicated
+        requests are dropped before walking the tree.
+
+        Scripts are published through a pipeline (c.f. run_pipeline and pipeline_options): files are read ahead by
+        a prefetch pool and written by a writer pool while scripts are parsed and transformed.
+
+        :param requests: List of (is_filtered, kwargs) publication requests, is_filtered being as in apply_func
+            and kwargs being the transformation keyword arguments (that can be functions taking blob as argument)
+        :type requests: list
+        :param tree: Optional git tree to publish
+        :return: Paths of the scripts that have actually been modified
+        :rtype: list
+        """
+
+        requests = self.prepare_requests(requests)
+        if not requests:
+            return []
+
+        def iter_publications():
+            for blob in self.iter_blobs(tree=tree):
+                transforms = self.get_transforms(requests, blob)
+                if transforms:
+                    yield blob, transforms
+
+        def process(publication, source):
+            blob, transforms = publication
+            return blob, prepare_publication(blob, transforms, source=source, cache=self.transform_cache)
+
+        def write(prepared_publication):
+            blob, script = prepared_publication
+            script.write()
+            return blob.path if script.changed else None
+
+        with self.write_batch():
+            written_paths = run_pipeline(iter_publications(),
+                                         prefetch=lambda publication: prefetch(publication[0]),
+                                         process=process,
+                                         write=write,
+                                         **self.pipeline_options)
+
+        return [path for path in written_paths if path is not None]
+
+    @staticmethod
+    def prepare_requests(requests):
+        """Drop publication requests that can not change any script and duplicated requests (c.f. publish_all)
+
+        :return: List of (filter function, kwargs) requests
+        :rtype: list
+        """
+
+        effective_requests = []
+        for is_filtered, kwargs in requests:
+            if not is_noop_transform(kwargs) and (is_filtered, kwargs) not in effective_requests:
+                effective_requests.append((is_filtered, kwargs))
+
+        return [(make_filter(is_filtered), kwargs) for is_filtered, kwargs in effective_requests]
+
+    @staticmethod
+    def get_transforms(requests, blob):
+        """Return the transformations of prepared publication requests matching a blob (c.f. prepare_requests)
+
+        :param requests: Prepared publication requests
+        :type requests: list
+        :param blob: Blob to transform (any object with a path attribute)
+        :return: List of keyword arguments of each transformation
+        :rtype: list
+        """
+
+        return [{kw: arg(blob) if callable(arg) else arg for kw, arg in kwargs.items()}
+                for is_filtered, kwargs in requests
+                if not callable(is_filtered) or is_filtered(blob)]
+
+    def write_batch(self):
+        """Return a write batch configured with write_options
 
-        self.apply_func(publish, *args, **kwargs)
+        Scripts published while the batch is active are all written to disk when it exits without error
+        """
+
+        return WriteBatch(**self.write_options)
 
     @property
     def setup_info(self):
         """Return information extracted from setup.py script"""
 
-        info = self.get_info(is_filtered='setup.py')
+        return self.get_info_at('setup.py').code.setup
+
+    @property
+    def metadata_index(self):
+        """Return the persistent metadata index of the project (c.f. ProjectIndex)"""
+
+        if '_index' not in self.__dict__:
+            self.__dict__['_index'] = ProjectIndex(self)
+
+        return self.__dict__['_index']
+
+    @property
+    def commit_cache(self):
+        """Return the persistent cache of parsed commits of the project (c.f. CommitCache)"""
 
-        return info[0].code.setup
+        if '_commit_cache' not in self.__dict__:
+            self.__dict__['_commit_cache'] = CommitCache(self)
+
+        return self.__dict__['_commit_cache']
+
+    def close(self):
+        """Release resources held by the project (git processes, metadata index and commit cache)"""
+
+        for name in ['_index', '_commit_cache']:
+            if name in self.__dict__:
+                self.__dict__.pop(name).close()
+
+        super().close()
 
     def check_project(self):
         """Ensure there are no uncommitted modification"""
@@ -63,11 +247,88 @@ class ProjectManager(RepositoryManager):
         """
 
         # Perform modifications on every URL format
-        for url_format in ['https+git', 'git', 'https', 'ssh']:
+        for url_format in URL_FORMATS_TO_CHANGE:
             self.publish(old_value=format_url(old_url, url_format),
                          new_value=format_url(new_url, url_format),
                          *args, **kwargs)
 
+    def plan_change_url(self, old_url, new_url):
+        """Return the publication requests replacing an URL in every format (c.f. publish_all)
+
+        :param old_url: URL value to be replaced
+        :type old_url: str
+        :param new_url: New URL value
+        :type new_url: str
+        """
+
+        return [(None, {'old_value': format_url(old_url, url_format), 'new_value': format_url(new_url, url_format)})
+                for url_format in URL_FORMATS_TO_CHANGE]
+
+    def plan_project_url(self, old_info, url, old_urls=()):
+        """Return the publication requests changing the url of the project (c.f. publish_all)
+
+        :param old_info: Current setup.py information
+        :type old_info: SetupKwargsInfo
+        :param url: New project URL
+        :type url: str
+        :param old_urls: Optional extra URLs to be replaced by the new URL
+        :type old_urls: list
+        """
+
+        # Start by updating setup.py script
+        requests = [('setup.py', {'url': format_url(url, 'https')})]
+        for old_url in [old_info.url.value] + list(old_urls):
+            requests.extend(self.plan_change_url(old_url, url))
+
+        return requests
+
+    def plan_project_name(self, old_info, name):
+        """Return the publication requests changing project name (c.f. publish_all)
+
+        Package folder is expected to have already been renamed
+
+        :param old_info: Current setup.py information
+        :type old_info: SetupKwargsInfo
+        :param name: New name of the project
+        :type name: str
+        """
+
+        new_project_name, new_package_name = format_project_name(name), format_package_name(name)
+        old_package_name = old_info.packages[0].value
+
+        return [
+            # Update python scripts headers title
+            ('{folder}*.py'.format(folder=new_package_name), {'title': lambda blob: format_py_script_title(blob.path)}),
+
+            # Rename imports in .py files
+            ('*.py', {'old_import': old_package_name, 'new_import': new_package_name}),
+
+            # Replace text
+            (None, {'old_value': old_info.name.value, 'new_value': new_project_name}),
+            (None, {'old_value': old_package_name, 'new_value': new_package_name}),
+            (None, {'old_value': old_package_name.replace('_', '-'), 'new_value': new_package_name.replace('_', '-')}),
+        ]
+
+    def plan_project_author(self, old_info, author_name=None, author_email=None):
+        """Return the publication requests changing project author information (c.f. publish_all)
+
+        :param old_info: Current setup.py information
+        :type old_info: SetupKwargsInfo
+        :param author_name: Optional new author name
+        :type author_name: str
+        :param author_email: Optional new author email
+        :type author_email: str
+        """
+
+        return [
+            # Update setup.py info
+            ('setup.py', {'author': author_name, 'author_email': author_email}),
+
+            # Update text
+            (None, {'old_value': old_info.author.value, 'new_value': author_name}),
+            (None, {'old_value': old_info.author_email.value, 'new_value': author_email}),
+        ]
+
     def set_project_name(self, name):
         """Change project name
 
@@ -86,18 +347,8 @@ class ProjectManager(RepositoryManager):
         # Rename package folder
         self.mv(old_info.packages[0].value, new_package_name)
 
-        # Update python scripts headers title
-        self.publish(is_filtered='{folder}*.py'.format(folder=new_package_name),
-                     title=lambda blob: format_py_script_title(blob.path))
-
-        # Rename imports in .py files
-        self.publish(is_filtered='*.py', old_import=old_info.packages[0].value, new_import=new_package_name)
-
-        # Replace text
-        self.publish(old_value=old_info.name.value, new_value=new_project_name)
-        self.publish(old_value=old_info.packages[0].value, new_value=new_package_name)
-        self.publish(old_value=old_info.packages[0].value.replace('_', '-'),
-                     new_value=new_package_name.replace('_', '-'))
+        # Update scripts
+        self.publish_all(self.plan_project_name(old_info, name))
 
         # Commit modifications
         message_pattern = 'refactor(all): rename project to {name}\n' \
@@ -119,13 +370,9 @@ class ProjectManager(RepositoryManager):
         # Check project can be modified
         self.check_project()
 
-        # Update setup.py info
+        # Update scripts
         old_info = self.setup_info
-        self.publish(is_filtered='setup.py', author=author_name, author_email=author_email)
-
-        # Update text
-        self.publish(old_value=old_info.author.value, new_value=author_name)
-        self.publish(old_value=old_info.author_email.value, new_value=author_email)
+        self.publish_all(self.plan_project_author(old_info, author_name, author_email))
 
         # Commit modifications
         message_pattern = 'refactor(all): rename author\n' \
@@ -154,8 +401,7 @@ class ProjectManager(RepositoryManager):
 
         # Change project url
         old_info = self.setup_info
-        self.publish(is_filtered='setup.py', url=format_url(url, 'https'))  # Start by updating setup.py script
-        self.change_url(old_info.url.value, url)
+        self.publish_all(self.plan_project_url(old_info, url))
 
         # Commit modifications
         message_pattern = 'refactor(all): set project url to {url}\n' \
@@ -199,6 +445,314 @@ class ProjectManager(RepositoryManager):
 
         return new_url
 
+    def contextualize(self, name=None, url=None, author_name=None, author_email=None, upstream='boilerplate',
+                      commit=True):
+        """Contextualize a project cloned from a boilerplate
+
+        It performs the modifications of set_project_origin, set_project_name and set_project_author at once.
+        All script modifications are planned together and published in a single pass over the git tree.
+
+        :param name: Optional new name of the project
+        :type name: str
+        :param url: Optional new origin URL (origin is then renamed to `upstream`)
+        :type url: str
+        :param author_name: Optional new author name
+        :type author_name: str
+        :param author_email: Optional new author email
+        :type author_email: str
+        :param upstream: Name to rename the origin to when a new URL is provided
+        :type upstream: str
+        :param commit: Whether or not to commit modifications (in a single commit)
+        :type commit: bool
+        :return: Ordered mapping of the values that have been set
+        :rtype: OrderedDict
+        """
+
+        # Check project can be modified
+        self.check_project()
+
+        # Boilerplate commit the project is created from (recorded so the project can be synchronized with it)
+        upstream_commit = find_origin_commit(self)
+
+        old_info = self.setup_info
+        values, requests, tree = OrderedDict(), [], None
+
+        if url is not None:
+            # Renames origin and re-creates it
+            boilerplate_urls = list(self.remotes['origin'].urls)
+            self.remotes['origin'].rename(upstream)
+            self.create_remote('origin', url)
+
+            old_urls = [old_url for old_url in boilerplate_urls if not FILE_URL_PATTERN.match(old_url)]
+            requests.extend(self.plan_project_url(old_info, url, old_urls=old_urls))
+            values['url'] = url
+
+        if name is not None:
+            # Rename package folder (tree is then read from the index as the renaming is not committed yet)
+            new_package_name = format_package_name(name)
+            if new_package_name != old_info.packages[0].value:
+                self.git.mv(old_info.packages[0].value, new_package_name)
+                tree = self.index.write_tree()
+
+            requests.extend(self.plan_project_name(old_info, name))
+            values['name'] = format_project_name(name)
+
+        if author_name is not None or author_email is not None:
+            requests.extend(self.plan_project_author(old_info, author_name, author_email))
+            if author_name is not None:
+                values['author_name'] = author_name
+            if author_email is not None:
+                values['author_email'] = author_email
+
+        self.publish_all(requests, tree=tree)
+
+        if commit:
+            message_pattern = 'refactor(all): contextualize project\n' \
+                              '\n' \
+                              '{changes}' \
+                              '\n' \
+                              '{postfix}'
+            changes = ''.join(['- set {field} to {value}\n'.format(field=field.replace('_', ' '), value=value)
+                               for field, value in values.items()])
+            trailer = '\n\n' + format_trailer(upstream_commit) if upstream_commit is not None else ''
+            self.commit('-am', self.make_message(message_pattern, changes=changes) + trailer)
+
+        return values
+
+    def compose_boilerplates(self, urls, sources=None):
+        """Layer overlay boilerplates over the project and commit the composed tree
+
+        Only the tree of the last commit of each overlay is fetched (the project does not become shallow). Trees are
+        merged at the git object level (c.f. compose), overlays taking precedence over the project and later overlays
+        over earlier ones. The working tree is only updated once with the composed tree.
+
+        :param urls: Git URLs of the overlays in increasing order of precedence
+        :type urls: list
+        :param sources: Optional mapping of overlay URLs to locations to fetch them from (e.g. cache mirrors)
+        :type sources: dict
+        :return: Paths of the files that have been overridden by an overlay
+        :rtype: list
+        """
+
+        # Check project can be modified
+        self.check_project()
+
+        # Boilerplate commit the project is created from (recorded so the project can be synchronized with it)
+        upstream_commit = find_origin_commit(self)
+
+        revs, trees = [self.head.commit.hexsha], [self.head.commit.tree.hexsha]
+        for url in urls:
+            rev, tree = fetch_tree(self, (sources or {}).get(url, url))
+            revs.append(rev)
+            trees.append(tree)
+
+        entries, overridden = merge_entries([list_tree(self, tree) for tree in trees])
+        tree = write_tree(self, entries)
+
+        message_pattern = 'chore(all): compose boilerplates\n' \
+                          '\n' \
+                          '{overlays}' \
+                          '\n' \
+                          '{postfix}'
+        overlays = ''.join(['- layer {url} ({sha})\n'.format(url=url, sha=rev[:7]) for url, rev in zip(urls, revs[1:])])
+        message = self.make_message(message_pattern, overlays=overlays)
+        if upstream_commit is not None:
+            message = '{0}\n\n{1}'.format(message, format_trailer(upstream_commit))
+
+        with span('commit'):
+            commit = self.git.commit_tree(tree, '-p', revs[0], '-m', message)
+            self.git.reset('--hard', commit)
+
+        return overridden
+
+    def plan_contextualization(self, old_info, info, old_urls=()):
+        """Return the publication requests contextualizing scripts of a boilerplate for the project (c.f. publish_all)
+
+        :param old_info: setup.py information of the boilerplate
+        :type old_info: SetupKwargsInfo
+        :param info: setup.py information of the project
+        :type info: SetupKwargsInfo
+        :param old_urls: Optional extra URLs of the boilerplate to be replaced by the project URL
+        :type old_urls: list
+        """
+
+        requests = []
+        if info.url.value != old_info.url.value:
+            requests.extend(self.plan_project_url(old_info, info.url.value, old_urls=old_urls))
+
+        if info.name.value != old_info.name.value or info.packages[0].value != old_info.packages[0].value:
+            requests.extend(self.plan_project_name(old_info, info.name.value))
+
+        if info.author.value != old_info.author.value or info.author_email.value != old_info.author_email.value:
+            requests.extend(self.plan_project_author(old_info, info.author.value, info.author_email.value))
+
+        return requests
+
+    def get_upstream_rev(self, upstream='boilerplate', branch=None):
+        """Return the revision of the upstream branch (default branch of the upstream or else the active branch)"""
+
+        if branch is not None:
+            return '{upstream}/{branch}'.format(upstream=upstream, branch=branch)
+
+        head_ref = 'refs/remotes/{upstream}/HEAD'.format(upstream=upstream)
+        if self.git.for_each_ref(head_ref):
+            return '{upstream}/HEAD'.format(upstream=upstream)
+        return self.get_upstream_rev(upstream, self.active_branch.name)
+
+    def sync_upstream(self, upstream='boilerplate', branch=None, fetch=True, commit=True):
+        """Synchronize the project with the upstream boilerplate it has been created from
+
+        Upstream changes since the last synchronized upstream commit are contextualized (name, package, author and
+        URL of the project) and merged into the project. Only the blobs that changed in the upstream are read.
+
+        A synchronization that is not committed (conflicts or commit=False) is recorded so the upstream commit it
+        synchronizes with is recorded when it is committed, either by continue_sync_upstream or by ``git commit``
+        which uses the prepared message
+
+        :param upstream: Name of the upstream remote
+        :type upstream: str
+        :param branch: Optional upstream branch (defaults to the default branch of the upstream)
+        :type branch: str
+        :param fetch: Whether or not to fetch the upstream first
+        :type fetch: bool
+        :param commit: Whether or not to commit modifications (modifications are not committed on conflicts)
+        :type commit: bool
+        :return: List of SyncChange
+        :rtype: list
+        """
+
+        self.check_sync_state()
+
+        # Check project can be modified
+        self.check_project()
+
+        if fetch:
+            self.git.fetch(upstream)
+
+        tip = self.git.rev_parse('--verify', '{rev}^{{commit}}'.format(rev=self.get_upstream_rev(upstream, branch)))
+        base = find_synced_commit(self, tip)
+        assert base is not None, \
+            'Could not find the {upstream} commit the project has last been synchronized with'.format(upstream=upstream)
+
+        if base == tip:
+            return []
+
+        old_info, info = get_stored_info(self.get_blob('setup.py', rev=base)).code.setup, self.setup_info
+        old_urls = [url for url in self.remotes[upstream].urls if not FILE_URL_PATTERN.match(url)]
+        requests = self.prepare_requests(self.plan_contextualization(old_info, info, old_urls=old_urls))
+        changes = apply_upstream_changes(self, requests, base, tip,
+                                         old_package=old_info.packages[0].value, new_package=info.packages[0].value)
+
+        message_pattern = 'chore(all): sync with {upstream} {sha}\n' \
+                          '\n' \
+                          '{changes}' \
+                          '\n' \
+                          '{postfix}'
+        summary = ''.join(['- {status} {path}\n'.format(status=change.status, path=change.path)
+                           for change in changes if change.status not in ['unchanged', 'skipped']])
+        message = self.make_message(message_pattern, upstream=upstream, sha=tip[:7], changes=summary)
+        message = '{0}\n\n{1}'.format(message, format_trailer(tip))
+
+        conflicts = [change.path for change in changes if change.status == 'conflict']
+        if commit and not conflicts:
+            # Synchronized commit is recorded even if the project already held every upstream change
+            self.git.commit('--allow-empty', '-m', message)
+        else:
+            write_sync_state(self, SyncState(tip, message, conflicts))
+
+        return changes
+
+    def check_sync_state(self):
+        """Ensure there is no synchronization with the upstream that has not been committed
+
+        A synchronization committed with ``git commit`` and the prepared message is forgotten
+        """
+
+        state = read_sync_state(self)
+        if state is not None:
+            assert find_recorded_commit(self) == state.tip, \
+                'Synchronization with upstream commit {sha} has not been committed. ' \
+                'Please resolve conflicts, stage files and run sync-upstream --continue'.format(sha=state.tip[:7])
+            clear_sync_state(self)
+
+    def continue_sync_upstream(self):
+        """Commit a synchronization with the upstream once its conflicts have been resolved and staged
+
+        The upstream commit is recorded in an Upstream-Commit trailer even if the resolved files have already been
+        committed without it
+
+        :return: Committed synchronization
+        :rtype: SyncState
+        """
+
+        state = read_sync_state(self)
+        assert state is not None, 'There is no synchronization with the upstream to continue'
+
+        if find_recorded_commit(self) != state.tip:
+            unresolved = self.git.diff('--name-only', '--', *state.conflicts).splitlines() if state.conflicts else []
+            unresolved += [path for path in state.conflicts
+                           if path not in unresolved and has_conflict_markers(os.path.join(self.working_dir, path))]
+            assert not unresolved, \
+                'Conflicts of {paths} are not staged. Please resolve them and stage them with git add'.format(
+                    paths=', '.join(unresolved))
+            self.git.commit('--allow-empty', '-m', state.message)
+
+        clear_sync_state(self)
+        return state
+
+    def render_changelog(self, path='CHANGES.rst', rev='HEAD', from_rev=None):
+        """Render changelog sections from conventional commits
+
+        Generated sections replace the sections of the changelog with the same title, other sections are kept.
+        Commits are parsed once and cached (c.f. commit_cache).
+
+        :param path: Path of the changelog relative to the repository root (created if it does not exist)
+        :type path: str
+        :param rev: Revision to generate the changelog from
+        :type rev: str
+        :param from_rev: Optional revision which commits are excluded from the changelog (usually a tag name)
+        :type from_rev: str
+        :return: Changelog script holding the rendered changelog (not written yet)
+        :rtype: RSTScript
+        """
+
+        abspath = os.path.join(self.working_dir, path)
+        if os.path.isfile(abspath):
+            source = abspath
+        else:
+            try:
+                name = self.setup_info.name.value
+            except KeyError:
+                name = os.path.basename(self.working_dir)
+            source = CHANGELOG_HEADER.format(name=name)
+
+        script = RSTScript(source=source, destination=abspath)
+        script.read()
+
+        # Sections are looked for after the document title
+        title = script.content.info.title
+        start = title.lineno + 2 if title is not None else 0
+        header, old_sections = split_sections(script.content.lines, start=start)
+
+        commits = iter_parsed_commits(self, rev=rev, from_rev=from_rev, cache=self.commit_cache)
+        new_sections = OrderedDict([(section_title, render_section(section_title, entries))
+                                    for section_title, entries in iter_sections(commits, get_version_tags(self))])
+
+        script.content.set_lines(merge_sections(header, old_sections, new_sections))
+        return script
+
+    def update_changelog(self, *args, **kwargs):
+        """Render changelog sections from conventional commits and write the changelog (c.f. render_changelog)
+
+        :return: Whether or not the changelog has been modified
+        :rtype: bool
+        """
+
+        script = self.render_changelog(*args, **kwargs)
+        with self.write_batch():
+            script.write()
+        return script.changed
+
     def set_project_py_script_headers(self, license=None, copyright=None):
         """Update .py script information
 
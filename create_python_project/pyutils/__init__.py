@@ -8,7 +8,10 @@
 """
 
 from .pep487 import object_with_init_subclass
+from .pep562 import set_lazy_attributes, lazy_import
 
 __all__ = [
     'object_with_init_subclass',
+    'set_lazy_attributes',
+    'lazy_import',
 ]
@@ -0,0 +1,92 @@
+"""
+    pyutils.pep562
+    ~~~~~~~~~~~~~~
+
+    Implement patch for pep562 (module __getattr__) and lazy imports built on top of it
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import importlib
+import sys
+import types
+
+__all__ = [
+    'set_module_getattr',
+    'set_lazy_attributes',
+    'lazy_import',
+]
+
+is_pep562_implemented = sys.version_info >= (3, 7)
+
+
+class module_with_getattr(types.ModuleType):
+    """Base module class dispatching missing attributes to the module level __getattr__"""
+
+    def __getattr__(self, name):
+        getattr_func = self.__dict__.get('__getattr__')
+        if getattr_func is None:
+            raise AttributeError('module {0!r} has no attribute {1!r}'.format(self.__name__, name))
+        return getattr_func(name)
+
+
+def set_module_getattr(module_name, getattr_func):
+    """Set a module level __getattr__ function
+
+    :param module_name: Name of the module (usually __name__)
+    :type module_name: str
+    :param getattr_func: Function taking an attribute name and returning its value or raising AttributeError
+    """
+
+    module = sys.modules[module_name]
+    module.__getattr__ = getattr_func
+    if not is_pep562_implemented:
+        module.__class__ = module_with_getattr
+
+
+def set_lazy_attributes(module_name, attributes):
+    """Set module attributes that are imported from other modules on first access
+
+    :param module_name: Name of the module (usually __name__)
+    :type module_name: str
+    :param attributes: Mapping from attribute names to the (possibly relative) modules they are defined in
+    :type attributes: dict
+    """
+
+    module = sys.modules[module_name]
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError('module {0!r} has no attribute {1!r}'.format(module_name, name))
+        value = getattr(importlib.import_module(attributes[name], module.__package__), name)
+        setattr(module, name, value)
+        return value
+
+    set_module_getattr(module_name, __getattr__)
+
+
+class LazyModule:
+    """Module proxy importing the module on first attribute access"""
+
+    def __init__(self, name, package=None):
+        self._name = name
+        self._package = package
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name, self._package)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name, package=None):
+    """Return a proxy of a module that is imported on first attribute access
+
+    :param name: Name of the module (relative names require `package`)
+    :type name: str
+    :param package: Optional package to resolve relative names from
+    :type package: str
+    """
+
+    return LazyModule(name, package)
@@ -10,14 +10,26 @@
 
 import fnmatch
 import re
+import sys
+from collections import OrderedDict
 
-from .base import BaseScript
-from .ini import IniScript
-from .init import PyInitScript
-from .py import PyScript
-from .rst import RSTScript
-from .setup import PySetupScript
-from .yml import YmlScript
+from ..pyutils import lazy_import, set_lazy_attributes
+
+# Script classes with the module they are implemented in. Script modules depend on docutils or yaml
+# so they are only imported when a script class is first accessed
+SCRIPT_CLASSES = OrderedDict([
+    ('BaseScript', '.base'),
+    ('IniScript', '.ini'),
+    ('PyScript', '.py'),
+    ('PyInitScript', '.init'),
+    ('PySetupScript', '.setup'),
+    ('RSTScript', '.rst'),
+    ('YmlScript', '.yml'),
+])
+
+set_lazy_attributes(__name__, SCRIPT_CLASSES)
+
+base = lazy_import('.base', __name__)
 
 
 def is_supported(klass, file_path):
@@ -29,11 +41,18 @@ def is_supported(klass, file_path):
     return False
 
 
+def has_info(klass):
+    """Evaluates if a given Script class extracts info from scripts"""
+
+    return issubclass(klass.reader_class.content_class, base.ContentWithInfo)
+
+
 def get_script_class(file_path):
     """Return the most specific class matching path"""
 
-    script_class = BaseScript
-    for klass in [IniScript, PyScript, PyInitScript, PySetupScript, RSTScript, YmlScript]:
+    module = sys.modules[__name__]
+    script_class = module.BaseScript
+    for klass in [getattr(module, name) for name in SCRIPT_CLASSES if name != 'BaseScript']:
         if is_supported(klass, file_path) and issubclass(klass, script_class):
             script_class = klass
     return script_class
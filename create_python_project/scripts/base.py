@@ -9,7 +9,14 @@
 """
 
 from ..info import BaseInfo
-from ..io import IOMeta, InputDescriptor, OutputDescriptor
+from ..io import IOMeta, InputDescriptor, OutputDescriptor, PrefetchedFileInput, is_same_file
+from .. import events
+
+
+def get_size(text):
+    """Return size in bytes of a text"""
+
+    return len(text.encode('utf-8', 'surrogateescape')) if text is not None else 0
 
 
 class ScriptContent:
@@ -95,10 +102,21 @@ class BaseReader:
 class BaseWriter:
     """Base writer for scripts"""
 
-    def write(self, content, destination):
+    def __init__(self):
+        self.changed = None
+
+    def write(self, content, destination, original=None):
+        """Write content to destination
+
+        :param original: Optional text currently held by destination, writing is skipped if output is the same
+        :type original: str
+        """
         self.content = content
         self.destination = destination
         self.translate(content)
+        self.changed = original is None or original != self.output
+        if not self.changed:
+            return self.output
         output = self.destination.write(self.output)
         return output
 
@@ -129,15 +147,83 @@ class BaseScript(metaclass=IOMeta):
 
         self.content = None
 
+    @property
+    def content(self):
+        """Content of the script
+
+        When the output of the script has been loaded (c.f. load_output) the content is parsed from the output the
+        first time it is accessed, so it is an instance of the content class of the script whether the output has
+        been cached or not
+        """
+
+        if self._content is None and self._loaded_output is not None:
+            source = PrefetchedFileInput(self._loaded_output, self.source.source_path)
+            self._content = self.reader_class().read(source, self.parser_class())
+        return self._content
+
+    @content.setter
+    def content(self, content):
+        self._content = content
+        self._loaded_output = None
+
     def read(self):
         if self.content is None:
-            self.content = self.reader.read(self.source, self.parser)
+            with self.span('parse') as span:
+                self.content = self.reader.read(self.source, self.parser)
+                if span:
+                    span.set(bytes=get_size(self.reader.input))
+
+    def load_output(self, input, output):
+        """Set script as if it had been read from input and transformed into output (e.g. output has been cached)
+
+        Output is not parsed unless content is accessed (c.f. content)
+
+        :param input: Text the script would have been read from
+        :type input: str
+        :param output: Text the script would have been transformed into
+        :type output: str
+        """
+
+        self.reader.input = input
+        self.content = None
+        self._loaded_output = output
 
     def apply_transform(self, *args, **kwargs):
-        self.content.transform(*args, **kwargs)
+        with self.span('transform'):
+            self.content.transform(*args, **kwargs)
 
     def write(self):
-        return self.writer.write(self.content, self.destination)
+        with self.span('write') as span:
+            output = self.writer.write(self.get_output_content(), self.destination, original=self.get_original())
+            if span:
+                span.set(bytes=get_size(self.writer.output), changed=self.changed)
+            return output
+
+    def get_output_content(self):
+        """Return content to write (a loaded output is written without being parsed)"""
+
+        if self._content is None and self._loaded_output is not None:
+            return ScriptContent(lines=self._loaded_output.split('\n'))
+        return self.content
+
+    def span(self, name):
+        """Return an instrumentation span of an operation on the script (c.f. events.span)"""
+
+        if not events.has_listeners():
+            return events.null_span
+        return events.span(name, path=self.source.source_path, script_class=type(self).__name__)
+
+    def get_original(self):
+        """Return the text that has been read if destination is the file it has been read from"""
+
+        if is_same_file(self.source, self.destination):
+            return self.reader.input
+
+    @property
+    def changed(self):
+        """Whether or not the last write actually modified the destination"""
+
+        return self.writer.changed
 
     def publish(self, *args, **kwargs):
         self.read()
@@ -0,0 +1,263 @@
+"""
+    create_python_project.serialization
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implements compact serialization of info objects
+
+    Info snapshots can be dumped either to JSON or to a binary format compatible with MessagePack.
+    Both formats are versioned and round-trip exactly (including line numbers and other metadata).
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+import struct
+
+from .info import BaseInfo
+
+# Version of the snapshot format (to be increased on every incompatible change)
+SNAPSHOT_VERSION = 1
+
+# Key holding the info class name in a serialized info
+CLASS_KEY = '@'
+
+FORMATS = ('json', 'binary')
+
+_info_classes = {}
+
+
+def get_info_class(name):
+    """Return the info class with the given name
+
+    :param name: Name of an info class (subclass of BaseInfo)
+    :type name: str
+    """
+
+    if name not in _info_classes:
+        classes = [BaseInfo]
+        while classes:
+            klass = classes.pop()
+            _info_classes.setdefault(klass.__name__, klass)
+            classes.extend(klass.__subclasses__())
+
+    assert name in _info_classes, 'Unknown info class {0}'.format(name)
+
+    return _info_classes[name]
+
+
+def dump_value(value):
+    """Convert a value (info, tuple of info or scalar) into a structure of plain python types
+
+    Infos are converted into dict holding their class name and their non null fields
+
+    :param value: Value to convert
+    """
+
+    if isinstance(value, BaseInfo):
+        data = {CLASS_KEY: type(value).__name__}
+        for field in sorted(value._fields):
+            field_value = getattr(value, field)
+            if field_value is not None:
+                data[field] = dump_value(field_value)
+        return data
+
+    elif isinstance(value, (tuple, list)):
+        return [dump_value(item) for item in value]
+
+    return value
+
+
+def load_value(data):
+    """Convert back a structure of plain python types into a value (c.f. dump_value)
+
+    Sequences are loaded as tuples
+
+    :param data: Data to convert
+    """
+
+    if isinstance(data, dict):
+        kwargs = {field: load_value(value) for field, value in data.items() if field != CLASS_KEY}
+        return get_info_class(data[CLASS_KEY])(**kwargs)
+
+    elif isinstance(data, (tuple, list)):
+        return tuple([load_value(item) for item in data])
+
+    return data
+
+
+def dumps(value, format='json'):
+    """Serialize an info (or a sequence of infos) into a versioned snapshot
+
+    :param value: Info to serialize
+    :param format: One of 'json' (returns str) or 'binary' (returns bytes)
+    :type format: str
+    """
+
+    assert format in FORMATS, 'Snapshot format must be one of {0} but you passed {1}'.format(FORMATS, format)
+
+    snapshot = {'version': SNAPSHOT_VERSION, 'info': dump_value(value)}
+
+    if format == 'json':
+        return json.dumps(snapshot, separators=(',', ':'), sort_keys=True)
+
+    return pack(snapshot)
+
+
+def loads(snapshot):
+    """Deserialize a versioned snapshot (c.f. dumps)
+
+    :param snapshot: JSON (str) or binary (bytes) snapshot
+    :type snapshot: str or bytes
+    """
+
+    snapshot = json.loads(snapshot) if isinstance(snapshot, str) else unpack(snapshot)
+
+    assert isinstance(snapshot, dict) and snapshot.get('version') == SNAPSHOT_VERSION, \
+        'Snapshot version is not supported (expected version {0})'.format(SNAPSHOT_VERSION)
+
+    return load_value(snapshot['info'])
+
+
+def _pack_header(buffer, length, fix_code, fix_limit, codes):
+    if length < fix_limit:
+        buffer.append(struct.pack('B', fix_code | length))
+    elif length <= 0xffff:
+        buffer.append(struct.pack('>BH', codes[0], length))
+    else:
+        buffer.append(struct.pack('>BI', codes[1], length))
+
+
+def _pack_int(value, buffer):
+    if 0 <= value < 0x80:
+        buffer.append(struct.pack('B', value))
+    elif -0x20 <= value < 0:
+        buffer.append(struct.pack('b', value))
+    else:
+        codes = ((0xcc, '>BB', 0xff), (0xcd, '>BH', 0xffff), (0xce, '>BI', 0xffffffff), (0xcf, '>BQ', None)) \
+            if value > 0 else \
+            ((0xd0, '>Bb', 0x80), (0xd1, '>Bh', 0x8000), (0xd2, '>Bi', 0x80000000), (0xd3, '>Bq', None))
+        for code, fmt, limit in codes:
+            if limit is None or abs(value) <= limit:
+                buffer.append(struct.pack(fmt, code, value))
+                break
+
+
+def _pack_str(value, buffer):
+    data = value.encode('utf-8')
+    if len(data) < 0x20:
+        buffer.append(struct.pack('B', 0xa0 | len(data)))
+    elif len(data) <= 0xff:
+        buffer.append(struct.pack('>BB', 0xd9, len(data)))
+    else:
+        _pack_header(buffer, len(data), 0, 0, (0xda, 0xdb))
+    buffer.append(data)
+
+
+def _pack(value, buffer):
+    if value is None:
+        buffer.append(b'\xc0')
+
+    elif isinstance(value, bool):
+        buffer.append(b'\xc3' if value else b'\xc2')
+
+    elif isinstance(value, int):
+        _pack_int(value, buffer)
+
+    elif isinstance(value, str):
+        _pack_str(value, buffer)
+
+    elif isinstance(value, (tuple, list)):
+        _pack_header(buffer, len(value), 0x90, 0x10, (0xdc, 0xdd))
+        for item in value:
+            _pack(item, buffer)
+
+    elif isinstance(value, dict):
+        _pack_header(buffer, len(value), 0x80, 0x10, (0xde, 0xdf))
+        for key in sorted(value):
+            _pack(key, buffer)
+            _pack(value[key], buffer)
+
+    else:
+        raise TypeError('Can not pack value {0} of type {1}'.format(value, type(value)))
+
+
+def pack(value):
+    """Encode plain python value (None, bool, int, str, tuple, list or dict) into MessagePack bytes
+
+    :param value: Value to encode
+    :rtype: bytes
+    """
+
+    buffer = []
+    _pack(value, buffer)
+    return b''.join(buffer)
+
+
+class _Unpacker:
+    """Decoder for the MessagePack subset produced by pack"""
+
+    _structs = {
+        0xcc: '>B', 0xcd: '>H', 0xce: '>I', 0xcf: '>Q',
+        0xd0: '>b', 0xd1: '>h', 0xd2: '>i', 0xd3: '>q',
+        0xd9: '>B', 0xda: '>H', 0xdb: '>I',
+        0xdc: '>H', 0xdd: '>I', 0xde: '>H', 0xdf: '>I',
+    }
+
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def read(self, size):
+        chunk = self.data[self.position:self.position + size]
+        if len(chunk) != size:
+            raise ValueError('Unexpected end of binary snapshot')
+        self.position += size
+        return chunk
+
+    def read_struct(self, code):
+        fmt = self._structs[code]
+        return struct.unpack(fmt, self.read(struct.calcsize(fmt)))[0]
+
+    def unpack(self):
+        code = self.read(1)[0]
+
+        if code < 0x80:
+            return code
+        elif code >= 0xe0:
+            return code - 0x100
+        elif code == 0xc0:
+            return None
+        elif code in (0xc2, 0xc3):
+            return code == 0xc3
+        elif 0xcc <= code <= 0xd3:
+            return self.read_struct(code)
+        elif 0xa0 <= code <= 0xbf or code in (0xd9, 0xda, 0xdb):
+            length = code & 0x1f if code <= 0xbf else self.read_struct(code)
+            return bytes(self.read(length)).decode('utf-8')
+        elif 0x90 <= code <= 0x9f or code in (0xdc, 0xdd):
+            length = code & 0x0f if code <= 0x9f else self.read_struct(code)
+            return [self.unpack() for _ in range(length)]
+        elif 0x80 <= code <= 0x8f or code in (0xde, 0xdf):
+            length = code & 0x0f if code <= 0x8f else self.read_struct(code)
+            data = {}
+            for _ in range(length):
+                key = self.unpack()
+                data[key] = self.unpack()
+            return data
+
+        raise ValueError('Unsupported MessagePack type code {0:#x}'.format(code))
+
+
+def unpack(data):
+    """Decode MessagePack bytes produced by pack
+
+    :param data: Bytes to decode
+    :type data: bytes
+    """
+
+    unpacker = _Unpacker(data)
+    value = unpacker.unpack()
+    if unpacker.position != len(data):
+        raise ValueError('Unexpected trailing bytes in binary snapshot')
+    return value
@@ -0,0 +1,351 @@
+"""
+    create_python_project.sync
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement synchronization of a project with the boilerplate it has been created from
+
+    The upstream commit a project has been synchronized with is recorded in an ``Upstream-Commit`` trailer of the
+    contextualization and synchronization commit messages. Synchronizing diffs the upstream between this commit and
+    its new tip, applies the contextualization of the project (name, package, author and URL) to the changed blobs
+    only and merges them into the project
+
+    - files the project did not modify are replaced by the contextualized upstream version
+    - files both sides modified are merged with ``git merge-file`` (conflicts are left in the working tree)
+
+    A synchronization that is not committed right away (conflicts or ``commit=False``) is recorded in
+    ``.git/crpyproj-sync`` and its message, trailer included, is prepared in ``.git/MERGE_MSG`` so it is used by
+    ``git commit`` once conflicts are resolved (c.f. ProjectManager.continue_sync_upstream)
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+import os
+import re
+import stat
+import tempfile
+from collections import namedtuple
+
+from git import GitCommandError
+from git.util import hex_to_bin
+
+from .io import PrefetchedFileInput
+from .utils import prepare_publication
+
+# Trailer of commit messages recording the upstream commit a project has been synchronized with
+UPSTREAM_TRAILER = 'Upstream-Commit'
+UPSTREAM_TRAILER_PATTERN = re.compile(r'^{trailer}: (?P<sha>[0-9a-f]{{40}})$'.format(trailer=UPSTREAM_TRAILER),
+                                      re.MULTILINE)
+
+# File of the git directory recording a synchronization that has not been committed yet
+SYNC_STATE_FILE_NAME = 'crpyproj-sync'
+
+# Git modes of absent files and of regular files (other entries such as symlinks and submodules are not synced)
+NULL_MODE = '000000'
+REGULAR_FILE_MODES = ('100644', '100755')
+
+UpstreamChange = namedtuple('UpstreamChange', ['path', 'a_sha', 'b_sha', 'a_mode', 'b_mode'])
+UpstreamChange.__doc__ = """File that changed in the upstream between two commits
+
+:param path: Path of the file in the upstream
+:param a_sha: SHA of the old blob (None if the file has been added)
+:param b_sha: SHA of the new blob (None if the file has been removed)
+"""
+
+SyncChange = namedtuple('SyncChange', ['path', 'status'])
+SyncChange.__doc__ = """File of the project touched by a synchronization
+
+:param path: Path of the file in the project
+:param status: One of added, modified, removed, merged, conflict, unchanged (project already holds the upstream
+    version) or skipped (not a regular file)
+"""
+
+SyncState = namedtuple('SyncState', ['tip', 'message', 'conflicts'])
+SyncState.__doc__ = """Synchronization that has not been committed yet
+
+:param tip: SHA of the upstream commit the project is being synchronized with
+:param message: Message of the synchronization commit (Upstream-Commit trailer included)
+:param conflicts: Paths of the files with conflicts
+"""
+
+SyncedBlob = namedtuple('SyncedBlob', ['path', 'abspath'])
+SyncedBlob.__doc__ = """Project file an upstream blob is contextualized for (c.f. ProjectManager.get_transforms)"""
+
+
+def format_trailer(hexsha):
+    return '{trailer}: {sha}'.format(trailer=UPSTREAM_TRAILER, sha=hexsha)
+
+
+def find_origin_commit(repo, remote='origin'):
+    """Return SHA of the commit of a remote holding the same tree as HEAD (e.g. the boilerplate commit a project
+    has been cloned from, even if the project history has been reset)
+
+    :param repo: Repository
+    :type repo: git.Repo
+    :param remote: Name of the remote
+    :type remote: str
+    :return: Commit SHA or None if no remote reference holds the tree of HEAD
+    """
+
+    tree_sha = repo.head.commit.tree.hexsha
+    output = repo.git.for_each_ref('--format=%(objectname) %(tree)', 'refs/remotes/{remote}/'.format(remote=remote))
+    for line in output.splitlines():
+        commit_sha, ref_tree_sha = line.split(' ')
+        if ref_tree_sha == tree_sha:
+            return commit_sha
+    return None
+
+
+def find_recorded_commit(repo, rev='HEAD'):
+    """Return SHA of the upstream commit of the last Upstream-Commit trailer of the project history
+
+    :return: Commit SHA or None if no commit of the project history has an Upstream-Commit trailer
+    """
+
+    message = repo.git.log('-1', '--format=%B', '--extended-regexp',
+                           '--grep=^{trailer}: [0-9a-f]{{40}}$'.format(trailer=UPSTREAM_TRAILER), rev)
+    match = UPSTREAM_TRAILER_PATTERN.search(message)
+    return match.group('sha') if match is not None else None
+
+
+def find_synced_commit(repo, upstream_rev, rev='HEAD'):
+    """Return SHA of the last upstream commit a project has been synchronized with
+
+    It is read from the last Upstream-Commit trailer of the project history or else is the merge base of the project
+    and the upstream (projects which history has not been reset)
+
+    :param repo: Repository of the project
+    :type repo: git.Repo
+    :param upstream_rev: Upstream revision
+    :type upstream_rev: str
+    :param rev: Project revision
+    :type rev: str
+    :return: Commit SHA or None if it can not be found
+    """
+
+    recorded_commit = find_recorded_commit(repo, rev=rev)
+    if recorded_commit is not None:
+        return recorded_commit
+
+    merge_bases = repo.merge_base(rev, upstream_rev)
+    return merge_bases[0].hexsha if merge_bases else None
+
+
+def read_sync_state(repo):
+    """Return the synchronization of a project that has not been committed yet
+
+    :rtype: SyncState or None
+    """
+
+    try:
+        with open(os.path.join(repo.git_dir, SYNC_STATE_FILE_NAME)) as file:
+            return SyncState(**json.load(file))
+    except FileNotFoundError:
+        return None
+
+
+def write_sync_state(repo, state):
+    """Record a synchronization that has not been committed and prepare its message for git commit
+
+    :type state: SyncState
+    """
+
+    with open(os.path.join(repo.git_dir, SYNC_STATE_FILE_NAME), 'w') as file:
+        json.dump(state._asdict(), file)
+    with open(os.path.join(repo.git_dir, 'MERGE_MSG'), 'w') as file:
+        file.write(state.message + '\n')
+
+
+def clear_sync_state(repo):
+    """Forget the synchronization that has not been committed (the message of a git merge in progress is kept)"""
+
+    names = [SYNC_STATE_FILE_NAME]
+    if not os.path.exists(os.path.join(repo.git_dir, 'MERGE_HEAD')):
+        names.append('MERGE_MSG')
+    for name in names:
+        try:
+            os.remove(os.path.join(repo.git_dir, name))
+        except FileNotFoundError:
+            pass
+
+
+def iter_upstream_changes(repo, base, tip):
+    """Stream files that changed in the upstream between two commits from a single git diff-tree call
+
+    Renamed files are reported as a removed file and an added file
+
+    :param repo: Repository holding the upstream commits
+    :type repo: git.Repo
+    :param base: Old upstream commit
+    :type base: str
+    :param tip: New upstream commit
+    :type tip: str
+    :return: Iterator over UpstreamChange
+    """
+
+    fields = repo.git.diff_tree('-r', '-z', '--no-renames', base, tip).split('\0')
+    for meta, path in zip(fields[0::2], fields[1::2]):
+        a_mode, b_mode, a_sha, b_sha = meta.lstrip(':').split(' ')[:4]
+        yield UpstreamChange(path,
+                             a_sha if a_mode != NULL_MODE else None,
+                             b_sha if b_mode != NULL_MODE else None,
+                             a_mode, b_mode)
+
+
+def map_path(path, old_package, new_package):
+    """Map the path of an upstream file to the project (the package folder of the project may have been renamed)"""
+
+    if old_package and (path == old_package or path.startswith(old_package + '/')):
+        return new_package + path[len(old_package):]
+    return path
+
+
+def read_blob(repo, hexsha):
+    return repo.odb.stream(hex_to_bin(hexsha)).read() if hexsha is not None else None
+
+
+def contextualize_data(repo, requests, path, data):
+    """Apply the contextualization of a project to the content of an upstream blob
+
+    :param repo: Project
+    :type repo: ProjectManager
+    :param requests: Prepared publication requests of the contextualization (c.f. ProjectManager.prepare_requests)
+    :type requests: list
+    :param path: Path of the file in the project
+    :type path: str
+    :param data: Content of the upstream blob (binary content is returned as is)
+    :type data: bytes
+    :rtype: bytes
+    """
+
+    if data is None or b'\0' in data:
+        return data
+
+    blob = SyncedBlob(path, os.path.join(repo.working_dir, path))
+    transforms = repo.get_transforms(requests, blob)
+    if not transforms:
+        return data
+
+    source = PrefetchedFileInput(data.decode('utf-8', 'surrogateescape'), blob.abspath)
+    script = prepare_publication(blob, transforms, source=source, cache=repo.transform_cache)
+    return script.content.output().encode('utf-8', 'surrogateescape')
+
+
+def merge_data(repo, current, base, other):
+    """Merge three versions of a file with git merge-file
+
+    :return: Tuple (merged content with conflict markers if any, whether or not there are conflicts)
+    """
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for name, data in [('project', current), ('base', base), ('upstream', other)]:
+            paths.append(os.path.join(tmp_dir, name))
+            with open(paths[-1], 'wb') as file:
+                file.write(data)
+
+        # Merge result is written to the first file
+        status, _, error = repo.git.merge_file('-L', 'project', '-L', 'base', '-L', 'upstream', *paths,
+                                               with_extended_output=True, with_exceptions=False)
+        if status < 0 or status > 127:  # git merge-file returns the number of conflicts or a negative value on error
+            raise GitCommandError(['git', 'merge-file'], status, error)
+
+        with open(paths[0], 'rb') as file:
+            return file.read(), status > 0
+
+
+def has_conflict_markers(path):
+    """Return whether or not a file holds conflict markers written by merge_data"""
+
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as file:
+        return re.search(b'^<<<<<<< project$', file.read(), re.MULTILINE) is not None
+
+
+def sync_file(repo, requests, path, change):
+    """Compute the new content of a project file from an upstream change
+
+    :return: Tuple (status, content to write or None if the file is not to be written)
+    """
+
+    abspath = os.path.join(repo.working_dir, path)
+    current = None
+    if os.path.isfile(abspath):
+        with open(abspath, 'rb') as file:
+            current = file.read()
+
+    old = contextualize_data(repo, requests, path, read_blob(repo, change.a_sha))
+    new = contextualize_data(repo, requests, path, read_blob(repo, change.b_sha))
+
+    if current == new:
+        return 'unchanged', None
+
+    if current == old:  # project did not modify the file
+        if new is None:
+            return 'removed', None
+        return 'added' if old is None else 'modified', new
+
+    if current is None or new is None:  # file modified on one side and removed on the other
+        return 'conflict', None
+
+    merged, has_conflicts = merge_data(repo, current, old or b'', new)
+    return 'conflict' if has_conflicts else 'merged', merged
+
+
+def apply_upstream_changes(repo, requests, base, tip, old_package=None, new_package=None):
+    """Apply the upstream changes between two commits to the working tree of a project
+
+    Only changed blobs are read and contextualized. Written files are staged and removed files are removed from the
+    index (conflicting files are left unstaged)
+
+    :param repo: Project
+    :type repo: ProjectManager
+    :param requests: Prepared publication requests of the contextualization (c.f. ProjectManager.prepare_requests)
+    :type requests: list
+    :param base: Upstream commit the project has last been synchronized with
+    :type base: str
+    :param tip: Upstream commit to synchronize the project with
+    :type tip: str
+    :param old_package: Name of the package folder in the upstream
+    :type old_package: str
+    :param new_package: Name of the package folder in the project
+    :type new_package: str
+    :return: List of SyncChange
+    """
+
+    changes, written, removed, executables = [], [], [], []
+    with repo.write_batch() as batch:
+        for change in iter_upstream_changes(repo, base, tip):
+            path = map_path(change.path, old_package, new_package)
+            if not {change.a_mode, change.b_mode} <= set(REGULAR_FILE_MODES + (NULL_MODE,)):
+                changes.append(SyncChange(path, 'skipped'))
+                continue
+
+            status, data = sync_file(repo, requests, path, change)
+            if data is not None:
+                abspath = os.path.join(repo.working_dir, path)
+                if not os.path.exists(abspath) and change.b_mode == '100755':
+                    executables.append(abspath)
+                os.makedirs(os.path.dirname(abspath), exist_ok=True)
+                batch.write(abspath, data.decode('utf-8', 'surrogateescape'), encoding='utf-8',
+                            errors='surrogateescape')
+                if status != 'conflict':
+                    written.append(path)
+            elif status == 'removed':
+                removed.append(path)
+            changes.append(SyncChange(path, status))
+
+    # Created files are given the default mode of new files, executable upstream files are made executable by whoever
+    # can read them
+    for abspath in executables:
+        mode = stat.S_IMODE(os.stat(abspath).st_mode)
+        os.chmod(abspath, mode | (mode & 0o444) >> 2)
+
+    if written:
+        repo.git.add('--', *written)
+    if removed:
+        repo.git.rm('-q', '--', *removed)
+
+    return changes
@@ -0,0 +1,154 @@
+"""
+    create_python_project.tags
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement listing of tags from a single ``git for-each-ref`` call
+
+    Tags are returned as lightweight records so listing them does not read any tag or commit object. They can be
+    ordered by creation date (most recent first) or by PEP 440 version (highest first).
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import re
+from collections import namedtuple
+
+TagRecord = namedtuple('TagRecord', ['name', 'hexsha', 'commit_hexsha', 'created', 'annotated'])
+TagRecord.__doc__ = """Lightweight record of a tag
+
+:param name: Name of the tag (e.g. v1.0.0)
+:param hexsha: SHA of the tag reference object (tag object for annotated tags, commit otherwise)
+:param commit_hexsha: SHA of the tagged commit
+:param created: Creation date of the tag (tagger date for annotated tags, committer date otherwise) as a timestamp
+:param annotated: Whether or not the tag is an annotated tag
+"""
+
+# Orders tags can be listed in
+TAG_ORDERS = ('date', 'version')
+
+TAGS_REF = 'refs/tags/'
+
+# Format of for-each-ref records (%(*objectname) is the peeled commit of annotated tags)
+FOR_EACH_REF_FORMAT = '%(refname)%00%(objectname)%00%(*objectname)%00%(creatordate:raw)'
+
+# Version pattern as specified in PEP 440 (Appendix B), a leading 'v' is accepted as for normalized versions
+VERSION_PATTERN = re.compile(r"""
+    ^\s*v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>a|b|c|rc|alpha|beta|pre|preview)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    \s*$
+""", re.VERBOSE | re.IGNORECASE)
+
+# Normalized pre-release labels
+PRE_RELEASE_LABELS = {'a': 'a', 'alpha': 'a', 'b': 'b', 'beta': 'b', 'c': 'rc', 'rc': 'rc', 'pre': 'rc',
+                      'preview': 'rc'}
+
+# Sort keys lower and higher than any value of a version segment
+_LOWEST, _HIGHEST = (0,), (2,)
+
+
+def _get_local_key(local):
+    # Numeric segments of local versions sort after alphanumeric ones
+    return tuple((1, int(part), '') if part.isdigit() else (0, 0, part.lower()) for part in re.split(r'[-_.]', local))
+
+
+def get_version_key(version):
+    """Return a key sorting versions as specified in PEP 440
+
+    :param version: Version (e.g. 1.0.0rc1 or v1.0.0)
+    :type version: str
+    :return: Sort key or None if version is not a valid PEP 440 version
+    :rtype: tuple
+    """
+
+    match = VERSION_PATTERN.match(version)
+    if match is None:
+        return None
+
+    release = [int(part) for part in match.group('release').split('.')]
+    while len(release) > 1 and release[-1] == 0:  # 1.0 == 1.0.0
+        release.pop()
+
+    if match.group('pre'):
+        pre = (1, PRE_RELEASE_LABELS[match.group('pre_l').lower()], int(match.group('pre_n') or 0))
+    elif not match.group('post') and match.group('dev'):
+        pre = _LOWEST  # 1.0.dev0 < 1.0a0
+    else:
+        pre = _HIGHEST
+
+    if match.group('post'):
+        post = (1, int(match.group('post_n1') or match.group('post_n2') or 0))
+    else:
+        post = _LOWEST
+
+    dev = (1, int(match.group('dev_n') or 0)) if match.group('dev') else _HIGHEST
+
+    local = (1, _get_local_key(match.group('local'))) if match.group('local') else _LOWEST
+
+    return int(match.group('epoch') or 0), tuple(release), pre, post, dev, local
+
+
+def parse_tag_records(output):
+    """Parse the output of `git for-each-ref` with FOR_EACH_REF_FORMAT
+
+    :rtype: list
+    """
+
+    records = []
+    for line in output.splitlines():
+        if not line:
+            continue
+
+        refname, hexsha, peeled_hexsha, created = line.split('\0')
+        records.append(TagRecord(name=refname[len(TAGS_REF):] if refname.startswith(TAGS_REF) else refname,
+                                 hexsha=hexsha,
+                                 commit_hexsha=peeled_hexsha or hexsha,
+                                 created=int(created.split()[0]) if created else 0,
+                                 annotated=bool(peeled_hexsha)))
+    return records
+
+
+def _get_record_version_key(record):
+    # Tags that are not versions come after versions (in decreasing order)
+    key = get_version_key(record.name)
+    return (0,) if key is None else (1, key)
+
+
+def list_tags(repo, order='date', offset=0, limit=None):
+    """List tags of a repository
+
+    :param repo: Repository to list tags of
+    :type repo: git.Repo
+    :param order: 'date' to list most recently created tags first or 'version' to list highest PEP 440 versions
+        first (tags that are not versions are listed last, most recent first)
+    :type order: str
+    :param offset: Number of tags to skip
+    :type offset: int
+    :param limit: Optional maximum number of tags to return
+    :type limit: int
+    :rtype: list
+    """
+
+    assert order in TAG_ORDERS, 'Tag orders are {orders} but you passed {order}'.format(orders=TAG_ORDERS,
+                                                                                        order=order)
+    assert offset >= 0, 'offset must be positive but you passed {0}'.format(offset)
+
+    if limit == 0:
+        return []
+
+    args = ['--sort=-creatordate', '--format={0}'.format(FOR_EACH_REF_FORMAT)]
+    if order == 'date' and limit is not None:
+        # Only the requested page is output by git
+        args.append('--count={0}'.format(offset + limit))
+
+    records = parse_tag_records(repo.git.for_each_ref(*args, TAGS_REF))
+
+    if order == 'version':
+        records.sort(key=_get_record_version_key, reverse=True)
+
+    return records[offset:None if limit is None else offset + limit]
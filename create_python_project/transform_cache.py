@@ -0,0 +1,165 @@
+"""
+    create_python_project.transform_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a content-addressed cache of script transformations shared by projects
+
+    Results of transformations are keyed by the git blob SHA of the script content and a stable hash of the
+    transformations (script class and transformation keyword arguments). Outputs are stored once per output blob
+    SHA. Files that are identical across projects (e.g. LICENSE.rst, Makefile, tox.ini) are then parsed and
+    transformed once and the output is reused by every other project
+
+        manager.transform_cache = TransformCache()
+        manager.set_project_author(author_email='team@example.com')
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import zlib
+
+from . import __version__
+from .config import get_cache_dir
+from .pyutils import lazy_import
+
+json = lazy_import('json')
+serialization = lazy_import('.serialization', __package__)
+
+# Version of the cache keys (to be bumped when transformations outputs change for identical arguments)
+TRANSFORM_CACHE_VERSION = 1
+
+# Name of the cache file
+CACHE_FILE_NAME = 'transforms.sqlite'
+
+
+def get_default_cache_path():
+    """Return default path of the transform cache"""
+
+    return os.path.join(get_cache_dir(), CACHE_FILE_NAME)
+
+
+def get_blob_sha(text):
+    """Return the git blob SHA of a text (as git hash-object would compute it for its UTF-8 encoding)
+
+    :param text: Content of the blob
+    :type text: str
+    :rtype: str
+    """
+
+    data = text.encode('utf-8', 'surrogateescape')
+    return hashlib.sha1(b'blob ' + str(len(data)).encode('ascii') + b'\0' + data).hexdigest()
+
+
+def get_transform_signature(script_class, transforms):
+    """Return a stable hash of transformations of a script
+
+    :param script_class: Class of the script the transformations are applied to
+    :type script_class: type
+    :param transforms: List of keyword arguments of each transformation (c.f. BaseScript.apply_transform)
+    :type transforms: list
+    :return: Signature or None if transformations can not be hashed (e.g. arguments are functions)
+    :rtype: str
+    """
+
+    try:
+        data = json.dumps([TRANSFORM_CACHE_VERSION, __version__, script_class.__name__,
+                           [{kw: serialization.dump_value(arg) for kw, arg in transform_kwargs.items()}
+                            for transform_kwargs in transforms]],
+                          sort_keys=True, separators=(',', ':'))
+    except TypeError:
+        return None
+
+    return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+
+class TransformCache:
+    """Persistent cache of transformation outputs
+
+    It can be shared by threads and by processes publishing distinct projects
+
+    :param path: Optional path of the cache file (c.f. get_default_cache_path)
+    :type path: str
+    """
+
+    SCHEMA = [
+        'CREATE TABLE IF NOT EXISTS transforms (input_sha TEXT, signature TEXT, output_sha TEXT, '
+        'PRIMARY KEY (input_sha, signature))',
+        'CREATE TABLE IF NOT EXISTS blobs (sha TEXT PRIMARY KEY, data BLOB)',
+    ]
+
+    def __init__(self, path=None):
+        self.path = path or get_default_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self.connection:
+            for statement in self.SCHEMA:
+                self.connection.execute(statement)
+
+    def close(self):
+        self.connection.close()
+
+    def get(self, input_sha, signature):
+        """Return the output of transformations of a blob or None if it is not cached"""
+
+        with self._lock:
+            row = self.connection.execute('SELECT blobs.data FROM transforms JOIN blobs ON blobs.sha = output_sha '
+                                          'WHERE input_sha = ? AND signature = ?', (input_sha, signature)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+        return zlib.decompress(row[0]).decode('utf-8', 'surrogateescape')
+
+    def set(self, input_sha, signature, output):
+        """Store the output of transformations of a blob"""
+
+        output_sha = get_blob_sha(output)
+        data = zlib.compress(output.encode('utf-8', 'surrogateescape'))
+        with self._lock, self.connection:
+            self.connection.execute('INSERT OR IGNORE INTO blobs (sha, data) VALUES (?, ?)', (output_sha, data))
+            self.connection.execute('INSERT OR REPLACE INTO transforms (input_sha, signature, output_sha) '
+                                    'VALUES (?, ?, ?)', (input_sha, signature, output_sha))
+
+    def get_key(self, script, transforms):
+        """Return the cache key of transformations of a script that has not been read yet
+
+        :param script: Script to be transformed
+        :type script: BaseScript
+        :param transforms: List of keyword arguments of each transformation
+        :type transforms: list
+        :return: Tuple (input_sha, signature) or None if transformations can not be cached
+        """
+
+        signature = get_transform_signature(type(script), transforms)
+        if signature is None:
+            return None
+        return get_blob_sha(script.source.read()), signature
+
+    def load(self, script, key):
+        """Load the cached output of transformations into a script
+
+        :return: Whether or not the output was cached
+        :rtype: bool
+        """
+
+        output = self.get(*key)
+        if output is None:
+            return False
+
+        script.load_output(script.source.read(), output)
+        return True
+
+    def store(self, script, key):
+        """Store the output of a transformed script"""
+
+        self.set(key[0], key[1], script.content.output())
@@ -0,0 +1,144 @@
+"""
+    create_python_project.tree
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Implement a flat index of the blobs of a git tree
+
+    The index is built from a single ``git ls-tree -r -l`` call so walking a tree does not decode tree objects one
+    by one. Paths, modes, SHAs, sizes and script classes of the blobs are stored in parallel arrays.
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import binascii
+import os
+from array import array
+from collections import namedtuple
+
+from git import Blob
+
+from .scripts import get_script_class
+from .utils import is_matching_path
+
+TreeEntry = namedtuple('TreeEntry', ['path', 'mode', 'hexsha', 'size', 'script_class'])
+
+# Length of a binary SHA-1
+BINSHA_LENGTH = 20
+
+
+class TreeIndex:
+    """Flat index of the blobs of a git tree (sorted by path)
+
+    :param repo: Repository the tree belongs to
+    :type repo: git.Repo
+    :param rev: Optional revision or tree SHA to index
+    :type rev: str
+    """
+
+    def __init__(self, repo, rev='HEAD'):
+        self.repo = repo
+        self.rev = rev
+
+        self.paths = []
+        self.modes = array('L')
+        self.binshas = bytearray()
+        self.sizes = array('q')
+        self.script_class_ids = array('B')
+
+        # Distinct script classes referenced by script_class_ids
+        self.script_classes = []
+
+        self.load(repo.git.ls_tree('-r', '-l', '-z', rev))
+
+    def load(self, ls_tree_output):
+        """Load entries from the output of `git ls-tree -r -l -z`"""
+
+        script_class_ids = {}
+        for record in ls_tree_output.split('\0'):
+            if not record:
+                continue
+
+            meta, path = record.split('\t', 1)
+            mode, object_type, hexsha, size = meta.split()
+            if object_type != 'blob':  # e.g. submodules
+                continue
+
+            script_class = get_script_class(path)
+            if script_class not in script_class_ids:
+                script_class_ids[script_class] = len(self.script_classes)
+                self.script_classes.append(script_class)
+
+            self.paths.append(path)
+            self.modes.append(int(mode, 8))
+            self.binshas.extend(binascii.unhexlify(hexsha))
+            self.sizes.append(int(size))
+            self.script_class_ids.append(script_class_ids[script_class])
+
+    def __len__(self):
+        return len(self.paths)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.get_entry(i)
+
+    def get_binsha(self, i):
+        return bytes(self.binshas[i * BINSHA_LENGTH:(i + 1) * BINSHA_LENGTH])
+
+    def get_script_class(self, i):
+        return self.script_classes[self.script_class_ids[i]]
+
+    def get_entry(self, i):
+        """Return the i-th entry of the index
+
+        :rtype: TreeEntry
+        """
+
+        return TreeEntry(self.paths[i], self.modes[i], binascii.hexlify(self.get_binsha(i)).decode('ascii'),
+                         self.sizes[i], self.get_script_class(i))
+
+    def get_blob(self, i):
+        """Return the i-th blob of the index (its size is set from the index so it does not need to be read)"""
+
+        blob = Blob(self.repo, self.get_binsha(i), mode=self.modes[i], path=self.paths[i])
+        blob.size = self.sizes[i]
+        return blob
+
+    def iter_indices(self, is_filtered=None, max_size=None):
+        """Iterate over indices of the entries
+
+        :param is_filtered: Optional filter as in RepositoryManager.iter_blobs. Path patterns are evaluated
+            from the index, filtering functions receive blobs.
+        :param max_size: Optional maximum size of the blobs (e.g. to skip large binary files)
+        :type max_size: int
+        """
+
+        if isinstance(is_filtered, str):
+            is_filtered = [is_filtered]
+
+        # Path patterns are evaluated on paths of the index
+        patterns = is_filtered if isinstance(is_filtered, list) else None
+
+        for i, path in enumerate(self.paths):
+            if max_size is not None and self.sizes[i] > max_size:
+                continue
+            if patterns is not None and not is_matching_path(patterns, path):
+                continue
+            if callable(is_filtered) and not is_filtered(self.get_blob(i)):
+                continue
+            yield i
+
+    def iter_blobs(self, is_filtered=None, max_size=None):
+        """Iterate over blobs (c.f. iter_indices for arguments)"""
+
+        for i in self.iter_indices(is_filtered=is_filtered, max_size=max_size):
+            yield self.get_blob(i)
+
+    def iter_scripts(self, is_filtered=None, max_size=None):
+        """Iterate over script objects dispatched from the script classes of the index
+
+        (c.f. iter_indices for arguments)
+        """
+
+        for i in self.iter_indices(is_filtered=is_filtered, max_size=max_size):
+            yield self.get_script_class(i)(source=os.path.join(self.repo.working_tree_dir, self.paths[i]))
@@ -11,8 +11,14 @@
 import fnmatch
 import re
 from collections import OrderedDict
+from functools import partial
 
-from .scripts import get_script_class
+from .pyutils import lazy_import
+
+# scripts depend on docutils and yaml so they are only imported when scripts are manipulated
+docutils_io = lazy_import('docutils.io')
+scripts = lazy_import('.scripts', __package__)
+io = lazy_import('.io', __package__)
 
 
 def get_script(blob):
@@ -21,7 +27,7 @@ def get_script(blob):
     :param blob: Blob to get a script from
     :type blob:
     """
-    return get_script_class(blob.path)(source=blob.abspath)
+    return scripts.get_script_class(blob.path)(source=blob.abspath)
 
 
 def read(blob):
@@ -44,18 +50,120 @@ def get_info(blob):
     return read(blob).content.info
 
 
+def get_stored_info(blob):
+    """Get script info from the blob content stored in git database (rather than from the working tree)
+
+    :param blob: Blob to get a info from
+    :type blob:
+    """
+    source = docutils_io.StringInput(blob.data_stream.read().decode('utf-8'))
+    script = scripts.get_script_class(blob.path)(source=source)
+    script.read()
+    return script.content.info
+
+
 def publish(blob, *args, **kwargs):
     """Publish a blob
 
+    Destination is not written when publication is identical to the blob content
+
     :param blob: Blob to publish
     :type blob:
+    :param changed_paths: Optional list the blob's path is appended to when its file has been modified
+    :type changed_paths: list
     """
+    changed_paths = kwargs.pop('changed_paths', None)
     script = read(blob)
     script.set_destination(destination=kwargs.pop('destination', blob.abspath))
     publication = script.publish(*args, **kwargs)
+    _report_change(script, blob, changed_paths)
     return publication
 
 
+def prefetch(blob):
+    """Read the file of a blob ahead of parsing it
+
+    :param blob: Blob to read
+    :type blob:
+    :rtype: PrefetchedFileInput
+    """
+    return io.PrefetchedFileInput(docutils_io.FileInput(source_path=blob.abspath).read(), blob.abspath)
+
+
+def prepare_publication(blob, transforms, source=None, cache=None, **kwargs):
+    """Read a blob and apply transformations without writing it
+
+    :param blob: Blob to read
+    :type blob:
+    :param transforms: List of keyword arguments of each transformation (c.f. BaseScript.apply_transform)
+    :type transforms: list
+    :param source: Optional prefetched source of the blob (c.f. prefetch)
+    :param cache: Optional cache of transformation outputs, the blob is not parsed if its output is cached
+    :type cache: TransformCache
+    :return: Script ready to be written
+    """
+    if cache is not None and source is None:
+        source = prefetch(blob)
+
+    script = scripts.get_script_class(blob.path)(source=source or blob.abspath)
+    key = cache.get_key(script, transforms) if cache is not None else None
+    if key is None or not cache.load(script, key):
+        script.read()
+        for transform_kwargs in transforms:
+            script.apply_transform(**transform_kwargs)
+        if key is not None:
+            cache.store(script, key)
+
+    script.set_destination(destination=kwargs.pop('destination', blob.abspath))
+    return script
+
+
+def _report_change(script, blob, changed_paths):
+    if changed_paths is not None and script.changed:
+        changed_paths.append(blob.path)
+
+
+# Pairs of transformation keyword arguments (old, new) that only have effect when both values are str that differ
+REPLACEMENT_KWARGS = [
+    ('old_value', 'new_value'),
+    ('old_import', 'new_import'),
+]
+
+
+def is_noop_transform(kwargs):
+    """Evaluates if transformation keyword arguments are certain not to modify any script
+
+    It allows to skip reading and parsing scripts for transformations that would do nothing
+
+    :param kwargs: Transformation keyword arguments (c.f. BaseScript.apply_transform)
+    :type kwargs: dict
+    :rtype: bool
+    """
+    kwargs = dict(kwargs)
+    for old_kw, new_kw in REPLACEMENT_KWARGS:
+        old_arg, new_arg = kwargs.pop(old_kw, None), kwargs.pop(new_kw, None)
+        if callable(old_arg) or callable(new_arg) or \
+                (isinstance(old_arg, str) and isinstance(new_arg, str) and old_arg != new_arg):
+            return False
+
+    # Info are not updated with None values
+    return all([arg is None for arg in kwargs.values()])
+
+
+def make_filter(is_filtered):
+    """Return a function taking a blob as argument and evaluating if it should be filtered
+
+    :param is_filtered: Function, path pattern in .gitignore format or list of path patterns
+    """
+    if isinstance(is_filtered, str):
+        is_filtered = [is_filtered]
+
+    if isinstance(is_filtered, list):
+        is_filtered = partial(is_matching, is_filtered)
+
+    return is_filtered
+
+
 def is_matching(patterns, blob):
     """Tests if a blob's path and a str path are the same
 
@@ -67,8 +175,14 @@ def is_matching(patterns, blob):
     :type blob:
     :rtype: bool
     """
+    return is_matching_path(patterns, blob.path)
+
+
+def is_matching_path(patterns, path):
+    """Tests if a path matches any of path patterns (c.f. is_matching)"""
+
     for pattern in patterns:
-        if re.match(fnmatch.translate(pattern), blob.path):
+        if re.match(fnmatch.translate(pattern), path):
             return True
     return False
 
@@ -101,7 +215,12 @@ URL_FORMATS = {
 }
 
 
+FILE_URL_PATTERN = re.compile('file://(?P<path>.+)')
+
+
 def is_git_url(url):
+    if FILE_URL_PATTERN.match(url):
+        return True
     for format in ['https+git', 'ssh', 'git']:
         if URL_PATTERNS[format].match(url):
             return True
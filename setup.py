@@ -66,5 +66,6 @@ setup(
     entry_points='''
         [console_scripts]
         create-python-project=create_python_project.cli:cli
+        crpyproj=create_python_project.cli:cli
     '''
 )
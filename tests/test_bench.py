@@ -0,0 +1,105 @@
+"""
+    tests.test_bench
+    ~~~~~~~~~~~~~~~~
+
+    Test benchmark suite
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+
+from click.testing import CliRunner
+from git import Repo
+
+from create_python_project.bench import BENCHMARKS, generate_repo, get_file_counts, run_benchmark, run_suite, \
+    compare_results, save_results
+from create_python_project.cli import cli
+
+
+def test_get_file_counts():
+    assert list(get_file_counts(10).values()) == [5, 2, 1, 1, 1]
+    assert list(get_file_counts(1000).values()) == [500, 200, 100, 100, 100]
+
+    # Counts never drop below base files
+    assert list(get_file_counts(5).values()) == [2, 1, 1, 1, 0]
+
+
+def test_generate_repo(tmpdir):
+    manager = generate_repo(str(tmpdir.join('repo')), py=12, rst=3, yml=2, ini=2, binary=3, binary_size=64)
+
+    paths = manager.get_tree_index().paths
+    assert len(paths) == 22
+    assert len([path for path in paths if path.endswith('.py')]) == 12
+    assert len([path for path in paths if path.endswith('.bin')]) == 3
+    assert not manager.is_dirty(untracked_files=True)
+
+    assert manager.setup_info.name.value == 'Synthetic-Project'
+    assert manager.get_info(is_filtered='synthetic_project/__init__.py')[0].docstring.title.text == \
+        'synthetic_project'
+    assert manager.get_blob('static/image_0/image_0.bin').size == 64
+
+
+def test_run_benchmark(tmpdir):
+    manager = generate_repo(str(tmpdir.join('repo')), **get_file_counts(10))
+    initial_commit = manager.head.commit
+
+    for name in BENCHMARKS:
+        timings = run_benchmark(name, manager, repeat=2)
+        assert len(timings['times']) == 2
+        assert 0 < timings['min'] <= timings['median'] <= timings['max']
+
+        # Repository is reset after each run
+        assert manager.head.commit == initial_commit
+        assert not manager.is_dirty(untracked_files=True)
+
+
+def test_run_suite_on_repo(tmpdir):
+    path = str(tmpdir.join('repo'))
+    initial_commit = generate_repo(path, **get_file_counts(10)).head.commit.hexsha
+
+    results = run_suite(repo_path=path, benchmarks=['setup_info', 'set_project_name'], repeat=1)
+    assert [(result['benchmark'], result['files']) for result in results['results']] == \
+        [('setup_info', 10), ('set_project_name', 10)]
+    assert results['results'][0]['repo'] == path
+
+    # Benchmarks ran on a clone
+    assert Repo(path).head.commit.hexsha == initial_commit
+
+
+def test_compare_results():
+    old_results = {'results': [{'benchmark': 'get_info', 'files': 10, 'min': 1.0},
+                               {'benchmark': 'new', 'files': 10, 'min': 2.0}]}
+    new_results = {'results': [{'benchmark': 'get_info', 'files': 10, 'min': 1.05},
+                               {'benchmark': 'new', 'files': 10, 'min': 3.0},
+                               {'benchmark': 'new', 'files': 1000, 'min': 3.0}]}
+
+    assert compare_results(old_results, new_results) == [
+        ('get_info', 10, 1.0, 1.05, 1.05, False),
+        ('new', 10, 2.0, 3.0, 1.5, True),
+    ]
+
+
+def test_bench_command(tmpdir):
+    output, reference = str(tmpdir.join('bench.json')), str(tmpdir.join('reference.json'))
+    save_results({'results': [{'benchmark': 'setup_info', 'files': 10, 'min': 1000.0}]}, reference)
+
+    result = CliRunner().invoke(cli, ['bench', '-n', '10', '-k', 'setup_info', '--repeat', '1',
+                                      '--output', output, '--compare', reference])
+    assert result.exit_code == 0
+    assert 'setup_info' in result.output
+
+    with open(output) as file:
+        results = json.load(file)
+    assert [(result['benchmark'], result['files']) for result in results['results']] == [('setup_info', 10)]
+
+    # Regressions make the command fail
+    save_results({'results': [{'benchmark': 'setup_info', 'files': 10, 'min': 1e-9}]}, reference)
+    result = CliRunner().invoke(cli, ['bench', '-n', '10', '-k', 'setup_info', '--repeat', '1',
+                                      '--compare', reference])
+    assert result.exit_code == 1
+    assert 'regression' in result.output
+
+    result = CliRunner().invoke(cli, ['bench', '-k', 'unknown'])
+    assert result.exit_code == 1
@@ -0,0 +1,75 @@
+"""
+    tests.test_cache
+    ~~~~~~~~~~~~~~~~
+
+    Test boilerplate cache
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+
+from git import Repo
+
+from create_python_project.cache import BoilerplateCache
+
+
+def test_cache_clone(repo, tmpdir, mocker):
+    url = 'file://{path}'.format(path=repo.working_dir)
+    cache = BoilerplateCache(str(tmpdir.join('cache')))
+    fetch = mocker.spy(cache, 'fetch')
+
+    manager = cache.clone(url, str(tmpdir.join('project-1')))
+    mirror_path = cache.get_mirror_path(url)
+    assert os.path.isfile(os.path.join(mirror_path, 'HEAD'))
+    assert list(manager.remotes['origin'].urls) == [url]
+    assert manager.head.commit.hexsha == repo.head.commit.hexsha
+    assert manager.setup_info.name.value == 'Boilerplate-Python'
+    assert fetch.call_count == 0
+
+    # Mirror is fresh so it is not fetched again
+    cache.clone(url, str(tmpdir.join('project-2')))
+    assert fetch.call_count == 0
+
+    # Stale mirror is fetched
+    cache.ttl = 0
+    repo.git.commit('--allow-empty', '-m', 'new commit')
+    manager = cache.clone(url, str(tmpdir.join('project-3')))
+    assert fetch.call_count == 1
+    assert manager.head.commit.hexsha == repo.head.commit.hexsha
+
+
+def test_cache_offline(repo, tmpdir):
+    url = 'file://{path}'.format(path=repo.working_dir)
+    cache = BoilerplateCache(str(tmpdir.join('cache')), ttl=0)
+    cache.update(url)
+
+    # Make boilerplate unreachable
+    Repo(cache.get_mirror_path(url)).git.remote('set-url', 'origin', str(tmpdir.join('unreachable')))
+    assert not cache.fetch(cache.get_mirror_path(url))
+
+    manager = cache.clone(url, str(tmpdir.join('project')))
+    assert manager.head.commit.hexsha == repo.head.commit.hexsha
+
+
+def test_mirror_path(tmpdir):
+    cache = BoilerplateCache(str(tmpdir))
+    path = cache.get_mirror_path('git@github.com:nmvalera/boilerplate-python.git')
+    assert os.path.dirname(path) == str(tmpdir)
+    assert os.path.basename(path).startswith('boilerplate-python-')
+    assert path != cache.get_mirror_path('https://github.com/nmvalera/boilerplate-python.git')
+
+
+def test_cache_shallow_clone(repo, tmpdir):
+    url = 'file://{path}'.format(path=repo.working_dir)
+    cache = BoilerplateCache(str(tmpdir.join('cache')))
+
+    manager = cache.clone(url, str(tmpdir.join('project')), depth=1, filter='blob:none')
+    assert len(manager.get_commits()) == 1
+    assert manager.head.commit.hexsha == repo.head.commit.hexsha
+
+
+def test_default_cache_dir(tmpdir, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmpdir))
+    assert BoilerplateCache().path == str(tmpdir.join('crpyproj', 'boilerplates'))
@@ -0,0 +1,88 @@
+"""
+    tests.test_catalog
+    ~~~~~~~~~~~~~~~~~~
+
+    Test catalog of project metadata
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+
+from click.testing import CliRunner
+
+from create_python_project import catalog
+from create_python_project.bench import generate_repo
+from create_python_project.catalog import Catalog
+from create_python_project.cli import cli
+from create_python_project.info import InitInfo, SetupKwargsInfo
+
+
+def _generate_projects(tmpdir, count=3):
+    paths = [str(tmpdir.join('projects', 'service-{0}'.format(i))) for i in range(count)]
+    for path in paths:
+        generate_repo(path, py=3)
+    return paths
+
+
+def test_catalog(tmpdir, mocker):
+    paths = _generate_projects(tmpdir)
+    projects_catalog = Catalog(str(tmpdir.join('catalog.sqlite')))
+
+    results = projects_catalog.refresh([str(tmpdir.join('projects', '*')), str(tmpdir.join('missing'))], workers=2)
+    assert [result.value for result in results] == ['updated'] * 3 + [None]
+    assert not results[-1].ok
+
+    entry = projects_catalog.get(paths[0])
+    assert entry.name == 'Synthetic-Project'
+    assert entry.author_email == 'synthetic.author@example.com'
+    assert (entry.package, entry.version, entry.package_version) == ('synthetic_project', '0.0.0', '0.0.0')
+
+    setup_info, init_info = projects_catalog.get_info(paths[0])
+    assert isinstance(setup_info, SetupKwargsInfo) and isinstance(init_info, InitInfo)
+    assert init_info.version.value == '0.0.0'
+
+    # Only projects whose HEAD moved are read again
+    manager = catalog.ProjectManager(paths[1])
+    manager.set_project_author(author_email='team@example.com')
+    manager.close()
+
+    read_project_metadata = mocker.spy(catalog, 'read_project_metadata')
+    results = projects_catalog.refresh()
+    assert [result.value for result in results] == ['unchanged', 'updated', 'unchanged']
+    assert read_project_metadata.call_count == 1
+
+    assert [entry.path for entry in projects_catalog.query(author_email='team@example.com')] == [paths[1]]
+    assert [entry.path for entry in projects_catalog.query(author_email='*@example.com', path='*-[02]')] == \
+        [paths[0], paths[2]]
+    assert projects_catalog.query(name='Other') == []
+
+    projects_catalog.remove([paths[0]])
+    assert projects_catalog.get_paths() == paths[1:]
+    projects_catalog.close()
+
+
+def test_catalog_command(tmpdir):
+    paths = _generate_projects(tmpdir, count=2)
+    catalog_path = str(tmpdir.join('catalog.sqlite'))
+
+    result = CliRunner().invoke(cli, ['catalog', 'update', str(tmpdir.join('projects', '*')),
+                                      '--catalog', catalog_path])
+    assert result.exit_code == 0
+    assert result.output.endswith('2 updated, 0 unchanged, 0 failed\n')
+
+    result = CliRunner().invoke(cli, ['catalog', 'update', '--catalog', catalog_path])
+    assert result.output.endswith('0 updated, 2 unchanged, 0 failed\n')
+
+    result = CliRunner().invoke(cli, ['catalog', 'query', '--path', '*-1', '--format', 'json',
+                                      '--catalog', catalog_path])
+    assert result.exit_code == 0
+    entries = json.loads(result.output)
+    assert [entry['path'] for entry in entries] == paths[1:]
+    assert entries[0]['package_version'] == '0.0.0'
+
+    result = CliRunner().invoke(cli, ['catalog', 'query', '-e', '*@example.com', '--catalog', catalog_path])
+    assert result.exit_code == 0
+    assert len(result.output.splitlines()) == 3
+    assert 'Synthetic Author <synthetic.author@example.com>' in result.output
@@ -0,0 +1,115 @@
+"""
+    tests.test_changelog
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Test changelog generation
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+
+from click.testing import CliRunner
+
+from create_python_project import changelog
+from create_python_project.changelog import parse_commit_message, split_sections, ConventionalCommit
+from create_python_project.cli import cli
+
+
+def test_parse_commit_message():
+    assert parse_commit_message('a', 'refactor(all): rename project to new-name\n\nbody') == \
+        ConventionalCommit('a', 'refactor', 'all', 'rename project to new-name', False)
+    assert parse_commit_message('b', 'feat!: drop python 3.5') == \
+        ConventionalCommit('b', 'feat', None, 'drop python 3.5', True)
+    assert parse_commit_message('c', 'fix(io): close files\n\nBREAKING CHANGE: files are closed').breaking
+    assert parse_commit_message('d', 'add setup.py') is None
+
+
+def test_split_sections():
+    lines = ['Changelog', '=========', '', 'Intro', '', 'Version 0.1.0', '-------------', '', '- Change', '',
+             'Version 0.0.0', '-------------', '']
+    header, sections = split_sections(lines, start=2)
+    assert header == lines[:5]
+    assert list(sections) == ['Version 0.1.0', 'Version 0.0.0']
+    assert sections['Version 0.1.0'] == lines[5:10]
+
+
+def _commit(manager, file_name, message):
+    with open(os.path.join(manager.working_dir, file_name), 'w') as file:
+        file.write(message)
+    manager.git.add(file_name)
+    manager.git.commit('-m', message)
+
+
+def _read(manager, path='CHANGES.rst'):
+    with open(os.path.join(manager.working_dir, path)) as file:
+        return file.read()
+
+
+def test_update_changelog(manager, mocker):
+    manager.set_project_name('New-Name')
+    _commit(manager, 'cli.py', 'feat(cli): add changelog command')
+    manager.create_tag('v9.0.0', message='Release v9.0.0')
+    _commit(manager, 'io.py', 'fix: close files\n\nBREAKING CHANGE: files are closed')
+
+    parse_commit_message = mocker.spy(changelog, 'parse_commit_message')
+    assert manager.update_changelog()
+    commits_count = len(list(manager.iter_commit_hexshas()))
+    assert parse_commit_message.call_count == commits_count
+
+    content = _read(manager)
+    assert content.startswith('Changelog\n=========\n\nHere you can see the full list of changes between each releases '
+                              'of New-Name.\n\nUnreleased\n----------\n\nFixes\n\n'
+                              '- Close files (breaking change)\n\nVersion 9.0.0\n-------------\n\nFeatures\n\n'
+                              '- Cli: Add changelog command\n\nRefactor\n\n- All: Rename project to New-Name\n'
+                              '- All: Rename folder boilerplate_python to new_name\n\n')
+
+    # Hand-written sections without generated counterpart are kept
+    assert content.endswith('Version 0.0.0\n-------------\n\nChore\n\n- Project: Initialize project and devOps files\n')
+
+    # Changelog is only written when it changes
+    assert not manager.update_changelog()
+
+    # Only new commits are parsed
+    manager.git.commit('-am', 'docs(changelog): update changelog')
+    assert manager.update_changelog()
+    assert parse_commit_message.call_count == commits_count + 1
+    assert '\nDocs\n\n- Changelog: Update changelog\n' in _read(manager)
+
+
+def test_update_changelog_from_rev(manager):
+    _commit(manager, 'cli.py', 'feat(cli): add changelog command')
+    _commit(manager, 'io.py', 'fix: close files')
+
+    assert manager.update_changelog(path='docs/CHANGELOG.rst', from_rev='HEAD~1')
+    assert _read(manager, 'docs/CHANGELOG.rst') == 'Changelog\n' \
+                                                   '=========\n' \
+                                                   '\n' \
+                                                   'Here you can see the full list of changes between each ' \
+                                                   'releases of Boilerplate-Python.\n' \
+                                                   '\n' \
+                                                   'Unreleased\n' \
+                                                   '----------\n' \
+                                                   '\n' \
+                                                   'Fixes\n' \
+                                                   '\n' \
+                                                   '- Close files\n'
+    os.remove(os.path.join(manager.working_dir, 'docs', 'CHANGELOG.rst'))
+
+
+def test_changelog_command(manager):
+    _commit(manager, 'cli.py', 'feat(cli): add changelog command')
+
+    result = CliRunner().invoke(cli, ['changelog', '--dry-run'])
+    assert result.exit_code == 0
+    assert '- Cli: Add changelog command' in result.output
+    assert 'Add changelog command' not in _read(manager)
+
+    result = CliRunner().invoke(cli, ['changelog'])
+    assert result.exit_code == 0
+    assert result.output == 'CHANGES.rst has been updated\n'
+    assert 'Add changelog command' in _read(manager)
+
+    result = CliRunner().invoke(cli, ['changelog'])
+    assert result.output == 'CHANGES.rst is up to date\n'
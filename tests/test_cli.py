@@ -8,6 +8,9 @@
     :license: BSD, see :ref:`license` for more details.
 """
 
+import json
+import os
+
 import click
 
 from create_python_project import ProjectManager
@@ -99,3 +102,86 @@ def test_new_with_error(cli_runner):
                                      'new-project-name'])
 
     assert result.exit_code == 1
+
+
+def test_new_with_boilerplate_name(cli_runner, manager, config_path):
+    result = cli_runner.invoke(cli, ['--config-file', config_path,
+                                     'new',
+                                     '-b', 'rc-config-boilerplate',
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+
+    call = ProjectManager.clone_from.call_args_list[0]
+    assert call[1]['url'] == 'git@github.com:nmvalera/rc-config-boilerplate.git'
+
+
+def test_new_with_cache(cli_runner, manager, tmpdir):
+    boilerplate_url = 'file://{path}'.format(path=manager.working_dir)
+    result = cli_runner.invoke(cli, ['new',
+                                     '-b', boilerplate_url,
+                                     '--cache-dir', str(tmpdir),
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+
+    # Test project has been cloned from the cached mirror
+    call = ProjectManager.clone_from.call_args_list[0]
+    assert os.path.dirname(call[1]['url']) == str(tmpdir)
+    assert os.path.isdir(call[1]['url'])
+    assert list(manager.remotes['origin'].urls) == [boilerplate_url]
+
+
+def test_new_with_fresh_history(cli_runner, manager):
+    result = cli_runner.invoke(cli, ['new',
+                                     '-b', 'git@github.com:nmvalera/kwarg-boilerplate.git',
+                                     '--fresh-history',
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+
+    call = ProjectManager.clone_from.call_args_list[0]
+    assert call[1]['depth'] == 1
+
+    # Root commit is followed by contextualization commits
+    root_commit = manager.get_commits()[-1]
+    assert root_commit.message.startswith('chore(all): initialize project from '
+                                          'git@github.com:nmvalera/kwarg-boilerplate.git')
+    assert not root_commit.parents
+
+
+def test_new_with_write_options(cli_runner, manager):
+    result = cli_runner.invoke(cli, ['new',
+                                     '-b', 'git@github.com:nmvalera/kwarg-boilerplate.git',
+                                     '--in-place-writes', '--no-fsync',
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+    assert manager.write_options == {'atomic': False, 'fsync': False}
+    assert manager.setup_info.name.value == 'New-Project-Name'
+
+
+def test_new_with_profile(cli_runner, manager):
+    result = cli_runner.invoke(cli, ['--profile', '--profile-format', 'json', '--profile-top', '2',
+                                     'new',
+                                     '-b', 'git@github.com:nmvalera/kwarg-boilerplate.git',
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+    report = json.loads(result.output[result.output.index('{'):])
+    assert list(report['phases'])[:3] == ['config', 'clone', 'contextualize']
+    assert {'parse', 'transform', 'write', 'commit'} <= set(report['phases'])
+    assert len(report['slowest_files']) == 2
+
+
+def test_new_with_trace_file(cli_runner, manager, tmpdir):
+    trace_file = str(tmpdir.join('trace.json'))
+    result = cli_runner.invoke(cli, ['--trace-file', trace_file,
+                                     'new',
+                                     '-b', 'git@github.com:nmvalera/kwarg-boilerplate.git',
+                                     'new-project-name'])
+
+    assert result.exit_code == 0
+    with open(trace_file) as file:
+        names = [event['name'] for event in json.load(file)['traceEvents']]
+    assert {'config', 'clone', 'contextualize', 'parse', 'commit'} <= set(names)
@@ -0,0 +1,115 @@
+"""
+    tests.test_compose
+    ~~~~~~~~~~~~~~~~~~
+
+    Test composition of boilerplates
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+
+from click.testing import CliRunner
+from git import Repo
+
+from create_python_project import ProjectManager
+from create_python_project.bench import generate_repo
+from create_python_project.cli import cli
+from create_python_project.compose import TreeEntry, merge_entries
+from create_python_project.sync import find_synced_commit
+
+
+def _entry(sha):
+    return TreeEntry('100644', 'blob', sha * 40)
+
+
+def test_merge_entries():
+    base = {'README.rst': _entry('a'), 'docs/index.rst': _entry('b'), 'ci': _entry('c'), 'setup.py': _entry('d')}
+    overlay = {'README.rst': _entry('e'), 'docs': _entry('f'), 'ci/build.yml': _entry('0'), 'setup.py': _entry('d')}
+    other_overlay = {'README.rst': _entry('1'), 'docs/index.rst': _entry('2')}
+
+    entries, overridden = merge_entries([base, overlay, other_overlay])
+    assert entries == {'README.rst': _entry('1'), 'docs/index.rst': _entry('2'), 'ci/build.yml': _entry('0'),
+                       'setup.py': _entry('d')}
+    assert overridden == ['README.rst', 'ci', 'docs', 'docs/index.rst']
+
+
+def _generate_overlay(path, files):
+    repo = Repo.init(path)
+    for file_path, content in files.items():
+        os.makedirs(os.path.dirname(os.path.join(path, file_path)), exist_ok=True)
+        with open(os.path.join(path, file_path), 'w') as file:
+            file.write(content)
+    repo.git.add('--all')
+    repo.git.commit('-m', 'chore: initialize overlay')
+    return 'file://{0}'.format(path)
+
+
+def _read(path):
+    with open(path) as file:
+        return file.read()
+
+
+def test_compose_boilerplates(tmpdir):
+    boilerplate = generate_repo(str(tmpdir.join('boilerplate')), py=3)
+    docker_url = _generate_overlay(str(tmpdir.join('docker')), {
+        'Dockerfile': 'FROM python:3.6\nRUN pip install synthetic_project\n',
+        'README.rst': 'Synthetic-Project\n=================\n\nRun with docker\n',
+    })
+    ci_url = _generate_overlay(str(tmpdir.join('ci')), {
+        'Dockerfile': 'FROM python:3.6-slim\nRUN pip install synthetic_project\n',
+        'ci/build.yml': 'script: make test\n',
+    })
+
+    ci = Repo(str(tmpdir.join('ci')))
+    with open(os.path.join(ci.working_dir, 'ci', 'build.yml'), 'a') as file:
+        file.write('cache: pip\n')
+    ci.git.commit('-am', 'ci: cache pip')
+
+    manager = ProjectManager.clone_from(url='file://{0}'.format(boilerplate.working_dir),
+                                        to_path=str(tmpdir.join('project')))
+    commit = manager.head.commit
+    assert manager.compose_boilerplates([docker_url, ci_url]) == ['Dockerfile', 'README.rst']
+
+    # Composed tree is committed at once
+    assert not manager.is_dirty()
+    assert manager.head.commit.parents == (commit,)
+
+    # Only the trees of the overlays are fetched and the project does not become shallow
+    assert manager.git.rev_parse('--is-shallow-repository') == 'false'
+    assert not os.path.exists(os.path.join(manager.git_dir, 'shallow'))
+    status = manager.git.cat_file('-e', ci.head.commit.hexsha, with_exceptions=False, with_extended_output=True)[0]
+    assert status != 0
+    manager.git.fsck('--no-dangling')
+    assert _read(os.path.join(manager.working_dir, 'ci', 'build.yml')).endswith('cache: pip\n')
+    assert find_synced_commit(manager, 'origin/master') == commit.hexsha
+    assert _read(os.path.join(manager.working_dir, 'Dockerfile')).startswith('FROM python:3.6-slim\n')
+    assert _read(os.path.join(manager.working_dir, 'README.rst')).endswith('Run with docker\n')
+    assert os.path.isfile(os.path.join(manager.working_dir, 'ci', 'build.yml'))
+    assert os.path.isfile(os.path.join(manager.working_dir, 'synthetic_project', '__init__.py'))
+
+    # Composed project is contextualized in a single pass
+    manager.contextualize(name='my-service')
+    assert _read(os.path.join(manager.working_dir, 'Dockerfile')) == 'FROM python:3.6-slim\nRUN pip install ' \
+                                                                     'my_service\n'
+    assert _read(os.path.join(manager.working_dir, 'README.rst')).startswith('My-Service\n')
+
+
+def test_new_with_overlays(tmpdir):
+    boilerplate = generate_repo(str(tmpdir.join('boilerplate')), py=3)
+    docker_url = _generate_overlay(str(tmpdir.join('docker')), {'Dockerfile': 'RUN pip install synthetic_project\n'})
+
+    runner = CliRunner()
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ['--config-file', str(tmpdir.join('.crpyprojrc')), 'new',
+                                     '-b', 'file://{0}'.format(boilerplate.working_dir), '-b', docker_url,
+                                     '--fresh-history', 'my-service'])
+        assert result.exit_code == 0
+        assert '- Project has been composed with {url} (0 file(s) overridden)\n'.format(url=docker_url) in \
+            result.output
+        assert _read(os.path.join('my-service', 'Dockerfile')) == 'RUN pip install my_service\n'
+
+        manager = ProjectManager('my-service')
+        assert len(manager.get_commits()) == 3
+        assert find_synced_commit(manager, 'origin/master') == boilerplate.head.commit.hexsha
@@ -12,7 +12,7 @@ import os
 
 import pytest
 
-from create_python_project.config import Config, read_config
+from create_python_project.config import Config, read_config, resolve_config, clear_config_cache, parse_bool
 
 
 def test_read_config(manager, config_path):
@@ -40,6 +40,18 @@ def test_config_from_kwargs():
     assert config.boilerplate_git_url == 'git@github.com:nmvalera/kwarg-boilerplate.git'
 
 
+def test_config_write_options():
+    config = Config()
+    assert config.write_options == {}
+
+    config.from_kwargs(write_atomic='no', write_fsync=True)
+    assert config.write_options == {'atomic': False, 'fsync': True}
+
+    assert parse_bool('Yes') is True
+    with pytest.raises(ValueError):
+        parse_bool('maybe')
+
+
 def test_config_from_git(manager):
     # Test from 'global'
     config = Config()
@@ -86,3 +98,33 @@ def test_config_from_file(config_path, repo_path):
         config.from_file(os.path.join(repo_path, 'Makefile'))
 
     assert not config.from_file('unknown-file')
+
+
+def test_resolve_config(config_path, tmpdir, mocker):
+    clear_config_cache()
+    from_file = mocker.spy(Config, 'from_file')
+
+    snapshot = resolve_config(config_levels=['global'], file_paths=[config_path])
+    assert resolve_config(config_levels=['global'], file_paths=[config_path]) is snapshot
+    assert dict(snapshot.values)['author_name'] == 'Rc Config Author'
+    assert from_file.call_count == 1
+
+    # Configuration is resolved per boilerplate
+    snapshot = resolve_config(file_paths=[config_path], boilerplate_name='rc-config-boilerplate')
+    assert dict(snapshot.values)['boilerplate_git_url'] == 'git@github.com:nmvalera/rc-config-boilerplate.git'
+    assert from_file.call_count == 2
+
+    # Configuration is read again when a file changes
+    file_path = tmpdir.join('.crpyprojrc')
+    file_path.write('[author]\nname = First Name\n')
+    assert read_config(file_paths=[str(file_path)]).author_name == 'First Name'
+    assert read_config(file_paths=[str(file_path)], author_name='Kwarg Name').author_name == 'Kwarg Name'
+    assert from_file.call_count == 3
+
+    file_path.write('[author]\nname = Second Name\n')
+    file_path.setmtime(file_path.mtime() + 10)
+    assert read_config(file_paths=[str(file_path)]).author_name == 'Second Name'
+    assert from_file.call_count == 4
+
+    with pytest.raises(AttributeError):
+        snapshot.values = ()
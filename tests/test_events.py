@@ -0,0 +1,83 @@
+"""
+    tests.test_events
+    ~~~~~~~~~~~~~~~~~
+
+    Test instrumentation events
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+
+import pytest
+
+from create_python_project.events import span, null_span, add_listener, remove_listener, ChromeTraceExporter
+
+
+def test_span_without_listener():
+    assert span('operation', path='setup.py') is null_span
+    with span('operation') as operation:
+        assert not operation
+        operation.set(bytes=10)
+
+
+def test_span():
+    events = []
+    add_listener(events.append)
+    try:
+        with span('outer', path='outer.py') as outer:
+            with span('inner') as inner:
+                inner.set(bytes=10)
+        with pytest.raises(ValueError):
+            with span('error'):
+                raise ValueError()
+    finally:
+        remove_listener(events.append)
+
+    assert [(event.kind, event.name) for event in events] == [
+        ('start', 'outer'), ('start', 'inner'), ('end', 'inner'), ('end', 'outer'), ('start', 'error'), ('end', 'error')
+    ]
+
+    inner_end, outer_end, error_end = events[2], events[3], events[5]
+    assert inner_end.parent_id == outer.span_id
+    assert inner_end.attributes == {'bytes': 10}
+    assert outer_end.attributes == {'path': 'outer.py'}
+    assert outer_end.duration >= inner_end.duration >= 0
+    assert not outer_end.error and error_end.error
+
+
+def test_script_events(manager):
+    events = []
+    add_listener(events.append)
+    try:
+        manager.publish(is_filtered='setup.py', author='New Author')
+        blobs = []
+        manager.apply_func(blobs.append, is_filtered='*.rst')
+    finally:
+        remove_listener(events.append)
+
+    ends = [event for event in events if event.kind == 'end']
+    assert [event.name for event in ends[:3]] == ['parse', 'transform', 'write']
+    assert all([event.attributes['script_class'] == 'PySetupScript' for event in ends[:3]])
+    assert ends[0].attributes['bytes'] > 0
+    assert ends[2].attributes['changed']
+
+    apply_events = [event for event in ends if event.name == 'apply_func']
+    assert [event.attributes['path'] for event in apply_events] == [blob.path for blob in blobs]
+    assert apply_events[0].attributes['function'] == 'append'
+
+
+def test_chrome_trace_exporter(manager, tmpdir):
+    path = str(tmpdir.join('trace.json'))
+
+    exporter = ChromeTraceExporter(path).start()
+    manager.publish(is_filtered='setup.py', author='New Author')
+    exporter.stop()
+
+    with open(path) as file:
+        trace = json.load(file)
+
+    assert [event['name'] for event in trace['traceEvents']] == ['parse', 'transform', 'write']
+    assert all([event['ph'] == 'X' and event['dur'] >= 0 for event in trace['traceEvents']])
+    assert trace['traceEvents'][0]['args']['path'].endswith('setup.py')
@@ -0,0 +1,84 @@
+"""
+    tests.test_fleet
+    ~~~~~~~~~~~~~~~~
+
+    Test operations across a fleet of projects
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+import os
+
+from click.testing import CliRunner
+
+from create_python_project import ProjectManager
+from create_python_project.bench import generate_repo
+from create_python_project.cli import cli
+from create_python_project.fleet import expand_paths, run_fleet
+
+
+def _generate_fleet(tmpdir, count=3):
+    paths = [str(tmpdir.join('fleet', 'service-{0}'.format(i))) for i in range(count)]
+    for path in paths:
+        generate_repo(path, py=4, rst=2)
+    return paths
+
+
+def test_expand_paths(tmpdir):
+    paths = _generate_fleet(tmpdir)
+    pattern = str(tmpdir.join('fleet', 'service-*'))
+    assert expand_paths([pattern, paths[0], 'missing']) == paths + ['missing']
+
+
+def test_run_fleet(tmpdir):
+    paths = _generate_fleet(tmpdir)
+
+    # Uncommitted modifications make an operation fail
+    with open(os.path.join(paths[1], 'setup.py'), 'a') as file:
+        file.write('\n')
+
+    reported = []
+    results = run_fleet([str(tmpdir.join('fleet', '*')), str(tmpdir.join('missing'))], 'set-author',
+                        workers=2, on_result=reported.append, author_email='team@example.com')
+
+    assert [result.path for result in results] == paths + [str(tmpdir.join('missing'))]
+    assert sorted(reported) == sorted(results)
+    assert [result.ok for result in results] == [True, False, True, False]
+    assert results[0].value == (None, 'team@example.com')
+    assert results[1].error.startswith('AssertionError: You have uncommmitted modifications')
+    assert results[3].error.startswith('NoSuchPathError')
+    assert all([result.duration > 0 for result in results])
+
+    # Other repositories have been modified
+    for path in [paths[0], paths[2]]:
+        assert ProjectManager(path).setup_info.author_email.value == 'team@example.com'
+    assert ProjectManager(paths[1]).setup_info.author_email.value == 'synthetic.author@example.com'
+
+
+def test_fleet_command(tmpdir):
+    paths = _generate_fleet(tmpdir, count=2)
+    paths_file = str(tmpdir.join('paths.txt'))
+    with open(paths_file, 'w') as file:
+        file.write('{0}\n\n'.format(paths[1]))
+
+    result = CliRunner().invoke(cli, ['fleet', 'info', paths[0], '--paths-file', paths_file, '--format', 'json'])
+    assert result.exit_code == 0
+    results = json.loads(result.output)
+    assert [result['path'] for result in results] == paths
+    assert results[0]['value']['name'] == 'Synthetic-Project'
+
+    result = CliRunner().invoke(cli, ['fleet', 'set-url', str(tmpdir.join('fleet', '*')), str(tmpdir.join('missing')),
+                                      '-u', 'https://github.com/team/service.git', '-j', '2'])
+    assert result.exit_code == 1
+    assert 'ok (https://github.com/team/service)' in result.output
+    assert '2 succeeded, 1 failed' in result.output
+
+    # Options must be accepted by the operation
+    result = CliRunner().invoke(cli, ['fleet', 'info', paths[0], '--url', 'https://github.com/team/service.git'])
+    assert result.exit_code == 1
+    assert 'does not accept option(s) --url' in result.output
+
+    result = CliRunner().invoke(cli, ['fleet', 'unknown', paths[0]])
+    assert result.exit_code == 1
@@ -11,6 +11,8 @@
 import os
 import re
 
+import pytest
+from git import TagReference
 from mock import Mock, call
 
 
@@ -18,6 +20,28 @@ def test_get_blobs(repo):
     assert len(repo.get_blobs()) == 24
 
 
+def _walk_tree(tree):
+    return list(tree.blobs) + sum([_walk_tree(sub_tree) for sub_tree in tree.trees], [])
+
+
+def test_iter_blobs(repo):
+    blobs = repo.iter_blobs()
+    assert not isinstance(blobs, list)
+    assert [blob.path for blob in blobs] == [blob.path for blob in _walk_tree(repo.tree())]
+
+    # Iteration can be stopped early
+    assert next(repo.iter_blobs(is_filtered='*.py')).path.endswith('.py')
+
+
+def test_get_blob(repo):
+    assert repo.get_blob('setup.py').path == 'setup.py'
+    assert repo.get_blob('boilerplate_python/__init__.py') == repo.get_blobs(is_filtered='*/__init__.py')[0]
+    assert repo.get_blob('setup.py', rev='HEAD') == repo.get_blob('setup.py')
+
+    with pytest.raises(KeyError):
+        repo.get_blob('unknown.py')
+
+
 def test_mv(repo):
     old_folder = 'boilerplate_python'
     assert os.path.isdir(old_folder)
@@ -51,7 +75,12 @@ def test_apply_func(repo):
 
 
 def test_tags(repo):
-    assert len(repo.get_tags()) == 12
+    tags = repo.get_tags()
+    assert len(tags) == 12
+    assert all([isinstance(tag, TagReference) for tag in tags])
+    assert [tag.commit.committed_datetime for tag in tags] == \
+        sorted([tag.commit.committed_datetime for tag in tags], reverse=True)
+    assert [tag.name for tag in tags] == [record.name for record in repo.list_tags()]
 
 
 def test_get_commits(repo):
@@ -60,8 +89,40 @@ def test_get_commits(repo):
     assert len(repo.get_commits('v0.0.2')) == 19
 
 
+def test_iter_commit_hexshas(repo, mocker):
+    hexshas = list(repo.iter_commit_hexshas())
+    assert hexshas == [commit.hexsha for commit in repo.iter_commits()]
+    assert len(list(repo.iter_commit_hexshas(from_rev='v1.0.1'))) == 11
+
+    # git rev-list is killed and reaped when iteration stops early
+    processes = []
+    rev_list = repo.git.rev_list
+
+    def spy_rev_list(*args, **kwargs):
+        processes.append(rev_list(*args, **kwargs))
+        return processes[-1]
+
+    mocker.patch.object(repo.git, 'rev_list', side_effect=spy_rev_list)
+    iterator = repo.iter_commit_hexshas()
+    assert next(iterator) == hexshas[0]
+    iterator.close()
+    assert processes[0].proc.returncode is not None
+    assert processes[0].proc.stdout.closed
+
+
 def test_push(repo):
     repo.push()
     assert repo.git.push.call_args == (('--follow-tags',),)
     repo.push(push_tags=False)
     assert repo.git.push.call_args == ()
+
+
+def test_squash_history(repo):
+    tree = repo.head.commit.tree
+    branch = repo.active_branch.name
+
+    repo.squash_history('initial commit')
+    assert len(repo.get_commits()) == 1
+    assert repo.head.commit.message.strip() == 'initial commit'
+    assert repo.head.commit.tree == tree
+    assert repo.active_branch.name == branch
@@ -8,6 +8,11 @@
     :license: BSD, see :ref:`license` for more details.
 """
 
+import subprocess
+import sys
+
+import pytest
+
 import create_python_project
 
 
@@ -22,3 +27,33 @@ def _test_all(module):
 def test_import():
     _test_version(create_python_project)
     _test_all(create_python_project)
+
+
+# Modules that must not be imported when starting the CLI
+HEAVY_MODULES = ['git', 'docutils', 'yaml', 'create_python_project.scripts', 'create_python_project.project']
+
+# Maximum cumulative import time of the CLI module (in microseconds)
+CLI_IMPORT_TIME_BUDGET = 150000
+
+
+def test_cli_lazy_import():
+    code = 'import sys, create_python_project.cli; print(" ".join(sys.modules))'
+    modules = subprocess.check_output([sys.executable, '-c', code]).decode().split()
+    for module in HEAVY_MODULES:
+        assert module not in modules
+
+    assert create_python_project.ProjectManager.__name__ == 'ProjectManager'
+    with pytest.raises(AttributeError):
+        create_python_project.UnknownManager
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason='-X importtime requires Python 3.7')
+def test_cli_import_time():
+    # Run it twice so the measure does not include bytecode compilation
+    for _ in range(2):
+        output = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import create_python_project.cli'],
+                                stderr=subprocess.PIPE).stderr.decode()
+
+    cumulative = [int(line.split('|')[1]) for line in output.splitlines()
+                  if line.split('|')[-1].strip() == 'create_python_project.cli']
+    assert cumulative[0] < CLI_IMPORT_TIME_BUDGET
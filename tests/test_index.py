@@ -0,0 +1,40 @@
+"""
+    tests.test_index
+    ~~~~~~~~~~~~~~~~
+
+    Test persistent project index
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+
+from create_python_project import index
+
+
+def test_index(manager, mocker):
+    get_stored_info = mocker.spy(index, 'get_stored_info')
+
+    assert manager.metadata_index.setup_info().name.value == 'Boilerplate-Python'
+    assert os.path.isfile(os.path.join(manager.git_dir, 'crpyproj-index'))
+    assert manager.metadata_index.tree_sha == manager.head.commit.tree.hexsha
+    parsed_count = get_stored_info.call_count
+    assert parsed_count == len(manager.get_blobs(is_filtered=['*.py', '*.rst']))
+
+    # Querying an unchanged project does not parse anything
+    manager.metadata_index.close()
+    project_index = index.ProjectIndex(manager)
+    assert project_index.update() == []
+    assert project_index.setup_info().author.value == 'Nicolas Maurice'
+    assert get_stored_info.call_count == parsed_count
+
+    # Only changed blobs are parsed
+    manager.set_project_author(author_name='New Author')
+    changed_paths = manager.git.diff('--name-only', 'HEAD~1', 'HEAD', '--', '*.py', '*.rst').split('\n')
+    blobs = project_index.update()
+    assert sorted([blob.path for blob in blobs]) == sorted(changed_paths)
+    assert 'setup.py' in changed_paths and len(changed_paths) < parsed_count
+    assert project_index.setup_info().author.value == 'New Author'
+    assert project_index.setup_info('HEAD~1').author.value == 'Nicolas Maurice'
+    assert get_stored_info.call_count == parsed_count + len(changed_paths)
@@ -10,7 +10,8 @@
 
 import pytest
 
-from create_python_project.info import ComplexInfo, RSTScriptInfo, RSTTitleInfo, TextInfo, IntTupleInfo
+from create_python_project.info import ComplexInfo, RSTScriptInfo, RSTTitleInfo, TextInfo, IntTupleInfo, \
+    SetupKwargsInfo, KwargInfo
 
 
 def test_eq():
@@ -68,3 +69,60 @@ def test_rst_script_info():
     _invalid_modification(rst_script_info,
                           'title',
                           TextInfo(text='title2', lineno=5))
+
+
+def test_diff():
+    setup_info = SetupKwargsInfo(name=KwargInfo(arg='name', value='Old-Name', lineno=1),
+                                 version=KwargInfo(arg='version', value='0.0.0', lineno=2),
+                                 packages=(KwargInfo(arg='packages', value='old_name', lineno=3),
+                                           KwargInfo(arg='packages', value='tests', lineno=4)))
+
+    assert setup_info.diff(setup_info.copy()) == []
+    assert setup_info.diff(setup_info.copy(version='0.0.0')) == []
+
+    changes = setup_info.diff(setup_info.copy(name='New-Name'))
+    assert len(changes) == 1
+    assert changes[0].info is setup_info.name
+    assert changes[0].fields == ('value',)
+
+    new_info = setup_info.copy()
+    new_info.packages = (KwargInfo(arg='packages', value='new_name', lineno=3), setup_info.packages[1].copy())
+    changes = setup_info.diff(new_info)
+    assert [change.info.lineno for change in changes] == [3]
+
+
+def test_diff_tuple_length():
+    lines = ['    name=\'Old-Name\',', '    packages=[\'old_name\', \'tests\'],']
+    packages = (KwargInfo(arg='packages', value='old_name', lineno=1),
+                KwargInfo(arg='packages', value='tests', lineno=1))
+    setup_info = SetupKwargsInfo(name=KwargInfo(arg='name', value='Old-Name', lineno=0), packages=packages)
+
+    # Growing tuple is a change of the whole field
+    new_info = setup_info.copy()
+    new_info.packages = packages + (KwargInfo(arg='packages', value='docs'),)
+    changes = setup_info.diff(new_info)
+    assert [(change.info, change.fields) for change in changes] == [(setup_info, ('packages',))]
+
+    # Shrinking tuple is a change of the whole field and common items are still compared
+    new_info = setup_info.copy()
+    new_info.packages = (KwargInfo(arg='packages', value='new_name', lineno=1),)
+    changes = setup_info.diff(new_info)
+    assert [(change.info, change.fields) for change in changes] == [(setup_info, ('packages',)),
+                                                                    (packages[0], ('value',))]
+
+    setup_info.update(new_info, lines)
+    assert lines[1] == '    packages=[\'new_name\', \'tests\'],'
+    assert [package.value for package in setup_info.packages] == ['new_name']
+
+
+def test_update_skips_unchanged_info():
+    lines = ['    name=\'Old-Name\',', '    version=\'0.0.0\',']
+    setup_info = SetupKwargsInfo(name=KwargInfo(arg='name', value='Old-Name', lineno=0),
+                                 version=KwargInfo(arg='version', value='0.0.0', lineno=1))
+
+    # A corrupted line that is not part of the diff must not be touched
+    lines[1] = 'corrupted'
+    changes = setup_info.update(None, lines, name='New-Name')
+    assert [change.info.lineno for change in changes] == [0]
+    assert lines == ['    name=\'New-Name\',', 'corrupted']
+    assert setup_info.name.value == 'New-Name'
@@ -9,10 +9,14 @@
 """
 
 import os
+import stat
+import threading
 
+import pytest
 from docutils.io import StringOutput, FileOutput, StringInput, FileInput, NullInput
 
-from create_python_project.io import InputDescriptor, OutputDescriptor, IOMeta
+from create_python_project.io import InputDescriptor, OutputDescriptor, IOMeta, WriteBatch, BatchedFileOutput, \
+    is_same_file
 
 
 def test_io_descriptor(repo_path):
@@ -35,3 +39,141 @@ def test_io_descriptor(repo_path):
     assert isinstance(test.destination, StringOutput)
     test.destination = 'test-string'
     assert isinstance(test.destination, FileOutput)
+
+
+def test_is_same_file(repo_path):
+    path = os.path.join(repo_path, 'setup.py')
+    assert is_same_file(FileInput(source_path=path), FileOutput(destination_path=path))
+    assert not is_same_file(FileInput(source_path=path), FileOutput(destination_path=path + '.new'))
+    assert not is_same_file(StringInput('text'), FileOutput(destination_path=path))
+    assert not is_same_file(FileInput(source_path=path), StringOutput())
+
+
+def _write_file(path, text, mode=0o644):
+    with open(path, 'w') as file:
+        file.write(text)
+    os.chmod(path, mode)
+
+
+def _read_file(path):
+    with open(path) as file:
+        return file.read()
+
+
+def test_write_batch(tmpdir):
+    path = str(tmpdir.join('script.py'))
+    _write_file(path, 'old\n', mode=0o755)
+
+    with WriteBatch() as batch:
+        BatchedFileOutput(destination_path=path).write('new\n')
+        # Output is not visible until batch is committed
+        assert _read_file(path) == 'old\n'
+        assert len(tmpdir.listdir()) == 2
+
+    assert _read_file(path) == 'new\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o755
+    assert tmpdir.listdir() == [tmpdir.join('script.py')]
+    assert batch.atomic and batch.fsync
+
+
+def _get_umask():
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+def test_write_batch_new_file(tmpdir):
+    path = str(tmpdir.join('CHANGES.rst'))
+    with WriteBatch():
+        BatchedFileOutput(destination_path=path).write('Changelog\n')
+
+    # Created files are given the default mode of new files
+    assert _read_file(path) == 'Changelog\n'
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o666 & ~_get_umask()
+
+
+def test_write_batch_write_error(tmpdir):
+    path = str(tmpdir.join('script.py'))
+    _write_file(path, 'old\n')
+
+    with pytest.raises(UnicodeEncodeError):
+        with WriteBatch() as batch:
+            batch.write(path, 'été\n', encoding='ascii')
+
+    # Temporary file is removed when writing fails
+    assert _read_file(path) == 'old\n'
+    assert tmpdir.listdir() == [tmpdir.join('script.py')]
+
+
+def test_write_batch_rollback(tmpdir):
+    path = str(tmpdir.join('script.py'))
+    _write_file(path, 'old\n')
+
+    with pytest.raises(RuntimeError):
+        with WriteBatch():
+            BatchedFileOutput(destination_path=path).write('new\n')
+            raise RuntimeError()
+
+    assert _read_file(path) == 'old\n'
+    assert tmpdir.listdir() == [tmpdir.join('script.py')]
+
+
+def test_write_batch_symlink(tmpdir):
+    tmpdir.mkdir('shared')
+    path = str(tmpdir.join('shared', 'script.py'))
+    _write_file(path, 'old\n')
+    link_path = str(tmpdir.join('script.py'))
+    os.symlink(path, link_path)
+
+    with WriteBatch():
+        BatchedFileOutput(destination_path=link_path).write('new\n')
+
+    # Target of the link is replaced and the link is preserved
+    assert os.path.islink(link_path)
+    assert _read_file(path) == 'new\n'
+    assert tmpdir.join('shared').listdir() == [tmpdir.join('shared', 'script.py')]
+
+
+def test_write_batch_in_place(tmpdir):
+    path = str(tmpdir.join('script.py'))
+    _write_file(path, 'old\n')
+
+    with WriteBatch(atomic=False, fsync=False):
+        BatchedFileOutput(destination_path=path).write('new\n')
+        assert _read_file(path) == 'new\n'
+
+    # Files are written directly when no batch is active
+    BatchedFileOutput(destination_path=path).write('newer\n')
+    assert _read_file(path) == 'newer\n'
+
+
+def test_write_batch_threads(tmpdir):
+    paths = [str(tmpdir.join('script_{0}.py'.format(i))) for i in range(2)]
+    for path in paths:
+        _write_file(path, 'old\n')
+
+    def write_and_rollback():
+        try:
+            with WriteBatch():
+                BatchedFileOutput(destination_path=paths[1]).write('new\n')
+                raise RuntimeError()
+        except RuntimeError:
+            pass
+
+    with WriteBatch() as batch:
+        # Worker threads write in the batch that was active when the output has been created
+        output = BatchedFileOutput(destination_path=paths[0])
+        thread = threading.Thread(target=output.write, args=('new\n',))
+        thread.start()
+        thread.join()
+
+        # Batches of other threads are independent
+        thread = threading.Thread(target=write_and_rollback)
+        thread.start()
+        thread.join()
+
+        assert len(batch._pending) == 1
+        assert _read_file(paths[0]) == 'old\n'
+
+    assert _read_file(paths[0]) == 'new\n'
+    assert _read_file(paths[1]) == 'old\n'
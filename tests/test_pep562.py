@@ -0,0 +1,36 @@
+"""
+    tests.test_pep562
+    ~~~~~~~~~~~~~~~~~
+
+    Test pep562 implementation
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import sys
+import types
+
+import pytest
+
+from create_python_project.pyutils.pep562 import set_lazy_attributes, lazy_import
+
+
+def test_lazy_attributes(monkeypatch):
+    module = types.ModuleType('lazy_test_module')
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+
+    set_lazy_attributes(module.__name__, {'dumps': 'json'})
+    assert 'dumps' not in module.__dict__
+    assert module.dumps([]) == '[]'
+    assert 'dumps' in module.__dict__
+
+    with pytest.raises(AttributeError):
+        module.loads
+
+
+def test_lazy_import():
+    module = lazy_import('.serialization', 'create_python_project')
+    assert module._module is None
+    assert module.SNAPSHOT_VERSION == 1
+    assert module._module is not None
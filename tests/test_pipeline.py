@@ -0,0 +1,70 @@
+"""
+    tests.test_pipeline
+    ~~~~~~~~~~~~~~~~~~~
+
+    Test bounded pipeline
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import threading
+import time
+
+import pytest
+
+from create_python_project.pipeline import run_pipeline
+
+
+def _run(items, **kwargs):
+    return run_pipeline(items,
+                        prefetch=lambda item: item * 10,
+                        process=lambda item, prefetched: None if item % 3 == 0 else prefetched + item,
+                        write=lambda result: -result,
+                        **kwargs)
+
+
+def test_run_pipeline():
+    expected = [-(item * 11) for item in range(20) if item % 3 != 0]
+    assert _run(range(20)) == expected
+    assert _run(range(20), prefetch_workers=0) == expected
+    assert _run(range(20), prefetch_workers=1, write_workers=1, max_pending=1) == expected
+    assert _run([]) == []
+
+
+def test_run_pipeline_overlaps_and_bounds_stages():
+    lock, state = threading.Lock(), {'prefetching': 0, 'max_prefetching': 0, 'in_flight': 0, 'max_in_flight': 0}
+
+    def prefetch(item):
+        with lock:
+            state['prefetching'] += 1
+            state['in_flight'] += 1
+            state['max_prefetching'] = max(state['max_prefetching'], state['prefetching'])
+            state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        time.sleep(0.01)
+        with lock:
+            state['prefetching'] -= 1
+        return item
+
+    def write(item):
+        time.sleep(0.01)
+        with lock:
+            state['in_flight'] -= 1
+        return item
+
+    assert run_pipeline(range(40), prefetch, lambda item, prefetched: prefetched, write,
+                        prefetch_workers=4, write_workers=2, max_pending=4) == list(range(40))
+
+    # Files are read concurrently but never more than allowed ahead of writers
+    assert 1 < state['max_prefetching'] <= 4
+    assert state['max_in_flight'] <= 4 + 1 + 4
+
+
+def test_run_pipeline_error():
+    def process(item, prefetched):
+        if item == 5:
+            raise ValueError('Invalid item')
+        return item
+
+    with pytest.raises(ValueError):
+        run_pipeline(range(10), lambda item: item, process, lambda item: item)
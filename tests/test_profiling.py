@@ -0,0 +1,95 @@
+"""
+    tests.test_profiling
+    ~~~~~~~~~~~~~~~~~~~~
+
+    Test profiler
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from create_python_project.events import span, has_listeners, thread_time
+from create_python_project.profiling import Profiler, can_trace_memory
+
+
+def test_profiler(manager):
+    profiler = Profiler(top=3).start()
+    assert has_listeners()
+
+    with span('contextualize'):
+        manager.contextualize(author_name='New Author')
+
+    profiler.stop()
+    assert not has_listeners()
+
+    assert list(profiler.phases) == ['contextualize', 'parse', 'transform', 'write', 'commit']
+    assert profiler.phases['contextualize'].calls == 1
+    assert profiler.phases['contextualize'].wall >= profiler.phases['parse'].wall
+    assert profiler.git_subprocesses > 0
+
+    setup_stats = profiler.script_classes['PySetupScript']
+    assert len(setup_stats.files) == 1
+    assert setup_stats.bytes >= os.path.getsize('setup.py')
+    assert len(profiler.get_slowest_files()) == 3
+
+    report = profiler.report()
+    assert report.splitlines()[0].split() == ['Phase', 'Calls', 'Wall', '(s)', 'CPU', '(s)']
+    assert 'PySetupScript' in report
+
+    report = json.loads(profiler.report('json'))
+    assert report['script_classes']['PySetupScript']['files'] == 1
+    assert report['git_subprocesses'] == profiler.git_subprocesses
+    assert len(report['slowest_files']) == 3
+
+
+@pytest.mark.skipif(thread_time is None, reason='CPU time of threads can not be measured')
+def test_profiler_thread_cpu():
+    def spin():
+        with span('spin'):
+            start = thread_time()
+            while thread_time() - start < 0.2:
+                pass
+
+    profiler = Profiler().start()
+    with span('wait'):
+        thread = threading.Thread(target=spin)
+        thread.start()
+        thread.join()
+        time.sleep(0.05)
+    profiler.stop()
+
+    # CPU time of a span does not include the work of other threads
+    assert profiler.phases['spin'].cpu >= 0.2
+    assert profiler.phases['wait'].cpu < 0.1
+
+
+@pytest.mark.skipif(not can_trace_memory(), reason='tracemalloc.reset_peak requires Python 3.9+')
+def test_profiler_memory(manager):
+    profiler = Profiler(trace_memory=True).start()
+    with span('contextualize'):
+        manager.contextualize(author_name='New Author')
+    with span('allocate'):
+        data = bytearray(1 << 20)
+        del data
+    with span('small'):
+        pass
+    profiler.stop()
+
+    assert profiler.phases['contextualize'].peak_memory >= profiler.phases['parse'].peak_memory > 0
+    # Peak is reset between phases
+    assert profiler.phases['allocate'].peak_memory >= profiler.phases['small'].peak_memory + (1 << 20)
+    assert 'Peak memory (KiB)' in profiler.report()
+    assert 'peak_memory' in json.loads(profiler.report('json'))['phases']['parse']
+
+
+@pytest.mark.skipif(can_trace_memory(), reason='tracemalloc.reset_peak is available')
+def test_profiler_memory_unsupported():
+    with pytest.raises(AssertionError):
+        Profiler(trace_memory=True)
@@ -10,6 +10,9 @@
 
 import os
 
+from create_python_project import project
+from create_python_project.io import WriteBatch
+
 
 def test_rename_project(manager):
     assert manager.setup_info.version.value == '0.0.0'
@@ -38,6 +41,25 @@ def test_rename_project(manager):
     assert not manager.is_dirty()
 
 
+def test_iter_scripts(manager):
+    scripts = manager.iter_scripts(is_filtered='*.py')
+    assert [script.source.source_path for script in scripts] == \
+        [script.source.source_path for script in manager.get_scripts(is_filtered='*.py')]
+
+    info = next(manager.iter_info(is_filtered='README.rst'))
+    assert info.title.text == 'Boilerplate-Python'
+
+
+def test_get_info_at(manager):
+    assert manager.get_info_at('README.rst').title.text == 'Boilerplate-Python'
+
+    manager.publish(is_filtered='setup.py', author='New Author')
+
+    # Info is read from the working tree unless a revision is provided
+    assert manager.get_info_at('setup.py').code.setup.author.value == 'New Author'
+    assert manager.get_info_at('setup.py', rev='HEAD').code.setup.author.value == 'Nicolas Maurice'
+
+
 def test_set_author(manager):
     old_info = manager.setup_info
 
@@ -85,3 +107,80 @@ def test_set_py_script_headers(manager):
     assert publication.split('\n')[7] == '    :license: New license'
 
     assert not manager.is_dirty()
+
+
+def test_contextualize(manager):
+    old_urls = list(manager.remotes['origin'].urls)
+    commits_count = len(manager.get_commits())
+
+    values = manager.contextualize(name='New-Package-Name',
+                                   url='https://github.com/nmvalera/new-remote.git',
+                                   author_name='New Author',
+                                   upstream='upstream')
+    assert list(values.items()) == [('url', 'https://github.com/nmvalera/new-remote.git'),
+                                    ('name', 'New-Package-Name'),
+                                    ('author_name', 'New Author')]
+
+    # Test remotes have been set
+    assert list(manager.remotes['upstream'].urls) == old_urls
+    assert list(manager.remotes['origin'].urls) == ['https://github.com/nmvalera/new-remote.git']
+
+    # Test scripts have been modified
+    assert os.path.isdir('new_package_name')
+    assert manager.get_info(is_filtered='new_package_name/__init__.py')[0].docstring.title.text == 'new_package_name'
+    assert manager.get_info(is_filtered='README.rst')[0].title.text == 'New-Package-Name'
+    assert manager.setup_info.name.value == 'New-Package-Name'
+    assert manager.setup_info.url.value == 'https://github.com/nmvalera/new-remote'
+    assert manager.setup_info.author.value == 'New Author'
+
+    publication = manager.get_scripts(is_filtered='new_package_name/__init__.py')[0].publish()
+    assert publication.split('\n')[6] == '    :copyright: Copyright 2017 by New Author.'
+
+    # Test modifications have been committed at once
+    assert not manager.is_dirty()
+    assert len(manager.get_commits()) == commits_count + 1
+
+
+def test_contextualize_without_commit(manager):
+    commits_count = len(manager.get_commits())
+
+    manager.contextualize(author_email='new@author.com', commit=False)
+    assert manager.setup_info.author_email.value == 'new@author.com'
+    assert manager.is_dirty()
+    assert len(manager.get_commits()) == commits_count
+
+
+def test_noop_publications_are_skipped(manager, mocker):
+    apply_func = mocker.spy(manager, 'apply_func')
+
+    manager.publish(old_value='Nicolas Maurice', new_value=None)
+    manager.publish(old_value='Nicolas Maurice', new_value='Nicolas Maurice', is_filtered='*.py')
+    manager.publish_all([(None, {'author': None}), ('*.py', {'old_import': 'boilerplate_python', 'new_import': None})])
+    assert apply_func.call_count == 0
+
+    prepare_publication = mocker.spy(project, 'prepare_publication')
+    manager.publish_all([('setup.py', {'author': 'New Author'}), ('setup.py', {'author': 'New Author'})])
+    assert prepare_publication.call_count == 1
+    assert prepare_publication.call_args[0][1] == [{'author': 'New Author'}]
+
+
+def test_publish_reports_changed_scripts(manager, mocker):
+    file_write = mocker.spy(WriteBatch, 'write')
+
+    changed_paths = manager.publish(old_value='Nicolas Maurice', new_value='New Author', is_filtered='*.py')
+    assert 'setup.py' in changed_paths
+    assert 'boilerplate_python/__init__.py' in changed_paths
+    assert file_write.call_count == len(changed_paths)
+
+    # Scripts that are not modified are not written
+    assert manager.publish(old_value='Nicolas Maurice', new_value='New Author', is_filtered='*.py') == []
+    assert file_write.call_count == len(changed_paths)
+
+    assert manager.publish_all([('setup.py', {'author': 'Other Author'})]) == ['setup.py']
+
+
+def test_publish_sequentially(manager):
+    manager.pipeline_options = dict(manager.pipeline_options, prefetch_workers=0)
+    changed_paths = manager.publish(old_value='Nicolas Maurice', new_value='New Author', is_filtered='*.py')
+    assert 'setup.py' in changed_paths
+    assert manager.setup_info.author.value == 'New Author'
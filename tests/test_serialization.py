@@ -0,0 +1,57 @@
+"""
+    tests.test_serialization
+    ~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Test info serialization functions
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import pytest
+
+from create_python_project.info import RSTScriptInfo, RSTTitleInfo
+from create_python_project.serialization import dumps, loads, pack, unpack
+
+
+def _test_round_trip(value):
+    for format in ['json', 'binary']:
+        snapshot = dumps(value, format=format)
+        assert isinstance(snapshot, str if format == 'json' else bytes)
+        assert loads(snapshot) == value
+    return loads(dumps(value, format='binary'))
+
+
+def test_round_trip(manager):
+    infos = manager.get_info(is_filtered=['*.py', '*.rst'])
+    assert _test_round_trip(tuple(infos)) == tuple(infos)
+
+    setup_info = _test_round_trip(manager.setup_info)
+    assert setup_info.name.lineno == manager.setup_info.name.lineno
+    assert setup_info.packages[0].value == 'boilerplate_python'
+
+    title = RSTTitleInfo(text='Title', lineno=1, symbol='~', has_overline=True)
+    title = _test_round_trip(RSTScriptInfo(title=title)).title
+    assert title.has_overline
+    assert title.lineno == 1
+    assert title.symbol == '~'
+
+
+def test_pack():
+    values = [None, True, False, 0, 127, 128, 65536, 2 ** 40, -1, -32, -33, -200, -70000, -2 ** 40,
+              '', 'a' * 31, 'a' * 200, 'é' * 300, [], list(range(20)), {}, {'k{0}'.format(i): i for i in range(20)}]
+    for value in values:
+        assert unpack(pack(value)) == value
+
+    assert pack({'a': [1, 'b']}) == b'\x81\xa1a\x92\x01\xa1b'
+
+    with pytest.raises(TypeError):
+        pack(3.4)
+
+    with pytest.raises(ValueError):
+        unpack(pack('test')[:-1])
+
+
+def test_loads_invalid_version():
+    with pytest.raises(AssertionError):
+        loads('{"version":0,"info":null}')
@@ -0,0 +1,187 @@
+"""
+    tests.test_sync
+    ~~~~~~~~~~~~~~~
+
+    Test synchronization of projects with their upstream boilerplate
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+import stat
+
+import pytest
+from click.testing import CliRunner
+
+from create_python_project import ProjectManager, sync
+from create_python_project.bench import generate_repo
+from create_python_project.cli import cli
+from create_python_project.sync import SyncChange, find_synced_commit, map_path, read_sync_state
+
+
+def _write(manager, path, content, mode='w'):
+    os.makedirs(os.path.dirname(os.path.join(manager.working_dir, path)), exist_ok=True)
+    with open(os.path.join(manager.working_dir, path), mode) as file:
+        file.write(content)
+
+
+def _read(manager, path):
+    with open(os.path.join(manager.working_dir, path)) as file:
+        return file.read()
+
+
+def _create_project(tmpdir, fresh_history=False):
+    boilerplate = generate_repo(str(tmpdir.join('boilerplate')), py=4, rst=2)
+    manager = ProjectManager.clone_from(url='file://{0}'.format(boilerplate.working_dir),
+                                        to_path=str(tmpdir.join('project')))
+    if fresh_history:
+        manager.squash_history('chore(all): initialize project')
+
+    manager.contextualize(name='my-service', url='https://github.com/team/my-service.git',
+                          author_name='Team', author_email='team@example.com')
+    return boilerplate, manager
+
+
+def test_map_path():
+    assert map_path('old_package/module.py', 'old_package', 'new_package') == 'new_package/module.py'
+    assert map_path('old_package_docs/index.rst', 'old_package', 'new_package') == 'old_package_docs/index.rst'
+
+
+def test_sync_upstream(tmpdir, mocker):
+    boilerplate, manager = _create_project(tmpdir, fresh_history=True)
+    assert find_synced_commit(manager, 'boilerplate/master') == boilerplate.head.commit.hexsha
+
+    # Project customizes README.rst
+    _write(manager, 'README.rst', '\nProject section\n', mode='a')
+    manager.git.commit('-am', 'docs: add project section')
+
+    # Boilerplate evolves
+    _write(boilerplate, 'synthetic_project/plugins.py', '# Plugins of Synthetic-Project (c.f. '
+                                                        'https://github.com/synthetic/synthetic-project)\n\n'
+                                                        'from synthetic_project.module_0 import module_0\n')
+    _write(boilerplate, 'README.rst', 'Synthetic-Project\n' + _read(boilerplate, 'README.rst'))
+    _write(boilerplate, 'setup.cfg', '[metadata]\nlicense = BSD\n', mode='a')
+    boilerplate.git.rm('docs/page_0/page_0.rst')
+    boilerplate.git.add('--all')
+    boilerplate.git.commit('-m', 'feat: add plugins')
+
+    contextualize_data = mocker.spy(sync, 'contextualize_data')
+    changes = manager.sync_upstream()
+    assert sorted(changes) == [SyncChange('README.rst', 'merged'),
+                               SyncChange('docs/page_0/page_0.rst', 'removed'),
+                               SyncChange('my_service/plugins.py', 'added'),
+                               SyncChange('setup.cfg', 'modified')]
+
+    # Only changed blobs have been contextualized (old and new versions)
+    assert contextualize_data.call_count == 2 * len(changes)
+
+    umask = os.umask(0)
+    os.umask(umask)
+    assert stat.S_IMODE(os.stat(os.path.join(manager.working_dir, 'my_service', 'plugins.py')).st_mode) == \
+        0o666 & ~umask
+    assert _read(manager, 'my_service/plugins.py') == '# Plugins of My-Service (c.f. ' \
+                                                      'https://github.com/team/my-service)\n\n' \
+                                                      'from my_service.module_0 import module_0\n'
+    readme = _read(manager, 'README.rst')
+    assert readme.startswith('My-Service\nMy-Service\n')
+    assert readme.endswith('\nProject section\n')
+    assert _read(manager, 'setup.cfg').endswith('[metadata]\nlicense = BSD\n')
+    assert not os.path.exists(os.path.join(manager.working_dir, 'docs', 'page_0', 'page_0.rst'))
+
+    # Synchronization is committed and recorded
+    assert not manager.is_dirty()
+    assert manager.head.commit.message.startswith('chore(all): sync with boilerplate')
+    assert find_synced_commit(manager, 'boilerplate/master') == boilerplate.head.commit.hexsha
+    assert manager.sync_upstream() == []
+
+
+def test_sync_upstream_conflict(tmpdir):
+    boilerplate, manager = _create_project(tmpdir)
+
+    _write(manager, 'setup.cfg', '[metadata]\nlicense = MIT\n', mode='a')
+    manager.git.commit('-am', 'chore: set license')
+
+    _write(boilerplate, 'setup.cfg', '[metadata]\nlicense = BSD\n', mode='a')
+    boilerplate.git.commit('-am', 'chore: set license')
+
+    # Synchronized commit is the merge base when the project history has been kept
+    commit = manager.head.commit
+    assert manager.sync_upstream() == [SyncChange('setup.cfg', 'conflict')]
+    assert manager.head.commit == commit
+    assert '<<<<<<< project\nlicense = MIT\n=======\nlicense = BSD\n>>>>>>> upstream\n' in _read(manager, 'setup.cfg')
+
+    # Synchronization can not be continued nor restarted before conflicts are resolved
+    tip = boilerplate.head.commit.hexsha
+    assert read_sync_state(manager).conflicts == ['setup.cfg']
+    with pytest.raises(AssertionError):
+        manager.continue_sync_upstream()
+    with pytest.raises(AssertionError):
+        manager.sync_upstream()
+
+    # Resolved synchronization records the upstream commit
+    _write(manager, 'setup.cfg', _read(manager, 'setup.cfg').split('<<<<<<<')[0] + '[metadata]\nlicense = MIT\n')
+    manager.git.add('setup.cfg')
+    assert manager.continue_sync_upstream().tip == tip
+    assert not manager.is_dirty()
+    assert read_sync_state(manager) is None
+    assert find_synced_commit(manager, 'boilerplate/master') == tip
+
+    # Next synchronization only applies new upstream changes
+    assert manager.sync_upstream() == []
+    _write(boilerplate, 'synthetic_project/plugins.py', 'import synthetic_project\n')
+    boilerplate.git.add('--all')
+    boilerplate.git.commit('-m', 'feat: add plugins')
+    assert manager.sync_upstream() == [SyncChange('my_service/plugins.py', 'added')]
+    assert _read(manager, 'setup.cfg').endswith('[metadata]\nlicense = MIT\n')
+
+
+def test_sync_upstream_conflict_git_commit(tmpdir):
+    boilerplate, manager = _create_project(tmpdir)
+
+    _write(manager, 'setup.cfg', '[metadata]\nlicense = MIT\n', mode='a')
+    manager.git.commit('-am', 'chore: set license')
+    _write(boilerplate, 'setup.cfg', '[metadata]\nlicense = BSD\n', mode='a')
+    boilerplate.git.commit('-am', 'chore: set license')
+    assert manager.sync_upstream() == [SyncChange('setup.cfg', 'conflict')]
+
+    # Prepared message is used by git commit once conflicts are resolved
+    _write(manager, 'setup.cfg', _read(manager, 'setup.cfg').split('<<<<<<<')[0] + '[metadata]\nlicense = MIT\n')
+    manager.git.commit('-a', '--no-edit')
+    assert find_synced_commit(manager, 'boilerplate/master') == boilerplate.head.commit.hexsha
+    assert manager.sync_upstream() == []
+    assert read_sync_state(manager) is None
+
+
+def test_sync_upstream_command(tmpdir):
+    boilerplate, manager = _create_project(tmpdir)
+
+    _write(boilerplate, 'synthetic_project/plugins.py', 'import synthetic_project\n')
+    boilerplate.git.add('--all')
+    boilerplate.git.commit('-m', 'feat: add plugins')
+
+    result = CliRunner().invoke(cli, ['sync-upstream', '--path', manager.working_dir])
+    assert result.exit_code == 0
+    assert result.output == '     added  my_service/plugins.py\n' \
+                            'Project is synchronized with boilerplate (1 file(s) changed upstream)\n'
+    assert _read(manager, 'my_service/plugins.py') == 'import my_service\n'
+
+
+def test_sync_upstream_command_conflict(tmpdir):
+    boilerplate, manager = _create_project(tmpdir)
+
+    _write(manager, 'setup.cfg', '[metadata]\nlicense = MIT\n', mode='a')
+    manager.git.commit('-am', 'chore: set license')
+    _write(boilerplate, 'setup.cfg', '[metadata]\nlicense = BSD\n', mode='a')
+    boilerplate.git.commit('-am', 'chore: set license')
+
+    result = CliRunner().invoke(cli, ['sync-upstream', '--path', manager.working_dir])
+    assert result.exit_code == 1
+    assert result.output.endswith('1 conflict(s): resolve them, stage them and run sync-upstream --continue\n')
+
+    _write(manager, 'setup.cfg', _read(manager, 'setup.cfg').split('<<<<<<<')[0] + '[metadata]\nlicense = MIT\n')
+    manager.git.add('setup.cfg')
+    result = CliRunner().invoke(cli, ['sync-upstream', '--path', manager.working_dir, '--continue'])
+    assert result.exit_code == 0
+    assert result.output == 'Project is synchronized with upstream commit {sha}\n'.format(
+        sha=boilerplate.head.commit.hexsha[:7])
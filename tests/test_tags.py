@@ -0,0 +1,87 @@
+"""
+    tests.test_tags
+    ~~~~~~~~~~~~~~~
+
+    Test listing of tags
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+from create_python_project.tags import get_version_key, TagRecord
+
+# Versions in increasing order (c.f. PEP 440)
+ORDERED_VERSIONS = [
+    '1.0.dev456',
+    '1.0a1',
+    '1.0a2.dev456',
+    '1.0a12.dev456',
+    '1.0a12',
+    '1.0b1.dev456',
+    '1.0b2',
+    '1.0b2.post345.dev456',
+    '1.0b2.post345',
+    '1.0rc1.dev456',
+    '1.0rc1',
+    '1.0',
+    '1.0+abc.5',
+    '1.0+abc.7',
+    '1.0+5',
+    '1.0.post456.dev34',
+    '1.0.post456',
+    '1.1.dev1',
+    '1!0.1',
+]
+
+
+def test_get_version_key():
+    keys = [get_version_key(version) for version in ORDERED_VERSIONS]
+    assert keys == sorted(keys)
+    assert len(set(keys)) == len(keys)
+
+    assert get_version_key('v1.0.0') == get_version_key('1.0') == get_version_key('1')
+    assert get_version_key('1.0-1') == get_version_key('1.0.post1')
+    assert get_version_key('1.0alpha1') == get_version_key('1.0a1')
+    assert get_version_key('release-1.0') is None
+
+
+def test_list_tags(repo, mocker):
+    tags = {tag.name: tag for tag in repo.tags}
+
+    execute = mocker.spy(repo.git, 'execute')
+    records = repo.list_tags()
+    assert execute.call_count == 1
+
+    assert all([isinstance(record, TagRecord) for record in records])
+    assert sorted([record.name for record in records]) == sorted(tags)
+    assert [record.created for record in records] == sorted([record.created for record in records], reverse=True)
+    for record in records:
+        assert record.annotated
+        assert record.hexsha == tags[record.name].object.hexsha
+        assert record.commit_hexsha == tags[record.name].commit.hexsha
+        assert record.created == tags[record.name].tag.tagged_date
+
+
+def test_list_tags_by_version(repo):
+    repo.create_tag('latest')
+
+    records = repo.list_tags(order='version')
+    names = [record.name for record in records]
+    assert names[:-1] == sorted(names[:-1], key=lambda name: tuple(int(part) for part in name[1:].split('.')),
+                                reverse=True)
+
+    # Tags that are not versions are listed last
+    assert names[-1] == 'latest'
+    assert not records[-1].annotated
+    assert records[-1].commit_hexsha == records[-1].hexsha == repo.head.commit.hexsha
+
+
+def test_list_tags_pagination(repo):
+    for order in ['date', 'version']:
+        records = repo.list_tags(order=order)
+        assert len(records) == 12
+        assert repo.list_tags(order=order, limit=5) == records[:5]
+        assert repo.list_tags(order=order, offset=5, limit=5) == records[5:10]
+        assert repo.list_tags(order=order, offset=10, limit=5) == records[10:]
+        assert repo.list_tags(order=order, offset=4) == records[4:]
+        assert repo.list_tags(order=order, limit=0) == []
@@ -0,0 +1,127 @@
+"""
+    tests.test_transform_cache
+    ~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+    Test cache of transformation outputs shared by projects
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+import os
+import subprocess
+
+from click.testing import CliRunner
+
+from create_python_project import ProjectManager
+from create_python_project.bench import generate_repo
+from create_python_project.cli import cli
+from create_python_project.scripts import PyScript, RSTScript
+from create_python_project.scripts.base import BaseScript
+from create_python_project.transform_cache import get_blob_sha, get_transform_signature, TransformCache
+from create_python_project.utils import prepare_publication
+
+
+def test_get_blob_sha(tmpdir):
+    text = 'Hello\nété\n'
+    path = str(tmpdir.join('blob.txt'))
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+    assert get_blob_sha(text) == subprocess.check_output(['git', 'hash-object', path]).decode().strip()
+
+
+def test_get_transform_signature():
+    transforms = [{'old_value': 'old', 'new_value': 'new'}]
+    signature = get_transform_signature(PyScript, transforms)
+    assert signature == get_transform_signature(PyScript, [{'new_value': 'new', 'old_value': 'old'}])
+    assert signature != get_transform_signature(RSTScript, transforms)
+    assert signature != get_transform_signature(PyScript, [{'old_value': 'old', 'new_value': 'other'}])
+
+    # Transformations with functions can not be cached
+    assert get_transform_signature(PyScript, [{'transform': lambda value: value}]) is None
+
+
+def test_transform_cache(tmpdir):
+    cache = TransformCache(str(tmpdir.join('cache', 'transforms.sqlite')))
+    assert cache.get('a', 'b') is None
+    cache.set('a', 'b', 'output\n')
+    cache.set('c', 'b', 'output\n')
+    assert cache.get('a', 'b') == cache.get('c', 'b') == 'output\n'
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # Identical outputs are stored once
+    assert cache.connection.execute('SELECT COUNT(*) FROM blobs').fetchone()[0] == 1
+    cache.close()
+
+
+def _read_files(path):
+    contents = {}
+    for dir_path, dir_names, file_names in os.walk(path):
+        dir_names[:] = [name for name in dir_names if name != '.git']
+        for file_name in file_names:
+            with open(os.path.join(dir_path, file_name), 'rb') as file:
+                contents[os.path.relpath(os.path.join(dir_path, file_name), path)] = file.read()
+    return contents
+
+
+def test_publish_with_transform_cache(tmpdir, mocker):
+    paths = [str(tmpdir.join('project-{0}'.format(i))) for i in range(2)]
+    for path in paths:
+        generate_repo(path, py=4, rst=2)
+
+    cache = TransformCache(str(tmpdir.join('transforms.sqlite')))
+    read = mocker.spy(BaseScript, 'read')
+
+    manager = ProjectManager(paths[0])
+    manager.transform_cache = cache
+    manager.set_project_author(author_email='team@example.com')
+    assert cache.hits == 0
+    misses, read_count = cache.misses, read.call_count
+    assert misses > 0
+
+    # Identical scripts of another project are not read again (only scripts holding project info are read)
+    manager = ProjectManager(paths[1])
+    manager.transform_cache = cache
+    manager.set_project_author(author_email='team@example.com')
+    assert (cache.hits, cache.misses) == (misses, misses)
+    assert read.call_count - read_count == read_count - misses, (read.call_count, read_count, misses)
+
+    assert _read_files(paths[0]) == _read_files(paths[1])
+    assert ProjectManager(paths[1]).setup_info.author_email.value == 'team@example.com'
+    cache.close()
+
+
+def test_prepare_publication_cache_hit(tmpdir):
+    path = str(tmpdir.join('project'))
+    generate_repo(path, py=2, rst=1)
+    manager = ProjectManager(path)
+    blob = manager.get_blob('setup.py')
+    transforms = [{'old_value': 'synthetic.author@example.com', 'new_value': 'team@example.com'}]
+
+    cache = TransformCache(str(tmpdir.join('transforms.sqlite')))
+    script = prepare_publication(blob, transforms, cache=cache)
+    cached_script = prepare_publication(blob, transforms, cache=cache)
+    assert cache.hits == 1
+
+    # Cached output is written without being parsed
+    assert cached_script._content is None
+    assert cached_script.get_output_content().output() == script.content.output()
+
+    # Content of a cached script is parsed from the output on access and has the same type as without cache
+    assert type(cached_script.content) is type(script.content)
+    assert cached_script.content.output() == script.content.output()
+    assert cached_script.content.info.code.setup.author_email.value == 'team@example.com'
+    cache.close()
+
+
+def test_fleet_command_with_transform_cache(tmpdir):
+    paths = [str(tmpdir.join('fleet', 'service-{0}'.format(i))) for i in range(2)]
+    for path in paths:
+        generate_repo(path, py=4, rst=2)
+
+    result = CliRunner().invoke(cli, ['fleet', 'set-url', str(tmpdir.join('fleet', '*')), '-j', '1',
+                                      '-u', 'https://github.com/team/service.git',
+                                      '--transform-cache', str(tmpdir.join('transforms.sqlite'))])
+    assert result.exit_code == 0
+    assert 'Transform cache: ' in result.output
+    assert ' 0 hits' not in result.output
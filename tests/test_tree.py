@@ -0,0 +1,59 @@
+"""
+    tests.test_tree
+    ~~~~~~~~~~~~~~~
+
+    Test flat index of git trees
+
+    :copyright: Copyright 2017 by Nicolas Maurice, see AUTHORS.rst for more details.
+    :license: BSD, see :ref:`license` for more details.
+"""
+
+from create_python_project.scripts import get_script_class, PyScript, PySetupScript
+from create_python_project.tree import TreeIndex
+
+
+def test_tree_index(repo):
+    tree_index = repo.get_tree_index()
+    assert isinstance(tree_index, TreeIndex)
+
+    blobs = sorted(repo.get_blobs(), key=lambda blob: blob.path)
+    assert len(tree_index) == len(blobs) == 24
+    assert tree_index.paths == [blob.path for blob in blobs]
+
+    for entry, blob in zip(tree_index, blobs):
+        assert entry.hexsha == blob.hexsha
+        assert entry.mode == blob.mode
+        assert entry.size == blob.size
+        assert entry.script_class == get_script_class(blob.path)
+
+    # Blobs of the index hold the same data as the blobs of the tree
+    assert [blob.data_stream.read() for blob in tree_index.iter_blobs(is_filtered='setup.py')] == \
+        [blob.data_stream.read() for blob in repo.get_blobs(is_filtered='setup.py')]
+
+
+def test_tree_index_filters(repo):
+    tree_index = repo.get_tree_index()
+
+    assert [blob.path for blob in tree_index.iter_blobs(is_filtered='*.py')] == \
+        sorted([blob.path for blob in repo.get_blobs(is_filtered='*.py')])
+    assert [blob.path for blob in tree_index.iter_blobs(is_filtered=lambda blob: blob.path.startswith('setup'))] == \
+        ['setup.cfg', 'setup.py']
+
+    max_size = min(tree_index.sizes)
+    assert all([blob.size <= max_size for blob in tree_index.iter_blobs(max_size=max_size)])
+    assert 0 < len(list(tree_index.iter_blobs(max_size=max_size))) < len(tree_index)
+
+
+def test_tree_index_traversal(manager):
+    tree_index = manager.get_tree_index()
+
+    blobs = []
+    manager.apply_func(blobs.append, is_filtered='*.py', tree=tree_index)
+    assert [blob.path for blob in blobs] == [path for path in tree_index.paths if path.endswith('.py')]
+
+    scripts = list(manager.iter_scripts(is_filtered='*.py', tree=tree_index))
+    assert all([isinstance(script, PyScript) for script in scripts])
+    assert isinstance(list(manager.iter_scripts(is_filtered='setup.py', tree=tree_index))[0], PySetupScript)
+
+    info = manager.get_info(is_filtered='setup.py', tree=tree_index)[0]
+    assert info.code.setup.name.value == 'Boilerplate-Python'
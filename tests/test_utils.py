@@ -17,13 +17,14 @@ from create_python_project.info import BaseInfo
 from create_python_project.scripts import BaseScript, PyScript, IniScript
 from create_python_project.utils import get_script, get_info, publish, is_matching, \
     format_project_name, format_package_name, format_py_script_title, \
-    format_url, is_git_url
+    format_url, is_git_url, is_noop_transform
 
 
 def test_is_git_url():
     assert is_git_url('git@github.com:nmvalera/rc-config-boilerplate.git')
     assert is_git_url('https://github.com/nmvalera/create-python-project.git')
     assert is_git_url('git://github.com/nmvalera/create-python-project.git')
+    assert is_git_url('file:///tmp/boilerplate')
     assert not is_git_url('boilerplate-test')
 
 
@@ -65,6 +66,16 @@ def test_publish(repo_path):
     assert len(publication.split('\n')) > 1
 
 
+def test_is_noop_transform():
+    assert is_noop_transform({'old_value': 'old', 'new_value': None})
+    assert is_noop_transform({'old_value': 'same', 'new_value': 'same'})
+    assert is_noop_transform({'old_import': 'package', 'new_import': 'package'})
+    assert is_noop_transform({'author': None, 'author_email': None})
+    assert not is_noop_transform({'old_value': 'old', 'new_value': 'new'})
+    assert not is_noop_transform({'old_value': 'same', 'new_value': 'same', 'author': 'Author'})
+    assert not is_noop_transform({'title': lambda blob: blob.path})
+
+
 def _test_is_matching(regexp, path, result=True):
     assert is_matching(regexp, _make_blob(path)) == result
 